@@ -0,0 +1,62 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitBreaker:
+    """외부 API 호출용 서킷 브레이커 (프로세스 단위).
+
+    - CLOSED: 정상 호출, 연속 실패가 failure_threshold에 도달하면 OPEN
+    - OPEN: 호출 차단, recovery_seconds 경과 후 HALF_OPEN
+    - HALF_OPEN: 시험 호출 1건만 허용, 성공하면 CLOSED / 실패하면 다시 OPEN
+    """
+
+    def __init__(self, name: str, failure_threshold: int, recovery_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_seconds:
+            return HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probe_in_flight:
+            self._state = HALF_OPEN
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        if self._state != CLOSED:
+            logger.info(f"Circuit '{self.name}' closed")
+        self._state = CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self):
+        """시험 호출이 제공자 응답 없이 끝난 경우 (요청 준비 중 오류 등): 상태는 그대로 두고 시험 슬롯만 반납"""
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != OPEN:
+                logger.warning(f"Circuit '{self.name}' opened after {self._failures} failures")
+            self._state = OPEN
+            self._opened_at = time.monotonic()
@@ -30,11 +30,68 @@ class Settings(BaseSettings):
 
     # OpenAI
     OPENAI_API_KEY: str = ""
+    OPENAI_BASE_URL: str = ""  # 비어 있으면 기본 API. 부하 테스트 시 scripts/fake_openai_server.py 주소
+    OPENAI_TIMEOUT_SECONDS: float = 60.0
+    OPENAI_MAX_RETRIES: int = 1
+    OPENAI_BREAKER_FAILURE_THRESHOLD: int = 5
+    OPENAI_BREAKER_RECOVERY_SECONDS: int = 60
+
+    # 모델 등급 라우팅 (텍스트 분석/디지털 PDF 파싱은 입력이 작으면 작은 모델부터)
+    OPENAI_MODEL_LARGE: str = "gpt-4o"
+    OPENAI_MODEL_SMALL: str = "gpt-4o-mini"
+    MODEL_ROUTING_ENABLED: bool = True
+    MODEL_ROUTING_TEXT_SMALL_MAX_CHARS: int = 4000
+    MODEL_ROUTING_PDF_SMALL_MAX_CHARS: int = 30000
+    MODEL_ROUTING_LARGE_SUBJECTS: str = ""  # 항상 큰 모델을 쓸 과목 (콤마 구분)
+
+    # 제출 이미지 합성 (콤마 구분 과목, 예: "MATH,KOREAN"). 해당 과목은 사진을 한 장으로 합쳐 분석
+    ANALYSIS_COMPOSITE_SUBJECTS: str = ""
+
+    # Mock 모드 (APP_ENV=test 또는 API 키 없음) 응답 지연
+    MOCK_ANALYSIS_LATENCY_SECONDS: float = 2.0
+    MOCK_PDF_PARSE_LATENCY_SECONDS: float = 0.0
+
+    # AI 분석 큐 / 스케줄러
+    ANALYSIS_WORKER_CONCURRENCY: int = 2
+    ANALYSIS_SCHEDULER_INTERVAL_SECONDS: int = 30
+    ANALYSIS_STALE_TIMEOUT_SECONDS: int = 600
+    ANALYSIS_PENDING_GRACE_SECONDS: int = 60  # 이 시간 넘게 큐에 없는 PENDING은 다시 등록
+    ANALYSIS_MAX_RETRIES: int = 3
+    ANALYSIS_RETRY_BASE_SECONDS: int = 30
+    ANALYSIS_RETRY_MAX_SECONDS: int = 1800
+    ANALYSIS_PRIORITY_AGING_PER_MINUTE: float = 1.0  # 대기 1분당 가산되는 우선순위
+    ANALYSIS_MENTOR_VIEW_WINDOW_SECONDS: int = 1800  # 코칭센터 조회 후 우선 처리 유지 시간
+
+    # OpenAI Batch API (야간 비긴급 분석)
+    ANALYSIS_BATCH_ENABLED: bool = False
+    ANALYSIS_BATCH_BACKEND: str = "openai"  # openai | local (파일 기반 모의 백엔드)
+    ANALYSIS_BATCH_WINDOW_START_HOUR: int = 23  # KST
+    ANALYSIS_BATCH_WINDOW_END_HOUR: int = 7  # KST
+    ANALYSIS_BATCH_MAX_PRIORITY: int = 30  # 이 우선순위 이하만 배치 대상
+    ANALYSIS_BATCH_MIN_ITEMS: int = 50
+    ANALYSIS_BATCH_MAX_WAIT_SECONDS: int = 1800  # MIN_ITEMS 미만이어도 이 시간이 지나면 제출
+    ANALYSIS_BATCH_MAX_ITEMS: int = 1000
+    ANALYSIS_BATCH_LOCAL_DIR: str = ".batches"
+    ANALYSIS_BATCH_LOCAL_DELAY_SECONDS: int = 5
+
+    # 학습지 카탈로그 캐시 (프로세스 메모리). 다른 워커의 등록을 확인하는 주기
+    MATERIAL_CATALOG_VERSION_CHECK_SECONDS: float = 5.0
+
+    # Admin (운영용 엔드포인트, 비어 있으면 비활성화)
+    ADMIN_API_KEY: str = ""
 
     @property
     def cors_origins_list(self) -> list[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def model_routing_large_subjects(self) -> set[str]:
+        return {s.strip().upper() for s in self.MODEL_ROUTING_LARGE_SUBJECTS.split(",") if s.strip()}
+
+    @property
+    def analysis_composite_subjects(self) -> set[str]:
+        return {s.strip().upper() for s in self.ANALYSIS_COMPOSITE_SUBJECTS.split(",") if s.strip()}
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
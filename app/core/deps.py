@@ -1,8 +1,9 @@
 from typing import Optional
 
-from fastapi import Cookie, Depends, HTTPException, Request, status
+from fastapi import Cookie, Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from app.core.config import settings
 from app.core.security import decode_token
 from prisma import Prisma
 
@@ -81,3 +82,14 @@ async def get_current_user(
         )
 
     return user
+
+
+async def require_admin_key(
+    admin_key: Optional[str] = Header(default=None, alias="X-Admin-Key"),
+) -> None:
+    """운영용 엔드포인트 보호 (X-Admin-Key 헤더, ADMIN_API_KEY 미설정 시 비활성화)"""
+    if not settings.ADMIN_API_KEY or admin_key != settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "ADMIN_001", "message": "관리자 키가 올바르지 않습니다"},
+        )
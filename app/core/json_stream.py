@@ -0,0 +1,72 @@
+import json
+
+# 스트리밍 응답에서 최상위 JSON 객체의 필드를 완성되는 순서대로 꺼내는 파서.
+# ```json 펜스 등 첫 '{' 이전 문자는 무시하고, 최상위 객체가 닫히면 이후 입력은 버립니다.
+
+
+class JsonObjectStream:
+    """최상위 JSON 객체를 조각 단위로 받아, 값이 완성된 필드부터 돌려줍니다."""
+
+    def __init__(self):
+        self.values: dict = {}
+        self.done = False
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._segment_start: int | None = None  # 현재 '"key": value' 구간 시작
+
+    def feed(self, chunk: str) -> dict:
+        """조각을 추가하고, 이번에 새로 완성된 최상위 필드를 반환합니다."""
+        if self.done:
+            return {}
+        self._buf += chunk
+        completed: dict = {}
+
+        while self._pos < len(self._buf):
+            ch = self._buf[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"' and self._depth > 0:
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    if ch != "{":
+                        raise ValueError("top-level JSON value is not an object")
+                    self._segment_start = self._pos + 1
+            elif ch in "}]" and self._depth > 0:
+                if self._depth == 1:
+                    completed.update(self._close_segment())
+                    self.done = True
+                    self._pos += 1
+                    break
+                self._depth -= 1
+            elif ch == "," and self._depth == 1:
+                completed.update(self._close_segment())
+                self._segment_start = self._pos + 1
+            self._pos += 1
+
+        # 처리한 구간은 버려 버퍼가 응답 길이만큼 커지지 않게 함
+        cut = self._segment_start if self._segment_start is not None else self._pos
+        cut = min(cut, self._pos)
+        if cut:
+            self._buf = self._buf[cut:]
+            self._pos -= cut
+            if self._segment_start is not None:
+                self._segment_start -= cut
+
+        self.values.update(completed)
+        return completed
+
+    def _close_segment(self) -> dict:
+        segment = self._buf[self._segment_start:self._pos].strip()
+        if not segment:
+            return {}
+        return json.loads("{" + segment + "}")
@@ -0,0 +1,105 @@
+import bisect
+import time
+from contextlib import contextmanager
+
+# 프로세스 내 히스토그램 (재시작 시 초기화). 장기 집계는 DB(AnalysisMetric)를 사용합니다.
+
+DEFAULT_MS_BUCKETS = (
+    5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000, 30000, 60000, 120000,
+)
+DEFAULT_TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+
+class Histogram:
+    """고정 버킷 누적 히스토그램 (Prometheus 방식 le 버킷)"""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막은 +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float | None:
+        """버킷 상한 기준 근사 분위수"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 2),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": {
+                **{str(le): c for le, c in zip(self.buckets, self.counts)},
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+_histograms: dict[str, Histogram] = {}
+
+
+def observe(name: str, value: float, buckets: tuple[float, ...] = DEFAULT_MS_BUCKETS):
+    if name not in _histograms:
+        _histograms[name] = Histogram(buckets)
+    _histograms[name].observe(value)
+
+
+def snapshot() -> dict[str, dict]:
+    return {name: h.snapshot() for name, h in sorted(_histograms.items())}
+
+
+class StageTimer:
+    """단계별 소요 시간(ms)과 토큰 사용량을 모으는 실행 단위 측정기"""
+
+    def __init__(self):
+        self.stages_ms: dict[str, int] = {}
+        self.marks_ms: dict[str, int] = {}  # 시작부터 특정 시점까지 (예: first_score)
+        self.prompt_tokens: int | None = None
+        self.completion_tokens: int | None = None
+        self.model: str | None = None
+        self.usages: list[tuple[str | None, int, int]] = []  # 호출별 (model, 입력, 출력) — 등급 상향 시 여러 건
+        self.tier: str | None = None
+        self.escalated = False
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = int((time.perf_counter() - started) * 1000)
+            self.stages_ms[name] = self.stages_ms.get(name, 0) + elapsed
+
+    def mark(self, name: str) -> None:
+        """처음 도달한 시점만 기록"""
+        self.marks_ms.setdefault(name, self.total_ms())
+
+    def record_usage(self, model: str | None, usage) -> None:
+        """OpenAI 응답의 usage (객체 또는 dict). 여러 번 호출하면 토큰은 합산됩니다."""
+        if usage is None:
+            return
+        get = usage.get if isinstance(usage, dict) else lambda k: getattr(usage, k, None)
+        prompt, completion = get("prompt_tokens") or 0, get("completion_tokens") or 0
+        self.model = model
+        self.usages.append((model, prompt, completion))
+        self.prompt_tokens = (self.prompt_tokens or 0) + prompt
+        self.completion_tokens = (self.completion_tokens or 0) + completion
+
+    def total_ms(self) -> int:
+        return int((time.perf_counter() - self._started) * 1000)
@@ -0,0 +1,28 @@
+from app.core.config import settings
+
+# 입력 크기·과목·입력 형태로 OpenAI 모델 등급을 고릅니다.
+# 작은 모델 응답이 검증에 실패하면 호출하는 쪽에서 큰 모델로 한 번 올려(escalate) 다시 요청합니다.
+
+TIER_SMALL = "small"
+TIER_LARGE = "large"
+
+MODALITY_VISION = "vision"  # 인증샷/스캔 PDF 이미지
+MODALITY_TEXT = "text"  # 이미지 없는 제출물 분석
+MODALITY_PDF_TEXT = "pdf_text"  # 디지털 PDF 파싱
+
+
+def select_tier(modality: str, subject: str | None, input_chars: int) -> str:
+    if not settings.MODEL_ROUTING_ENABLED or modality == MODALITY_VISION:
+        return TIER_LARGE
+    if subject and subject in settings.model_routing_large_subjects:
+        return TIER_LARGE
+
+    if modality == MODALITY_PDF_TEXT:
+        limit = settings.MODEL_ROUTING_PDF_SMALL_MAX_CHARS
+    else:
+        limit = settings.MODEL_ROUTING_TEXT_SMALL_MAX_CHARS
+    return TIER_SMALL if input_chars <= limit else TIER_LARGE
+
+
+def model_for(tier: str) -> str:
+    return settings.OPENAI_MODEL_SMALL if tier == TIER_SMALL else settings.OPENAI_MODEL_LARGE
@@ -0,0 +1,138 @@
+import base64
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, Query, status
+
+from app.schemas.common import PaginatedResponse, PaginationInfo
+
+# 목록 API 공용 키셋(커서) 페이지네이션.
+#
+# 정렬 키(시각) + id를 불투명한 커서로 주고받고, 다음 페이지는 (시각, id)가 커서보다 작은 행부터
+# limit + 1건만 읽어 다음 페이지 유무를 판단합니다. 오프셋과 달리 뒤 페이지도 비용이 같습니다.
+# 라우터는 page_query(_with_total) 의존성으로 쿼리 파라미터를 받고 to_response로 응답을 만듭니다.
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+TOTAL_COUNT_CAP = 1000  # total은 이 값까지만 셈 (이 값이면 "이상"으로 해석)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def timestamp_ms(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(milliseconds=1)
+
+
+def encode_cursor(sort_value: datetime, item_id: str) -> str:
+    raw = f"{timestamp_ms(sort_value)}:{item_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, error_code: str = "PAGE_001") -> tuple[datetime, str]:
+    """커서 → (정렬 시각, id). 형식이 틀리면 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        sort_ms, item_id = raw.split(":", 1)
+        return _EPOCH + timedelta(milliseconds=int(sort_ms)), item_id
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": error_code, "message": "잘못된 페이지 커서입니다"},
+        )
+
+
+def order_by(field: str) -> list[dict]:
+    """최신순 + 같은 시각이면 id 역순 (커서와 같은 키)"""
+    return [{field: "desc"}, {"id": "desc"}]
+
+
+def after_cursor(where: dict, field: str, cursor: str | None, error_code: str = "PAGE_001") -> dict:
+    """where에 '커서 다음 행' 조건을 AND로 붙여 반환합니다."""
+    if not cursor:
+        return where
+    sort_value, item_id = decode_cursor(cursor, error_code)
+    keyset = {"OR": [{field: {"lt": sort_value}}, {field: sort_value, "id": {"lt": item_id}}]}
+    return {**where, "AND": [*where.get("AND", []), keyset]}
+
+
+def split_page(rows: list, limit: int, field: str) -> tuple[list, str | None]:
+    """limit + 1건 조회 결과 → (이번 페이지, 다음 커서). 다음 페이지가 없으면 커서는 None"""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(getattr(last, field), last.id)
+
+
+async def capped_count(delegate, where: dict) -> int:
+    """TOTAL_COUNT_CAP까지만 센 개수 (오래 쓴 계정도 COUNT 비용이 일정)"""
+    return await delegate.count(where=where, take=TOTAL_COUNT_CAP)
+
+
+async def paginate(
+    delegate,
+    where: dict,
+    field: str,
+    cursor: str | None = None,
+    limit: int = DEFAULT_LIMIT,
+    include: dict | None = None,
+    with_total: bool = False,
+    error_code: str = "PAGE_001",
+) -> dict:
+    """find_many 키셋 페이지 조회. 반환: {items, nextCursor, total}"""
+    rows = await delegate.find_many(
+        where=after_cursor(where, field, cursor, error_code),
+        include=include,
+        order=order_by(field),
+        take=limit + 1,
+    )
+    items, next_cursor = split_page(rows, limit, field)
+    total = await capped_count(delegate, where) if with_total else None
+    return {"items": items, "nextCursor": next_cursor, "total": total}
+
+
+def empty_page(with_total: bool = False) -> dict:
+    return {"items": [], "nextCursor": None, "total": 0 if with_total else None}
+
+
+# ---------- 라우터 공용 ----------
+
+@dataclass
+class PageQuery:
+    cursor: str | None = None
+    limit: int = DEFAULT_LIMIT
+    with_total: bool = False
+
+
+def page_query(
+    cursor: str | None = Query(default=None, description="이전 응답의 pagination.nextCursor"),
+    limit: int = Query(default=DEFAULT_LIMIT, ge=1, le=MAX_LIMIT, description="페이지당 개수"),
+) -> PageQuery:
+    """cursor/limit 쿼리 파라미터 (total을 항상 계산하는 목록용)"""
+    return PageQuery(cursor, limit)
+
+
+def page_query_with_total(
+    cursor: str | None = Query(default=None, description="이전 응답의 pagination.nextCursor"),
+    limit: int = Query(default=DEFAULT_LIMIT, ge=1, le=MAX_LIMIT, description="페이지당 개수"),
+    withTotal: bool = Query(default=False, description=f"전체 개수 포함 (최대 {TOTAL_COUNT_CAP}까지 셈)"),
+) -> PageQuery:
+    """cursor/limit/withTotal 쿼리 파라미터"""
+    return PageQuery(cursor, limit, withTotal)
+
+
+def page_info(page: dict, limit: int) -> PaginationInfo:
+    """{nextCursor, total} 페이지 결과 → PaginationInfo"""
+    return PaginationInfo(
+        limit=limit,
+        total=page.get("total"),
+        nextCursor=page.get("nextCursor"),
+        hasMore=page.get("nextCursor") is not None,
+    )
+
+
+def to_response(items: list, page: dict, limit: int) -> PaginatedResponse:
+    """응답 모델로 변환한 items + 페이지 결과 → PaginatedResponse"""
+    return PaginatedResponse(data=items, pagination=page_info(page, limit))
@@ -0,0 +1,56 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from prisma import Prisma
+
+from app.core.deps import get_db, require_admin_key
+from app.schemas.admin import (
+    AnalysisMetricsResponse,
+    AnalysisQueueStatsResponse,
+    SchedulerTickResponse,
+)
+from app.schemas.common import ErrorResponse, SuccessResponse
+from app.services import analysis_metrics_service, analysis_queue_service
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin_key)],
+    responses={403: {"model": ErrorResponse, "description": "관리자 키 오류 (ADMIN_001)"}},
+)
+
+
+@router.get(
+    "/analysis/queue",
+    response_model=SuccessResponse[AnalysisQueueStatsResponse],
+    summary="분석 큐 통계",
+    description="AI 분석 큐 상태와 stale 회수/자동 재시도 누적 건수를 조회합니다.",
+)
+async def get_analysis_queue_stats():
+    return SuccessResponse(data=AnalysisQueueStatsResponse(**analysis_queue_service.get_stats()))
+
+
+@router.post(
+    "/analysis/scheduler/run",
+    response_model=SuccessResponse[SchedulerTickResponse],
+    summary="분석 스케줄러 즉시 실행",
+    description="stale PROCESSING 회수와 FAILED 자동 재시도를 즉시 1회 실행합니다.",
+)
+async def run_analysis_scheduler(db: Prisma = Depends(get_db)):
+    result = await analysis_queue_service.run_scheduler_tick(db)
+    return SuccessResponse(data=SchedulerTickResponse(**result))
+
+
+@router.get(
+    "/analysis/metrics",
+    response_model=SuccessResponse[AnalysisMetricsResponse],
+    summary="분석 지연/비용 지표",
+    description="단계별(load/presign/gpt/parse/write) 지연 분위수와 일자·과목별 토큰 비용을 조회합니다. 기본 기간은 최근 7일입니다.",
+)
+async def get_analysis_metrics(
+    dateFrom: date | None = Query(default=None, description="시작일 (KST)", examples=["2026-02-01"]),
+    dateTo: date | None = Query(default=None, description="종료일 (KST, 포함)", examples=["2026-02-07"]),
+    db: Prisma = Depends(get_db),
+):
+    result = await analysis_metrics_service.get_metrics_summary(db, dateFrom, dateTo)
+    return SuccessResponse(data=AnalysisMetricsResponse(**result))
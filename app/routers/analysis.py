@@ -1,14 +1,43 @@
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, Depends
 from prisma import Prisma
 
 from app.core.deps import get_current_user, get_db
-from app.schemas.analysis import AnalysisResponse, AnalysisStatusResponse, AnalysisTriggerResponse
+from app.schemas.analysis import (
+    AnalysisBulkTriggerRequest,
+    AnalysisBulkTriggerResponse,
+    AnalysisResponse,
+    AnalysisStatusResponse,
+    AnalysisTriggerResponse,
+)
 from app.schemas.common import ErrorResponse, SuccessResponse
-from app.services import analysis_service
+from app.services import analysis_queue_service, analysis_service
 
 router = APIRouter(prefix="/api/analysis", tags=["AI Analysis"])
 
 
+@router.post(
+    "/bulk-trigger",
+    response_model=SuccessResponse[AnalysisBulkTriggerResponse],
+    status_code=201,
+    summary="AI 분석 일괄 시작",
+    description="멘티의 기간 내 제출물(과제별 최신) 또는 제출물 ID 목록의 분석을 한 번에 시작합니다. 이미 진행 중이거나 완료된 분석은 건너뛰고, 대기(PENDING) 중인 분석은 큐에 다시 등록합니다.",
+    responses={
+        400: {"model": ErrorResponse, "description": "대상 지정 오류 (ANALYSIS_004)"},
+        403: {"model": ErrorResponse, "description": "멘토 권한 필요 / 담당 멘티만 가능"},
+    },
+)
+async def bulk_trigger_analysis(
+    body: AnalysisBulkTriggerRequest,
+    current_user=Depends(get_current_user),
+    db: Prisma = Depends(get_db),
+):
+    result = await analysis_service.bulk_trigger_analysis(db, current_user, body)
+    for item in result["items"]:
+        if item["queued"]:
+            analysis_queue_service.enqueue(item["analysisId"], item["priority"])
+    return SuccessResponse(data=AnalysisBulkTriggerResponse(**result))
+
+
 @router.post(
     "/{submissionId}/trigger",
     response_model=SuccessResponse[AnalysisTriggerResponse],
@@ -21,15 +50,17 @@ router = APIRouter(prefix="/api/analysis", tags=["AI Analysis"])
 )
 async def trigger_analysis(
     submissionId: str,
-    background_tasks: BackgroundTasks,
     current_user=Depends(get_current_user),
     db: Prisma = Depends(get_db),
 ):
-    result = await analysis_service.trigger_analysis(db, submissionId)
-    if result["status"] == "PROCESSING":
-        background_tasks.add_task(
-            analysis_service.run_analysis_background, db, result["analysisId"]
-        )
+    result = await analysis_service.trigger_analysis(
+        db, submissionId, manual=current_user.role == "MENTOR"
+    )
+    if result["queued"]:
+        analysis_queue_service.enqueue(result["analysisId"], result["priority"])
+    elif result["status"] == "PROCESSING":
+        # 이 프로세스 큐에서 대기 중일 때만 우선순위를 올림 (실행 중인 작업은 다시 넣지 않음)
+        analysis_queue_service.bump(result["analysisId"], result["priority"])
     return SuccessResponse(data=AnalysisTriggerResponse(**result))
 
 
@@ -81,12 +112,33 @@ async def get_analysis_status(
 )
 async def retry_analysis(
     submissionId: str,
-    background_tasks: BackgroundTasks,
     current_user=Depends(get_current_user),
     db: Prisma = Depends(get_db),
 ):
     result = await analysis_service.retry_analysis(db, submissionId)
-    background_tasks.add_task(
-        analysis_service.run_analysis_background, db, result["analysisId"]
-    )
+    analysis_queue_service.enqueue(result["analysisId"], result["priority"])
+    return SuccessResponse(data=AnalysisTriggerResponse(**result))
+
+
+@router.post(
+    "/{submissionId}/prioritize",
+    response_model=SuccessResponse[AnalysisTriggerResponse],
+    summary="지금 분석 (우선 처리)",
+    description="멘토가 보고 있는 제출물의 대기 중인 분석을 큐 맨 앞으로 올립니다. Batch 대기 중인 분석은 배치에서 빼서 바로 처리하고, 이미 Batch API로 제출된 분석과 완료된 분석은 상태만 반환합니다.",
+    responses={
+        403: {"model": ErrorResponse, "description": "멘토 권한 필요 / 담당 멘티만 가능"},
+        404: {"model": ErrorResponse, "description": "분석 결과 없음 (ANALYSIS_003)"},
+    },
+)
+async def prioritize_analysis(
+    submissionId: str,
+    current_user=Depends(get_current_user),
+    db: Prisma = Depends(get_db),
+):
+    result = await analysis_service.prioritize_analysis(db, current_user, submissionId)
+    if result["queued"]:
+        analysis_queue_service.enqueue(result["analysisId"], result["priority"])
+    elif result["status"] == "PROCESSING":
+        # 이 프로세스 큐에서 대기 중일 때만 우선순위를 올림 (실행 중인 작업은 다시 넣지 않음)
+        analysis_queue_service.bump(result["analysisId"], result["priority"])
     return SuccessResponse(data=AnalysisTriggerResponse(**result))
@@ -129,7 +129,7 @@ async def get_ai_draft(
     "/{submissionId}/recommendations",
     response_model=SuccessResponse[RecommendationsResponse],
     summary="보완 학습지 추천",
-    description="제출물의 과목/능력태그 기반으로 보완 학습지를 추천합니다.",
+    description="과목 내 학습지를 능력 태그 일치도, 최근 학습 밀도 대비 난이도, 미배정 여부로 점수를 매겨 추천합니다.",
     responses={
         403: {"model": ErrorResponse, "description": "멘토 권한 필요"},
         404: {"model": ErrorResponse, "description": "제출 내역 없음"},
@@ -137,10 +137,12 @@ async def get_ai_draft(
 )
 async def get_recommendations(
     submissionId: str,
+    page: int = Query(default=1, ge=1, description="페이지 번호"),
+    limit: int = Query(default=5, ge=1, le=50, description="페이지당 개수"),
     current_user=Depends(get_current_user),
     db: Prisma = Depends(get_db),
 ):
-    result = await coaching_service.get_recommendations(db, current_user, submissionId)
+    result = await coaching_service.get_recommendations(db, current_user, submissionId, page, limit)
     return SuccessResponse(data=RecommendationsResponse(**result))
 
 
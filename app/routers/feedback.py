@@ -3,8 +3,9 @@ import datetime as dt
 from fastapi import APIRouter, Depends
 from prisma import Prisma
 
+from app.core import pagination
 from app.core.deps import get_current_user, get_db
-from app.schemas.common import ErrorResponse, SuccessResponse
+from app.schemas.common import ErrorResponse, PaginatedResponse, SuccessResponse
 from app.schemas.feedback import FeedbackBySubjectItem, FeedbackDetailResponse
 from app.services import feedback_service
 
@@ -13,37 +14,52 @@ router = APIRouter(prefix="/api/feedback", tags=["Feedback"])
 
 @router.get(
     "",
-    response_model=SuccessResponse[list[FeedbackDetailResponse]],
+    response_model=PaginatedResponse[FeedbackDetailResponse],
     summary="날짜별 피드백 조회",
-    description="특정 날짜의 피드백 목록을 조회합니다.",
+    description="특정 날짜의 피드백 목록을 최신순으로 조회합니다. pagination.nextCursor를 cursor로 넘기면 다음 페이지를 조회합니다.",
     responses={
+        400: {"model": ErrorResponse, "description": "잘못된 커서 (PAGE_001)"},
         403: {"model": ErrorResponse, "description": "권한 없음"},
     },
 )
 async def get_feedback_by_date(
     menteeId: str,
     date: dt.date,
+    paging: pagination.PageQuery = Depends(pagination.page_query_with_total),
     current_user=Depends(get_current_user),
     db: Prisma = Depends(get_db),
 ):
-    results = await feedback_service.get_feedback_by_date(db, menteeId, date)
-    return SuccessResponse(data=[FeedbackDetailResponse(**r) for r in results])
+    page = await feedback_service.get_feedback_by_date(
+        db, menteeId, date, paging.cursor, paging.limit, paging.with_total
+    )
+    items = [FeedbackDetailResponse(**r) for r in page["items"]]
+    return pagination.to_response(items, page, paging.limit)
 
 
 @router.get(
     "/by-subject",
-    response_model=SuccessResponse[list[FeedbackBySubjectItem]],
+    response_model=PaginatedResponse[FeedbackBySubjectItem],
     summary="과목별 피드백 조회",
-    description="특정 과목의 피드백을 최신순으로 조회합니다. 과제별 멘토 피드백, AI 분석 요약, 학습 밀도를 포함합니다.",
+    description=(
+        "특정 과목의 피드백을 최신순으로 조회합니다. 과제별 멘토 피드백, AI 분석 요약(최신 제출 기준), "
+        "학습 밀도를 포함합니다. pagination.nextCursor를 cursor로 넘기면 다음 페이지를 조회합니다."
+    ),
+    responses={
+        400: {"model": ErrorResponse, "description": "잘못된 커서 (FEEDBACK_003)"},
+    },
 )
 async def get_feedback_by_subject(
     menteeId: str,
     subject: str,
+    paging: pagination.PageQuery = Depends(pagination.page_query_with_total),
     current_user=Depends(get_current_user),
     db: Prisma = Depends(get_db),
 ):
-    results = await feedback_service.get_feedback_by_subject(db, menteeId, subject)
-    return SuccessResponse(data=[FeedbackBySubjectItem(**r) for r in results])
+    page = await feedback_service.get_feedback_by_subject(
+        db, menteeId, subject, paging.cursor, paging.limit, paging.with_total
+    )
+    items = [FeedbackBySubjectItem(**r) for r in page["items"]]
+    return pagination.to_response(items, page, paging.limit)
 
 
 @router.get(
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi.responses import RedirectResponse
 from prisma import Prisma
 
+from app.core import pagination
 from app.core.deps import get_current_user, get_db
-from app.schemas.common import ErrorResponse, SuccessResponse
+from app.schemas.common import ErrorResponse, PaginatedResponse, SuccessResponse
 from app.schemas.material import MaterialCreateRequest, MaterialResponse
 from app.services import material_service
 
@@ -12,20 +13,35 @@ router = APIRouter(prefix="/api/materials", tags=["Materials"])
 
 @router.get(
     "",
-    response_model=SuccessResponse[list[MaterialResponse]],
+    response_model=PaginatedResponse[MaterialResponse],
     summary="학습지 목록",
-    description="과목, 유형별로 학습지를 조회합니다.",
+    description=(
+        "과목, 유형별로 학습지를 최신순으로 조회합니다. pagination.nextCursor를 cursor로 넘기면 다음 페이지를 "
+        "조회합니다. 카탈로그가 바뀌지 않았으면 If-None-Match(ETag)에 304를 반환합니다."
+    ),
+    responses={
+        304: {"description": "카탈로그 변경 없음 (ETag 일치)"},
+        400: {"model": ErrorResponse, "description": "잘못된 커서 (MATERIAL_002), 잘못된 과목/유형 (MATERIAL_003)"},
+    },
 )
 async def get_materials(
+    request: Request,
+    response: Response,
     subject: str | None = None,
     type: str | None = None,
+    paging: pagination.PageQuery = Depends(pagination.page_query),
     current_user=Depends(get_current_user),
     db: Prisma = Depends(get_db),
 ):
-    materials = await material_service.get_materials(db, subject, type)
-    return SuccessResponse(
-        data=[MaterialResponse.model_validate(m) for m in materials]
-    )
+    result = await material_service.get_materials(db, subject, type, paging.cursor, paging.limit)
+    headers = {"ETag": result["etag"], "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if result["etag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    items = [MaterialResponse.model_validate(m) for m in result["materials"]]
+    return pagination.to_response(items, result, paging.limit)
 
 
 @router.get(
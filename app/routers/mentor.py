@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends
 from prisma import Prisma
 
+from app.core import pagination
 from app.core.deps import get_current_user, get_db
-from app.schemas.common import ErrorResponse, SuccessResponse
+from app.schemas.common import ErrorResponse, PaginatedResponse, SuccessResponse
 from app.schemas.mentor import (
+    BulkPlanRequest,
+    BulkPlanResponse,
     CommentQueueItem,
     CommentReplyRequest,
     DashboardResponse,
@@ -25,7 +28,7 @@ router = APIRouter(prefix="/api/mentor", tags=["Mentor"])
     "/dashboard",
     response_model=SuccessResponse[DashboardResponse],
     summary="멘토 대시보드",
-    description="담당 멘티 목록과 검토 대기열을 종합 조회합니다.",
+    description="담당 멘티 목록과 검토 대기열을 종합 조회합니다. 코멘트 대기열은 첫 페이지만 포함하며, 나머지는 commentQueuePagination.nextCursor로 GET /api/mentor/comments에서 이어 조회합니다.",
     responses={403: {"model": ErrorResponse, "description": "멘토 권한 필요"}},
 )
 async def get_dashboard(
@@ -155,6 +158,29 @@ async def get_judgment(
     return SuccessResponse(data=JudgmentResponse.model_validate(judgment))
 
 
+# === Bulk Plan ===
+
+@router.post(
+    "/plans/bulk",
+    response_model=SuccessResponse[BulkPlanResponse],
+    status_code=201,
+    summary="주간 계획 일괄 배정",
+    description="templates(할 일 + 문제)를 assignments(멘티 x 날짜 x 템플릿)대로 한 번에 배정합니다. "
+                "생성된 할 일 ID는 assignments와 같은 순서로 반환합니다.",
+    responses={
+        400: {"model": ErrorResponse, "description": "템플릿 key 중복/누락 (PLAN_001)"},
+        403: {"model": ErrorResponse, "description": "담당 멘티만 접근 가능"},
+    },
+)
+async def create_bulk_plan(
+    data: BulkPlanRequest,
+    current_user=Depends(get_current_user),
+    db: Prisma = Depends(get_db),
+):
+    result = await mentor_service.create_bulk_plan(db, current_user, data)
+    return SuccessResponse(data=BulkPlanResponse(**result))
+
+
 # === Feedback ===
 
 @router.post(
@@ -180,17 +206,24 @@ async def create_feedback(
 
 @router.get(
     "/comments",
-    response_model=SuccessResponse[list[CommentQueueItem]],
+    response_model=PaginatedResponse[CommentQueueItem],
     summary="코멘트 답변 대기열",
-    description="담당 멘티들의 코멘트 목록을 조회합니다.",
-    responses={403: {"model": ErrorResponse, "description": "멘토 권한 필요"}},
+    description="담당 멘티들의 코멘트 목록을 최신순으로 조회합니다. pagination.nextCursor를 cursor로 넘기면 다음 페이지를 조회합니다.",
+    responses={
+        400: {"model": ErrorResponse, "description": "잘못된 커서 (PAGE_001)"},
+        403: {"model": ErrorResponse, "description": "멘토 권한 필요"},
+    },
 )
 async def get_comment_queue(
+    paging: pagination.PageQuery = Depends(pagination.page_query_with_total),
     current_user=Depends(get_current_user),
     db: Prisma = Depends(get_db),
 ):
-    result = await mentor_service.get_comment_queue(db, current_user)
-    return SuccessResponse(data=[CommentQueueItem(**c) for c in result])
+    page = await mentor_service.get_comment_queue(
+        db, current_user, paging.cursor, paging.limit, paging.with_total
+    )
+    items = [CommentQueueItem(**c) for c in page["items"]]
+    return pagination.to_response(items, page, paging.limit)
 
 
 @router.post(
@@ -1,14 +1,15 @@
 from fastapi import APIRouter, Depends, status
 from prisma import Prisma
 
+from app.core import pagination
 from app.core.deps import get_current_user, get_db
-from app.schemas.common import ErrorResponse, SuccessResponse
+from app.schemas.common import ErrorResponse, PaginatedResponse, SuccessResponse
 from app.schemas.submission import (
     SelfScoreRequest,
     SubmissionCreateRequest,
     SubmissionResponse,
 )
-from app.services import submission_service
+from app.services import analysis_queue_service, analysis_service, submission_service
 
 router = APIRouter(tags=["Submissions"])
 
@@ -18,7 +19,7 @@ router = APIRouter(tags=["Submissions"])
     response_model=SuccessResponse[SubmissionResponse],
     status_code=status.HTTP_201_CREATED,
     summary="과제 제출",
-    description="TEXT 모드는 textContent 입력, DRAWING 모드는 S3 이미지 URL 목록을 전달합니다. 제출 후 Task 상태가 SUBMITTED로 변경됩니다.",
+    description="TEXT 모드는 textContent 입력, DRAWING 모드는 S3 이미지 URL 목록을 전달합니다. 제출 후 Task 상태가 SUBMITTED로 변경되고, autoAnalyze가 true(기본)면 AI 분석(PENDING)이 함께 생성되어 바로 큐에 등록됩니다.",
     responses={
         400: {"model": ErrorResponse, "description": "입력값 오류 (SUBMIT_002)"},
         403: {"model": ErrorResponse, "description": "본인 데이터만 접근 가능 (PERM_002)"},
@@ -32,27 +33,34 @@ async def create_submission(
     db: Prisma = Depends(get_db),
 ):
     submission = await submission_service.create_submission(db, current_user, taskId, data)
+    if submission.analysis:
+        analysis_queue_service.enqueue(
+            submission.analysis.id, analysis_service.analysis_priority(submission.task)
+        )
     return SuccessResponse(data=SubmissionResponse.model_validate(submission))
 
 
 @router.get(
     "/api/tasks/{taskId}/submissions",
-    response_model=SuccessResponse[list[SubmissionResponse]],
+    response_model=PaginatedResponse[SubmissionResponse],
     summary="제출 내역 조회",
-    description="특정 할 일의 제출 내역을 최신순으로 조회합니다.",
+    description="특정 할 일의 제출 내역을 최신순으로 조회합니다. pagination.nextCursor를 cursor로 넘기면 다음 페이지를 조회합니다.",
     responses={
+        400: {"model": ErrorResponse, "description": "잘못된 커서 (PAGE_001)"},
         404: {"model": ErrorResponse, "description": "할 일 없음 (TASK_002)"},
     },
 )
 async def get_submissions(
     taskId: str,
+    paging: pagination.PageQuery = Depends(pagination.page_query_with_total),
     current_user=Depends(get_current_user),
     db: Prisma = Depends(get_db),
 ):
-    submissions = await submission_service.get_submissions(db, taskId)
-    return SuccessResponse(
-        data=[SubmissionResponse.model_validate(s) for s in submissions]
+    page = await submission_service.get_submissions(
+        db, taskId, paging.cursor, paging.limit, paging.with_total
     )
+    items = [SubmissionResponse.model_validate(s) for s in page["items"]]
+    return pagination.to_response(items, page, paging.limit)
 
 
 @router.put(
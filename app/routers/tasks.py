@@ -98,7 +98,7 @@ async def get_task(
     "/{taskId}",
     response_model=SuccessResponse[TaskResponse],
     summary="할 일 수정",
-    description="할 일을 수정합니다. 멘티는 본인이 만든 unlocked 항목만, 멘토는 담당 멘티의 할 일을 수정합니다.",
+    description="할 일을 수정합니다. 멘티는 본인이 만든 unlocked 항목만, 멘토는 담당 멘티의 할 일을 수정합니다. repeat/repeatDays를 바꾸면 반복 규칙(요일/종료)에 반영되고, 제출 없는 내일 이후 회차 중 규칙에 맞지 않는 것은 삭제됩니다.",
     responses={
         403: {"model": ErrorResponse, "description": "잠긴 할 일 수정 불가 (TASK_003)"},
         404: {"model": ErrorResponse, "description": "할 일 없음 (TASK_002)"},
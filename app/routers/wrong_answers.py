@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, Query
 from prisma import Prisma
 
+from app.core import pagination
 from app.core.deps import get_current_user, get_db
 from app.schemas.analysis import WrongAnswerSheetCompleteRequest, WrongAnswerSheetResponse
-from app.schemas.common import ErrorResponse, SuccessResponse
+from app.schemas.common import ErrorResponse, PaginatedResponse, SuccessResponse
 from app.services import wrong_answer_service
 
 router = APIRouter(prefix="/api/wrong-answers", tags=["Wrong Answers"])
@@ -11,25 +12,28 @@ router = APIRouter(prefix="/api/wrong-answers", tags=["Wrong Answers"])
 
 @router.get(
     "",
-    response_model=SuccessResponse[list[WrongAnswerSheetResponse]],
+    response_model=PaginatedResponse[WrongAnswerSheetResponse],
     summary="오답 학습지 목록 조회",
-    description="멘티의 오답 학습지 목록을 조회합니다. submissionId로 필터링 가능.",
+    description="멘티의 오답 학습지 목록을 최신순으로 조회합니다. submissionId로 필터링 가능. pagination.nextCursor를 cursor로 넘기면 다음 페이지를 조회합니다.",
     responses={
+        400: {"model": ErrorResponse, "description": "잘못된 커서 (PAGE_001)"},
         401: {"model": ErrorResponse, "description": "인증 실패"},
     },
 )
 async def get_wrong_answer_sheets(
     submissionId: str | None = Query(default=None, description="제출물 ID로 필터링"),
+    paging: pagination.PageQuery = Depends(pagination.page_query_with_total),
     current_user=Depends(get_current_user),
     db: Prisma = Depends(get_db),
 ):
     if not current_user.menteeProfile:
-        return SuccessResponse(data=[])
+        return pagination.to_response([], pagination.empty_page(paging.with_total), paging.limit)
 
-    sheets = await wrong_answer_service.get_wrong_answer_sheets(
-        db, current_user.menteeProfile.id, submissionId
+    page = await wrong_answer_service.get_wrong_answer_sheets(
+        db, current_user.menteeProfile.id, submissionId, paging.cursor, paging.limit, paging.with_total
     )
-    return SuccessResponse(data=[WrongAnswerSheetResponse.model_validate(s) for s in sheets])
+    items = [WrongAnswerSheetResponse.model_validate(s) for s in page["items"]]
+    return pagination.to_response(items, page, paging.limit)
 
 
 @router.get(
@@ -0,0 +1,72 @@
+from datetime import date, datetime
+
+from pydantic import BaseModel, Field
+
+
+class AnalysisQueueStatsResponse(BaseModel):
+    """AI 분석 큐/스케줄러 통계 (프로세스 시작 이후 누적)"""
+    enqueued: int = Field(description="큐에 등록된 작업 수")
+    bumped: int = Field(description="대기 중 우선순위가 올라간 횟수")
+    processed: int = Field(description="워커가 처리한 작업 수")
+    reaped: int = Field(description="타임아웃으로 회수된 PROCESSING 분석 수")
+    retried: int = Field(description="자동 재시도로 다시 등록된 분석 수")
+    requeued: int = Field(description="큐 등록이 유실되어 다시 등록된 PENDING 분석 수")
+    enrichQueued: int = Field(description="간이 분석 GPT 보강으로 등록된 분석 수")
+    deferredToBatch: int = Field(description="Batch API 대기로 넘긴 분석 수")
+    batchSubmitted: int = Field(description="Batch API로 제출한 분석 수")
+    batchApplied: int = Field(description="Batch 결과가 반영된 분석 수")
+    queueSize: int = Field(description="현재 대기 중인 작업 수")
+    inFlight: int = Field(description="대기 + 실행 중인 작업 수")
+    waitP50Seconds: float | None = Field(default=None, description="최근 작업 큐 대기 시간 p50 (초)")
+    waitP95Seconds: float | None = Field(default=None, description="최근 작업 큐 대기 시간 p95 (초)")
+    workers: int = Field(description="워커 수")
+    openaiCircuit: str = Field(description="OpenAI 서킷 상태 (CLOSED/OPEN/HALF_OPEN)")
+    lastTickAt: datetime | None = Field(default=None, description="마지막 스케줄러 실행 시각")
+
+
+class SchedulerTickResponse(BaseModel):
+    """스케줄러 수동 실행 결과"""
+    reaped: int = Field(description="이번 실행에서 회수된 분석 수")
+    retried: int = Field(description="이번 실행에서 재시도 등록된 분석 수")
+    requeued: int = Field(description="이번 실행에서 다시 등록된 PENDING 분석 수")
+    enrichQueued: int = Field(description="이번 실행에서 GPT 보강으로 등록된 분석 수")
+    batchSubmitted: int = Field(description="이번 실행에서 Batch API로 제출한 분석 수")
+    batchApplied: int = Field(description="이번 실행에서 Batch 결과가 반영된 분석 수")
+
+
+class StageLatency(BaseModel):
+    """분석 단계별 소요 시간 분위수 (ms)"""
+    stage: str = Field(description="단계 (load/presign/gpt/parse/write/firstScore/total)")
+    count: int = Field(description="표본 수")
+    p50: float | None = Field(default=None, description="p50 (ms)")
+    p95: float | None = Field(default=None, description="p95 (ms)")
+    p99: float | None = Field(default=None, description="p99 (ms)")
+
+
+class DailyAnalysisCost(BaseModel):
+    """일자(KST)·과목별 토큰 사용량과 추정 비용"""
+    date: str = Field(description="날짜 (KST, YYYY-MM-DD)")
+    subject: str | None = Field(default=None, description="과목")
+    analyses: int = Field(description="분석 실행 수")
+    promptTokens: int = Field(description="입력 토큰 합계")
+    completionTokens: int = Field(description="출력 토큰 합계")
+    costUsd: float = Field(description="추정 비용 (USD)")
+
+
+class ModelTierSummary(BaseModel):
+    """모델 등급별 실행 수·지연·비용"""
+    tier: str = Field(description="모델 등급 (small/large)")
+    analyses: int = Field(description="분석 실행 수")
+    escalated: int = Field(description="작은 모델 검증 실패로 큰 모델까지 호출한 수")
+    totalP50: float | None = Field(default=None, description="전체 소요 시간 p50 (ms)")
+    costUsd: float = Field(description="추정 비용 (USD)")
+
+
+class AnalysisMetricsResponse(BaseModel):
+    """분석 파이프라인 지연/비용 요약"""
+    dateFrom: date = Field(description="조회 시작일 (KST)")
+    dateTo: date = Field(description="조회 종료일 (KST, 포함)")
+    stages: list[StageLatency] = Field(description="단계별 지연 분위수 (DB 기록 기준)")
+    costByDay: list[DailyAnalysisCost] = Field(description="일자·과목별 비용")
+    byTier: list[ModelTierSummary] = Field(default=[], description="모델 등급별 요약")
+    histograms: dict[str, dict] = Field(description="프로세스 내 히스토그램 스냅샷 (재시작 시 초기화)")
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
 
 from pydantic import BaseModel, Field
@@ -32,6 +32,8 @@ class AnalysisResponse(BaseModel):
     summary: str | None = Field(default=None, description="1줄 요약")
     detailedAnalysis: str | None = Field(default=None, description="상세 분석 (최대 1000자)")
     mentorTip: str | None = Field(default=None, description="멘토 코칭 팁")
+    scoringVersion: int | None = Field(default=None, description="점수 산출에 사용된 채점 기준 버전")
+    isDegraded: bool = Field(default=False, description="AI 장애로 제출 데이터 기반 간이 점수만 산출된 경우 true (자동 보강 예정)")
     createdAt: datetime = Field(description="생성 일시")
     updatedAt: datetime = Field(description="수정 일시")
 
@@ -43,6 +45,12 @@ class AnalysisStatusResponse(BaseModel):
     id: str = Field(description="분석 ID")
     submissionId: str = Field(description="제출물 ID")
     status: str = Field(description="분석 상태 (PROCESSING/COMPLETED/FAILED)")
+    isPartial: bool = Field(default=False, description="분석 중 먼저 저장된 부분 결과 여부")
+    signalLight: str | None = Field(default=None, description="신호등 (부분 결과 포함)")
+    densityScore: int | None = Field(default=None, description="밀도 점수 (부분 결과 포함)")
+    writingRatio: float | None = Field(default=None, description="필기율 (%)")
+    traceTypes: Any | None = Field(default=None, description="풀이 흔적 유형별 비율")
+    summary: str | None = Field(default=None, description="1줄 요약")
 
 
 class AnalysisTriggerResponse(BaseModel):
@@ -51,6 +59,29 @@ class AnalysisTriggerResponse(BaseModel):
     status: str = Field(description="분석 상태")
 
 
+class AnalysisBulkTriggerRequest(BaseModel):
+    """분석 일괄 트리거 요청 (submissionIds 또는 menteeId + 기간 중 하나)"""
+    submissionIds: list[str] | None = Field(default=None, max_length=200, description="제출물 ID 목록")
+    menteeId: str | None = Field(default=None, description="멘티 프로필 ID")
+    dateFrom: date | None = Field(default=None, examples=["2026-02-01"], description="과제 시작 날짜 (포함)")
+    dateTo: date | None = Field(default=None, examples=["2026-02-01"], description="과제 종료 날짜 (포함)")
+
+
+class AnalysisBulkTriggerItem(BaseModel):
+    """제출물별 트리거 결과"""
+    submissionId: str = Field(description="제출물 ID")
+    analysisId: str | None = Field(default=None, description="분석 ID (제출물이 없으면 null)")
+    status: str = Field(description="분석 상태 (PROCESSING/COMPLETED, 제출물 없음: NOT_FOUND)")
+    queued: bool = Field(description="이번 요청으로 분석 큐에 등록되었는지 여부 (이미 진행 중/완료면 false)")
+
+
+class AnalysisBulkTriggerResponse(BaseModel):
+    """분석 일괄 트리거 응답"""
+    total: int = Field(description="대상 제출물 수")
+    queued: int = Field(description="새로 분석을 시작한 제출물 수")
+    items: list[AnalysisBulkTriggerItem] = Field(description="제출물별 결과")
+
+
 # ===== 오답 학습지 =====
 
 class WrongAnswerSheetResponse(BaseModel):
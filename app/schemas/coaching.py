@@ -4,6 +4,7 @@ from typing import Any
 from pydantic import BaseModel, Field, field_validator
 
 from app.schemas.analysis import AnalysisResponse
+from app.schemas.common import PaginationInfo
 from app.schemas.submission import SubmissionResponse
 
 
@@ -27,12 +28,14 @@ class RecommendationItem(BaseModel):
     subject: str = Field(description="과목 (KOREAN/ENGLISH/MATH)")
     abilityTags: list[str] = Field(description="능력 태그 목록")
     difficulty: int | None = Field(default=None, description="난이도 (1~5)")
+    score: float | None = Field(default=None, description="추천 점수 (0~1, 태그 일치·난이도 적합·미배정 가중합)")
     reason: str = Field(description="추천 이유")
 
 
 class RecommendationsResponse(BaseModel):
     submissionId: str = Field(description="제출물 ID")
     recommendations: list[RecommendationItem] = Field(description="추천 학습지 목록")
+    pagination: PaginationInfo | None = Field(default=None, description="페이지 정보")
 
 
 class AssignMaterialRequest(BaseModel):
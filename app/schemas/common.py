@@ -22,10 +22,12 @@ class ErrorResponse(BaseModel):
 
 
 class PaginationInfo(BaseModel):
-    page: int
+    page: int | None = None  # 오프셋 페이지네이션
     limit: int
-    total: int
-    total_pages: int
+    total: int | None = None  # 커서 페이지네이션에서는 요청 시에만, 최대 pagination.TOTAL_COUNT_CAP까지
+    total_pages: int | None = None
+    nextCursor: str | None = None  # 커서 페이지네이션 (다음 요청의 cursor 값)
+    hasMore: bool = False
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
@@ -2,7 +2,8 @@ import datetime as dt
 
 from pydantic import BaseModel, Field
 
-from app.schemas.task import TaskResponse
+from app.schemas.common import PaginationInfo
+from app.schemas.task import TaskProblemCreateRequest, TaskResponse
 
 
 class MenteeListItem(BaseModel):
@@ -54,7 +55,8 @@ class CommentReplyRequest(BaseModel):
 class DashboardResponse(BaseModel):
     mentees: list[MenteeListItem]           # 담당 멘티 (최대 2명)
     reviewQueue: list[ReviewQueueItem]      # 과제 검토 대기열
-    commentQueue: list[CommentQueueItem]    # 코멘트 답변 대기열
+    commentQueue: list[CommentQueueItem]    # 코멘트 답변 대기열 (첫 페이지)
+    commentQueuePagination: PaginationInfo  # 다음 페이지는 GET /api/mentor/comments?cursor=nextCursor
 
 
 class JudgmentConfirmRequest(BaseModel):
@@ -114,3 +116,45 @@ class FeedbackResponse(BaseModel):
     items: list[FeedbackItemResponse] = []
 
     model_config = {"from_attributes": True}
+
+
+class PlanTemplateRequest(BaseModel):
+    """일괄 배정에 쓰는 할 일 템플릿 (assignments에서 key로 참조)"""
+    key: str = Field(min_length=1, max_length=50, examples=["math-1"], description="요청 내 템플릿 식별자")
+    title: str = Field(min_length=1, max_length=200, examples=["수학 미적분 p.32~35"], description="과제 제목")
+    goal: str | None = Field(default=None, max_length=500, description="학습 목표")
+    subject: str = Field(pattern="^(KOREAN|ENGLISH|MATH)$", examples=["MATH"], description="과목 (KOREAN/ENGLISH/MATH)")
+    abilityTag: str | None = Field(default=None, max_length=50, description="능력 태그")
+    materialType: str | None = Field(default=None, pattern="^(COLUMN|PDF)$", description="학습지 유형 (COLUMN/PDF)")
+    materialId: str | None = Field(default=None, description="연결된 학습지 ID")
+    materialUrl: str | None = Field(default=None, description="학습지 URL (PDF 다운로드용)")
+    targetStudyMinutes: int | None = Field(default=None, ge=0, le=1440, description="목표 공부 시간 (분)")
+    memo: str | None = Field(default=None, max_length=1000, description="메모")
+    tags: list[str] = Field(default=[], description="멘토 칩 태그 목록")
+    keyPoints: str | None = Field(default=None, max_length=5000, description="핵심 정리 (멘토 작성)")
+    content: str | None = Field(default=None, max_length=10000, description="지문/본문 (멘토 작성)")
+    problems: list[TaskProblemCreateRequest] = Field(default=[], description="문제 목록")
+    displayOrder: int = Field(default=0, ge=0, description="표시 순서")
+
+
+class PlanAssignmentRequest(BaseModel):
+    """(멘티, 날짜, 템플릿) 배정 한 칸"""
+    menteeId: str = Field(description="멘티 프로필 ID")
+    date: dt.date = Field(examples=["2026-02-09"], description="과제 날짜")
+    templateKey: str = Field(examples=["math-1"], description="templates의 key")
+    displayOrder: int | None = Field(default=None, ge=0, description="표시 순서 (미입력 시 템플릿 값)")
+
+
+class BulkPlanRequest(BaseModel):
+    """주간 계획 일괄 배정 요청"""
+    templates: list[PlanTemplateRequest] = Field(min_length=1, max_length=100, description="할 일 템플릿 목록")
+    assignments: list[PlanAssignmentRequest] = Field(
+        min_length=1, max_length=1000, description="배정 목록 (멘티 x 날짜 x 템플릿)"
+    )
+
+
+class BulkPlanResponse(BaseModel):
+    """일괄 배정 결과"""
+    taskCount: int = Field(description="생성된 할 일 수")
+    problemCount: int = Field(description="생성된 문제 수")
+    taskIds: list[str] = Field(description="생성된 할 일 ID (assignments와 같은 순서)")
@@ -34,6 +34,10 @@ class SubmissionCreateRequest(BaseModel):
         default=None, ge=0, le=1440,
         description="공부 시간 (분)",
     )
+    autoAnalyze: bool = Field(
+        default=True,
+        description="제출과 동시에 AI 분석 시작 여부 (false면 나중에 /api/analysis/{id}/trigger로 시작)",
+    )
     selfScoreCorrect: int | None = Field(default=None, ge=0, description="자기채점 맞은 문제 수")
     selfScoreTotal: int | None = Field(default=None, ge=1, description="자기채점 전체 문제 수")
     wrongQuestions: list[int] | None = Field(default=None, description="틀린 문제 번호 목록")
@@ -71,6 +75,14 @@ class ProblemResponseData(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class SubmissionAnalysisRef(BaseModel):
+    """제출물에 연결된 AI 분석 요약"""
+    id: str = Field(description="분석 ID")
+    status: str = Field(description="분석 상태 (PENDING/PROCESSING/COMPLETED/FAILED)")
+
+    model_config = {"from_attributes": True}
+
+
 class SubmissionResponse(BaseModel):
     """제출물 응답"""
     id: str = Field(description="제출물 ID")
@@ -85,6 +97,7 @@ class SubmissionResponse(BaseModel):
     comment: str | None = Field(default=None, description="멘토에게 남긴 질문/코멘트")
     problemResponses: list[ProblemResponseData] = Field(default=[], description="문제별 응답 목록")
     submittedAt: datetime = Field(description="제출 일시")
+    analysis: SubmissionAnalysisRef | None = Field(default=None, description="AI 분석 (자동 분석 시 제출과 함께 생성)")
 
     @field_validator("problemResponses", mode="before")
     @classmethod
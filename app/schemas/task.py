@@ -68,6 +68,11 @@ class TaskCreateRequest(BaseModel):
         description="반복 요일 목록 (MON/TUE/WED/THU/FRI/SAT/SUN)",
         examples=[["MON", "WED", "FRI"]],
     )
+    repeatUntil: dt.date | None = Field(
+        default=None,
+        description="반복 종료일 (포함, 미입력 시 종료 없음). 반복은 과제 날짜가 속한 주 월요일부터 시작",
+        examples=["2026-03-31"],
+    )
     targetStudyMinutes: int | None = Field(
         default=None, ge=0, le=1440,
         description="목표 공부 시간 (분)",
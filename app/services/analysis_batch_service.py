@@ -0,0 +1,388 @@
+import json
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from prisma import Prisma
+
+from app.core import model_routing
+from app.core.config import settings
+from app.core.metrics import StageTimer
+from app.services import analysis_metrics_service, analysis_service
+
+logger = logging.getLogger(__name__)
+
+# Batch API 결과는 최대 24시간 뒤에 처리되므로 이미지 URL도 그만큼 유효해야 함
+BATCH_IMAGE_URL_EXPIRES_SECONDS = 60 * 60 * 26
+
+BATCH_IN_PROGRESS = "in_progress"
+BATCH_COMPLETED = "completed"
+BATCH_FAILED = "failed"
+
+_ANALYSIS_INCLUDE = {
+    "submission": {
+        "include": {
+            "task": {"include": {"problems": {"include": {"bank": True}}}},
+            "problemResponses": True,
+        }
+    }
+}
+
+
+# ---------- 백엔드 ----------
+# 요청/결과 라인 형식은 OpenAI Batch API(JSONL)와 동일하게 맞춥니다.
+
+def _normalize_result_line(line: dict) -> dict:
+    """Batch 결과 1줄 → {custom_id, content, model, usage, error}"""
+    response = line.get("response") or {}
+    body = response.get("body") or {}
+    if response.get("status_code") == 200 and body.get("choices"):
+        return {
+            "custom_id": line.get("custom_id"),
+            "content": body["choices"][0]["message"].get("content") or "",
+            "model": body.get("model"),
+            "usage": body.get("usage"),
+            "error": None,
+        }
+    error = line.get("error") or body.get("error") or {"message": "empty response"}
+    return {
+        "custom_id": line.get("custom_id"),
+        "content": None,
+        "model": None,
+        "usage": None,
+        "error": error.get("message") if isinstance(error, dict) else str(error),
+    }
+
+
+class BatchBackend(ABC):
+    """Batch 실행 백엔드 인터페이스 (메서드를 빠뜨린 백엔드는 생성 시점에 TypeError)"""
+
+    name = ""
+
+    @abstractmethod
+    async def submit(self, batch_id: str, lines: list[dict]) -> str:
+        """요청 라인을 제출하고 제공자 batch ID를 반환"""
+
+    @abstractmethod
+    async def poll(self, provider_batch_id: str) -> str:
+        """BATCH_IN_PROGRESS / BATCH_COMPLETED / BATCH_FAILED"""
+
+    @abstractmethod
+    async def fetch_results(self, provider_batch_id: str) -> list[dict]:
+        """정규화된 결과 라인 목록 ({custom_id, content, model, usage, error})"""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    name = "openai"
+
+    async def submit(self, batch_id: str, lines: list[dict]) -> str:
+        client = analysis_service._get_openai()
+        payload = "\n".join(json.dumps(line, ensure_ascii=False) for line in lines)
+        input_file = await client.files.create(
+            file=(f"{batch_id}.jsonl", payload.encode("utf-8")),
+            purpose="batch",
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            metadata={"analysisBatchId": batch_id},
+        )
+        return batch.id
+
+    async def poll(self, provider_batch_id: str) -> str:
+        batch = await analysis_service._get_openai().batches.retrieve(provider_batch_id)
+        if batch.status == "failed":
+            return BATCH_FAILED
+        # expired/cancelled도 처리된 항목은 결과 파일에 있으므로 완료로 보고 나머지만 실패 처리
+        if batch.status in ("completed", "expired", "cancelled"):
+            return BATCH_COMPLETED
+        return BATCH_IN_PROGRESS
+
+    async def fetch_results(self, provider_batch_id: str) -> list[dict]:
+        client = analysis_service._get_openai()
+        batch = await client.batches.retrieve(provider_batch_id)
+        results = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await client.files.content(file_id)
+            for raw in content.text.splitlines():
+                if raw.strip():
+                    results.append(_normalize_result_line(json.loads(raw)))
+        return results
+
+
+class LocalFileBatchBackend(BatchBackend):
+    """파일 기반 모의 백엔드 (로컬/테스트용).
+
+    입력 JSONL을 디렉터리에 쓰고, 지연 시간이 지나면 OpenAI와 같은 형식의
+    결과 JSONL을 모의 분석값으로 생성합니다.
+    """
+
+    name = "local"
+
+    def __init__(self, directory: str, delay_seconds: float):
+        self.directory = Path(directory)
+        self.delay_seconds = delay_seconds
+
+    def _input_path(self, provider_batch_id: str) -> Path:
+        return self.directory / f"{provider_batch_id}.input.jsonl"
+
+    def _output_path(self, provider_batch_id: str) -> Path:
+        return self.directory / f"{provider_batch_id}.output.jsonl"
+
+    async def submit(self, batch_id: str, lines: list[dict]) -> str:
+        provider_batch_id = f"local-{batch_id}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._input_path(provider_batch_id).write_text(
+            "\n".join(json.dumps(line, ensure_ascii=False) for line in lines),
+            encoding="utf-8",
+        )
+        return provider_batch_id
+
+    async def poll(self, provider_batch_id: str) -> str:
+        if self._output_path(provider_batch_id).exists():
+            return BATCH_COMPLETED
+        input_path = self._input_path(provider_batch_id)
+        if not input_path.exists():
+            return BATCH_FAILED
+        if time.time() - input_path.stat().st_mtime < self.delay_seconds:
+            return BATCH_IN_PROGRESS
+        self._simulate(provider_batch_id)
+        return BATCH_COMPLETED
+
+    async def fetch_results(self, provider_batch_id: str) -> list[dict]:
+        raw = self._output_path(provider_batch_id).read_text(encoding="utf-8")
+        return [_normalize_result_line(json.loads(line)) for line in raw.splitlines() if line.strip()]
+
+    def _simulate(self, provider_batch_id: str):
+        output = []
+        for raw in self._input_path(provider_batch_id).read_text(encoding="utf-8").splitlines():
+            request = json.loads(raw)
+            writing_ratio = random.randint(10, 60)
+            content = {
+                "writingRatio": writing_ratio,
+                "traceTypes": {
+                    "underlineRatio": round(random.uniform(10.0, 80.0), 1),
+                    "memoRatio": round(random.uniform(5.0, 50.0), 1),
+                    "solutionRatio": round(random.uniform(20.0, 90.0), 1),
+                },
+                "summary": f"필기율 {writing_ratio}% (로컬 배치 모의 분석)",
+                "detailedAnalysis": "로컬 배치 백엔드에서 생성한 모의 분석 결과입니다.",
+                "mentorTip": "모의 분석 결과이므로 실제 인증샷을 함께 확인해 주세요.",
+            }
+            output.append({
+                "id": f"{provider_batch_id}-{request['custom_id']}",
+                "custom_id": request["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "model": request["body"].get("model"),
+                        "choices": [{"message": {"role": "assistant", "content": json.dumps(content, ensure_ascii=False)}}],
+                        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                    },
+                },
+                "error": None,
+            })
+        self._output_path(provider_batch_id).write_text(
+            "\n".join(json.dumps(line, ensure_ascii=False) for line in output),
+            encoding="utf-8",
+        )
+
+
+_backends: dict[str, BatchBackend] = {}
+
+
+def get_backend(name: str) -> BatchBackend:
+    if name not in _backends:
+        if name == OpenAIBatchBackend.name:
+            _backends[name] = OpenAIBatchBackend()
+        elif name == LocalFileBatchBackend.name:
+            _backends[name] = LocalFileBatchBackend(
+                settings.ANALYSIS_BATCH_LOCAL_DIR,
+                settings.ANALYSIS_BATCH_LOCAL_DELAY_SECONDS,
+            )
+        else:
+            raise ValueError(f"Unknown analysis batch backend: {name}")
+    return _backends[name]
+
+
+# ---------- 수집 / 제출 ----------
+
+async def _release_analyses(db: Prisma, where: dict) -> int:
+    """배치에서 빠진 분석은 FAILED로 돌려 일반 재시도 경로로 보냅니다."""
+    analyses = await db.aianalysis.find_many(where={**where, "status": "PROCESSING"})
+    for analysis in analyses:
+        await db.aianalysis.update(
+            where={"id": analysis.id},
+            data={
+                "status": "FAILED",
+                "batchMode": False,
+                "batchId": None,
+                "nextRetryAt": analysis_service._next_retry_at(analysis.retryCount),
+            },
+        )
+    return len(analyses)
+
+
+async def submit_pending_batch(db: Prisma) -> int:
+    """Batch 대기 중인 분석을 JSONL로 모아 제출합니다. 제출한 건수를 반환"""
+    pending = await db.aianalysis.find_many(
+        where={"status": "PROCESSING", "batchMode": True, "batchId": None},
+        order={"updatedAt": "asc"},
+        take=settings.ANALYSIS_BATCH_MAX_ITEMS,
+    )
+    if not pending:
+        return 0
+
+    oldest_wait = datetime.now(timezone.utc) - pending[0].updatedAt
+    if (
+        len(pending) < settings.ANALYSIS_BATCH_MIN_ITEMS
+        and oldest_wait < timedelta(seconds=settings.ANALYSIS_BATCH_MAX_WAIT_SECONDS)
+    ):
+        return 0
+
+    backend = get_backend(settings.ANALYSIS_BATCH_BACKEND)
+    batch = await db.analysisbatch.create(
+        data={"backend": backend.name, "itemCount": len(pending)}
+    )
+    # 다른 프로세스가 먼저 가져간 분석은 제외
+    await db.aianalysis.update_many(
+        where={"id": {"in": [a.id for a in pending]}, "batchMode": True, "batchId": None},
+        data={"batchId": batch.id},
+    )
+    analyses = await db.aianalysis.find_many(
+        where={"batchId": batch.id},
+        include=_ANALYSIS_INCLUDE,
+    )
+    if not analyses:
+        # 전부 다른 프로세스가 가져감 — 빈 배치는 제출하지 않고 행도 남기지 않음
+        await db.analysisbatch.delete(where={"id": batch.id})
+        return 0
+
+    lines = []
+    for analysis in analyses:
+        submission = analysis.submission
+        task = submission.task if submission else None
+        lines.append({
+            "custom_id": analysis.id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": await analysis_service._build_gpt_request(
+                task, submission, url_expires_in=BATCH_IMAGE_URL_EXPIRES_SECONDS
+            ),
+        })
+
+    try:
+        provider_batch_id = await backend.submit(batch.id, lines)
+    except Exception as e:
+        logger.error(f"Analysis batch submit failed ({backend.name}): {e}")
+        await db.analysisbatch.update(
+            where={"id": batch.id},
+            data={"status": "FAILED", "failedCount": len(lines), "completedAt": datetime.now(timezone.utc)},
+        )
+        await _release_analyses(db, {"batchId": batch.id})
+        return 0
+
+    await db.analysisbatch.update(
+        where={"id": batch.id},
+        data={"status": "SUBMITTED", "providerBatchId": provider_batch_id, "itemCount": len(lines)},
+    )
+    logger.info(f"Submitted analysis batch {batch.id} ({len(lines)} items, {backend.name})")
+    return len(lines)
+
+
+# ---------- 폴링 / 결과 반영 ----------
+
+async def _apply_batch_results(db: Prisma, batch, state: str, results: list[dict]) -> int:
+    analyses = await db.aianalysis.find_many(
+        where={"batchId": batch.id, "status": "PROCESSING"},
+        include=_ANALYSIS_INCLUDE,
+    )
+    by_id = {r["custom_id"]: r for r in results}
+
+    succeeded = 0
+    for analysis in analyses:
+        result = by_id.get(analysis.id)
+        submission = analysis.submission
+        task = submission.task if submission else None
+        # 배치는 제공자 쪽 대기 시간이 섞이므로 토큰/비용과 반영 단계만 기록
+        timer = StageTimer()
+        timer.tier = model_routing.TIER_LARGE
+        outcome = "FAILED"
+        try:
+            if not result or result["error"]:
+                raise ValueError(result["error"] if result else "missing batch result")
+            timer.record_usage(result["model"], result["usage"])
+            with timer.stage("parse"):
+                gpt_result = analysis_service._parse_json_response(result["content"])
+            with timer.stage("write"):
+                await analysis_service._apply_gpt_result(db, analysis.id, submission, task, gpt_result)
+            outcome = "COMPLETED"
+            succeeded += 1
+        except Exception as e:
+            logger.warning(f"Batch result for {analysis.id} failed: {e}")
+            await _release_analyses(db, {"id": analysis.id})
+        await analysis_metrics_service.record_run(
+            db, analysis.id, task.subject if task else None, timer, "batch", outcome
+        )
+
+    await db.analysisbatch.update(
+        where={"id": batch.id},
+        data={
+            "status": "COMPLETED" if state == BATCH_COMPLETED else "FAILED",
+            "succeededCount": succeeded,
+            "failedCount": len(analyses) - succeeded,
+            "completedAt": datetime.now(timezone.utc),
+        },
+    )
+    return succeeded
+
+
+async def poll_batches(db: Prisma) -> int:
+    """제출된 배치 상태를 확인하고 완료된 결과를 AiAnalysis에 반영합니다."""
+    applied = 0
+
+    # 제출 도중 프로세스가 죽은 배치는 분석을 되돌림
+    stuck_before = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.ANALYSIS_STALE_TIMEOUT_SECONDS
+    )
+    stuck = await db.analysisbatch.find_many(
+        where={"status": "SUBMITTING", "createdAt": {"lt": stuck_before}}
+    )
+    for batch in stuck:
+        released = await _release_analyses(db, {"batchId": batch.id})
+        await db.analysisbatch.update(
+            where={"id": batch.id},
+            data={"status": "FAILED", "failedCount": released, "completedAt": datetime.now(timezone.utc)},
+        )
+
+    submitted = await db.analysisbatch.find_many(where={"status": "SUBMITTED"})
+    for batch in submitted:
+        try:
+            backend = get_backend(batch.backend)
+            state = await backend.poll(batch.providerBatchId)
+            if state == BATCH_IN_PROGRESS:
+                continue
+            results = await backend.fetch_results(batch.providerBatchId) if state == BATCH_COMPLETED else []
+        except Exception as e:
+            logger.error(f"Analysis batch poll failed for {batch.id}: {e}")
+            continue
+        applied += await _apply_batch_results(db, batch, state, results)
+
+    return applied
+
+
+async def run_batch_tick(db: Prisma) -> dict:
+    submitted = 0
+    if settings.ANALYSIS_BATCH_ENABLED:
+        submitted = await submit_pending_batch(db)
+    else:
+        # 배치 모드를 끈 뒤 남은 대기 분석은 일반 재시도 경로로 돌려보냄
+        await _release_analyses(db, {"batchMode": True, "batchId": None})
+    applied = await poll_batches(db)
+    return {"batchSubmitted": submitted, "batchApplied": applied}
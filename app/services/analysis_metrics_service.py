@@ -0,0 +1,190 @@
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+
+from prisma import Prisma
+
+from app.core import metrics
+from app.core.metrics import DEFAULT_TOKEN_BUCKETS, StageTimer
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+# USD / 1M tokens (input, output). 응답의 model은 날짜 접미사가 붙으므로 접두사로 매칭
+MODEL_PRICING_PER_1M: dict[str, tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+BATCH_DISCOUNT = 0.5  # Batch API는 동기 호출의 50%
+
+STAGES = ("load", "presign", "gpt", "parse", "write", "firstScore", "total")
+
+
+def estimate_cost_usd(
+    model: str | None,
+    prompt_tokens: int | None,
+    completion_tokens: int | None,
+    batch: bool = False,
+) -> float | None:
+    if not model or prompt_tokens is None:
+        return None
+    prefix = max(
+        (p for p in MODEL_PRICING_PER_1M if model.startswith(p)),
+        key=len,
+        default=None,
+    )
+    if prefix is None:
+        return None
+    input_price, output_price = MODEL_PRICING_PER_1M[prefix]
+    cost = (prompt_tokens * input_price + (completion_tokens or 0) * output_price) / 1_000_000
+    return round(cost * (BATCH_DISCOUNT if batch else 1.0), 6)
+
+
+def _timer_cost_usd(timer: StageTimer, batch: bool) -> float | None:
+    costs = [estimate_cost_usd(model, prompt, completion, batch) for model, prompt, completion in timer.usages]
+    known = [c for c in costs if c is not None]
+    return round(sum(known), 6) if known else None
+
+
+async def record_run(
+    db: Prisma,
+    analysis_id: str,
+    subject: str | None,
+    timer: StageTimer,
+    mode: str,
+    outcome: str,
+):
+    """분석 1회 실행의 단계별 시간/토큰/비용을 저장하고 히스토그램에 반영합니다.
+
+    측정 실패가 분석 결과에 영향을 주지 않도록 예외는 로그만 남깁니다.
+    """
+    total_ms = timer.total_ms()
+    stages = timer.stages_ms
+    try:
+        for stage, ms in stages.items():
+            metrics.observe(f"analysis.{stage}_ms", ms)
+        metrics.observe("analysis.total_ms", total_ms)
+        first_score_ms = timer.marks_ms.get("first_score")
+        if first_score_ms is not None:
+            metrics.observe("analysis.first_score_ms", first_score_ms)
+        if timer.prompt_tokens is not None:
+            metrics.observe("analysis.prompt_tokens", timer.prompt_tokens, DEFAULT_TOKEN_BUCKETS)
+        if timer.completion_tokens is not None:
+            metrics.observe("analysis.completion_tokens", timer.completion_tokens, DEFAULT_TOKEN_BUCKETS)
+
+        await db.analysismetric.create(
+            data={
+                "analysis": {"connect": {"id": analysis_id}},
+                "subject": subject,
+                "mode": mode,
+                "outcome": outcome,
+                "model": timer.model,
+                "modelTier": timer.tier,
+                "escalated": timer.escalated,
+                "loadMs": stages.get("load"),
+                "presignMs": stages.get("presign"),
+                "gptMs": stages.get("gpt"),
+                "parseMs": stages.get("parse"),
+                "writeMs": stages.get("write"),
+                "firstScoreMs": first_score_ms,
+                "totalMs": total_ms,
+                "promptTokens": timer.prompt_tokens,
+                "completionTokens": timer.completion_tokens,
+                "costUsd": _timer_cost_usd(timer, batch=mode == "batch"),
+            }
+        )
+    except Exception as e:
+        logger.warning(f"Failed to record analysis metrics for {analysis_id}: {e}")
+
+
+# ---------- 요약 (관리자용) ----------
+
+_STAGE_PERCENTILE_SQL = """
+SELECT s."stage",
+       COUNT(*)::int AS "count",
+       percentile_cont(0.5) WITHIN GROUP (ORDER BY s."ms") AS "p50",
+       percentile_cont(0.95) WITHIN GROUP (ORDER BY s."ms") AS "p95",
+       percentile_cont(0.99) WITHIN GROUP (ORDER BY s."ms") AS "p99"
+FROM "AnalysisMetric" m
+CROSS JOIN LATERAL (VALUES
+    ('load', m."loadMs"),
+    ('presign', m."presignMs"),
+    ('gpt', m."gptMs"),
+    ('parse', m."parseMs"),
+    ('write', m."writeMs"),
+    ('firstScore', m."firstScoreMs"),
+    ('total', m."totalMs")
+) AS s("stage", "ms")
+WHERE m."createdAt" >= $1::timestamp
+  AND m."createdAt" < $2::timestamp
+  AND s."ms" IS NOT NULL
+GROUP BY s."stage"
+"""
+
+# 일 단위는 KST 기준
+_COST_BY_DAY_SQL = """
+SELECT to_char(m."createdAt" + interval '9 hours', 'YYYY-MM-DD') AS "date",
+       m."subject"::text AS "subject",
+       COUNT(*)::int AS "analyses",
+       COALESCE(SUM(m."promptTokens"), 0)::int AS "promptTokens",
+       COALESCE(SUM(m."completionTokens"), 0)::int AS "completionTokens",
+       COALESCE(SUM(m."costUsd"), 0)::float AS "costUsd"
+FROM "AnalysisMetric" m
+WHERE m."createdAt" >= $1::timestamp
+  AND m."createdAt" < $2::timestamp
+GROUP BY 1, 2
+ORDER BY 1, 2
+"""
+
+
+_TIER_SQL = """
+SELECT m."modelTier" AS "tier",
+       COUNT(*)::int AS "analyses",
+       COUNT(*) FILTER (WHERE m."escalated")::int AS "escalated",
+       percentile_cont(0.5) WITHIN GROUP (ORDER BY m."totalMs") AS "totalP50",
+       COALESCE(SUM(m."costUsd"), 0)::float AS "costUsd"
+FROM "AnalysisMetric" m
+WHERE m."createdAt" >= $1::timestamp
+  AND m."createdAt" < $2::timestamp
+  AND m."modelTier" IS NOT NULL
+GROUP BY 1
+ORDER BY 1
+"""
+
+
+def _kst_day_start_utc(d: date) -> str:
+    start = datetime.combine(d, time.min, tzinfo=KST).astimezone(timezone.utc)
+    return start.replace(tzinfo=None).isoformat()
+
+
+async def get_metrics_summary(db: Prisma, date_from: date | None, date_to: date | None) -> dict:
+    today = datetime.now(KST).date()
+    date_to = date_to or today
+    date_from = date_from or date_to - timedelta(days=6)
+
+    start = _kst_day_start_utc(date_from)
+    end = _kst_day_start_utc(date_to + timedelta(days=1))
+
+    stage_rows = await db.query_raw(_STAGE_PERCENTILE_SQL, start, end)
+    by_stage = {row["stage"]: row for row in stage_rows}
+    cost_rows = await db.query_raw(_COST_BY_DAY_SQL, start, end)
+    tier_rows = await db.query_raw(_TIER_SQL, start, end)
+
+    return {
+        "dateFrom": date_from,
+        "dateTo": date_to,
+        "stages": [
+            {
+                "stage": stage,
+                "count": by_stage[stage]["count"],
+                "p50": by_stage[stage]["p50"],
+                "p95": by_stage[stage]["p95"],
+                "p99": by_stage[stage]["p99"],
+            }
+            for stage in STAGES
+            if stage in by_stage
+        ],
+        "costByDay": cost_rows,
+        "byTier": tier_rows,
+        "histograms": metrics.snapshot(),
+    }
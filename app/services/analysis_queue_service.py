@@ -0,0 +1,336 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+from prisma import Prisma
+
+from app.core.circuit_breaker import CLOSED, HALF_OPEN
+from app.core.config import settings
+from app.services import analysis_batch_service, analysis_service
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 내 분석 작업 우선순위 큐. 워커/스케줄러는 main.py lifespan에서 시작/종료합니다.
+#
+# 유효 우선순위 = priority + aging_rate * 대기시간 이므로, 두 작업의 비교에서 현재 시각은
+# 상쇄되고 (aging_rate * enqueuedAt - priority)가 작은 쪽이 항상 먼저입니다.
+# 이 값을 힙 키로 쓰면 대기가 길어진 작업이 자연스럽게 앞으로 당겨져 기아가 생기지 않습니다.
+_heap: list[tuple[float, int, str]] = []
+_entries: dict[str, tuple[float, int, int, float]] = {}  # analysisId → (key, seq, priority, enqueuedAt)
+_running: set[str] = set()
+_wakeup: asyncio.Event | None = None
+_seq = itertools.count()
+_workers: list[asyncio.Task] = []
+_scheduler: asyncio.Task | None = None
+
+_stats = {
+    "enqueued": 0,
+    "bumped": 0,
+    "processed": 0,
+    "reaped": 0,
+    "retried": 0,
+    "requeued": 0,
+    "enrichQueued": 0,
+    "deferredToBatch": 0,
+    "batchSubmitted": 0,
+    "batchApplied": 0,
+    "lastTickAt": None,
+}
+_wait_seconds: deque[float] = deque(maxlen=1000)  # 최근 작업의 큐 대기 시간
+
+SCHEDULER_BATCH_SIZE = 100
+
+
+def _heap_key(priority: int, enqueued_at: float) -> float:
+    aging_per_second = settings.ANALYSIS_PRIORITY_AGING_PER_MINUTE / 60
+    return aging_per_second * enqueued_at - priority
+
+
+def _push(analysis_id: str, priority: int, enqueued_at: float):
+    key = _heap_key(priority, enqueued_at)
+    seq = next(_seq)
+    _entries[analysis_id] = (key, seq, priority, enqueued_at)
+    heapq.heappush(_heap, (key, seq, analysis_id))
+    _wakeup.set()
+
+
+def enqueue(analysis_id: str, priority: int = analysis_service.PRIORITY_NORMAL) -> bool:
+    """분석 작업을 큐에 등록합니다.
+
+    이미 대기 중이면 더 높은 우선순위로만 갱신(대기 시간은 유지)하고,
+    실행 중이거나 새로 등록/갱신되지 않았으면 False를 반환합니다.
+    """
+    if _wakeup is None:
+        logger.warning(f"Analysis queue not started, {analysis_id} left for scheduler")
+        return False
+    if analysis_id in _running:
+        return False
+
+    queued = _entries.get(analysis_id)
+    if queued:
+        if priority <= queued[2]:
+            return False
+        # 기존 힙 항목은 꺼낼 때 _entries와 비교해 버린다 (lazy deletion)
+        _push(analysis_id, priority, queued[3])
+        _stats["bumped"] += 1
+        return True
+
+    _push(analysis_id, priority, time.time())
+    _stats["enqueued"] += 1
+    return True
+
+
+def bump(analysis_id: str, priority: int) -> bool:
+    """이 프로세스 큐에서 대기 중인 작업만 우선순위를 올립니다."""
+    if analysis_id not in _entries:
+        return False
+    return enqueue(analysis_id, priority)
+
+
+def is_pending(analysis_id: str) -> bool:
+    return analysis_id in _entries or analysis_id in _running
+
+
+async def _next_job() -> tuple[str, int]:
+    while True:
+        while _heap:
+            key, seq, analysis_id = heapq.heappop(_heap)
+            entry = _entries.get(analysis_id)
+            if entry and entry[:2] == (key, seq):
+                del _entries[analysis_id]
+                _wait_seconds.append(time.time() - entry[3])
+                return analysis_id, entry[2]
+        _wakeup.clear()
+        await _wakeup.wait()
+
+
+async def _worker(db: Prisma):
+    while True:
+        analysis_id, priority = await _next_job()
+        _running.add(analysis_id)
+        try:
+            # 야간 비긴급 분석은 동기 호출 대신 Batch API로 넘김
+            if analysis_service.should_batch(priority):
+                if await analysis_service.defer_to_batch(db, analysis_id):
+                    _stats["deferredToBatch"] += 1
+                    continue
+            await analysis_service.run_analysis_background(db, analysis_id)
+            _stats["processed"] += 1
+        except Exception as e:
+            logger.error(f"Analysis worker error for {analysis_id}: {e}")
+        finally:
+            _running.discard(analysis_id)
+
+
+# ---------- 스케줄러: stale 회수 + 자동 재시도 ----------
+
+async def reap_stale_analyses(db: Prisma) -> int:
+    """PROCESSING 상태로 타임아웃을 넘긴 분석을 FAILED로 전환합니다.
+
+    프로세스가 분석 도중 죽으면 PROCESSING이 영원히 남기 때문에, 이 프로세스 큐에
+    없는 오래된 PROCESSING은 중단된 것으로 보고 재시도 일정을 잡습니다.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.ANALYSIS_STALE_TIMEOUT_SECONDS
+    )
+    # Batch 처리 중인 분석은 제공자 완료 기한(최대 24시간)이 별도라 제외
+    where: dict = {"status": "PROCESSING", "batchMode": False, "updatedAt": {"lt": cutoff}}
+    local_ids = [*_entries, *_running]
+    if local_ids:
+        where["id"] = {"not_in": local_ids}
+
+    stale = await db.aianalysis.find_many(
+        where=where,
+        order={"updatedAt": "asc"},
+        take=SCHEDULER_BATCH_SIZE,
+    )
+
+    reaped = 0
+    for analysis in stale:
+        # 조회 이후 다른 워커가 갱신했으면 건너뜀
+        count = await db.aianalysis.update_many(
+            where={"id": analysis.id, "status": "PROCESSING", "updatedAt": {"lt": cutoff}},
+            data={
+                "status": "FAILED",
+                "nextRetryAt": analysis_service._next_retry_at(analysis.retryCount),
+            },
+        )
+        reaped += count
+
+    if reaped:
+        logger.warning(f"Reaped {reaped} stale PROCESSING analyses")
+    _stats["reaped"] += reaped
+    return reaped
+
+
+async def requeue_orphaned_pending(db: Prisma) -> int:
+    """큐에 없는 PENDING 분석을 다시 등록합니다 (제출 직후 재시작 등으로 큐 등록이 유실된 경우).
+
+    다른 프로세스 큐에 있을 수 있어 중복 등록될 수 있지만, 워커가 PENDING→PROCESSING을
+    조건부 갱신으로 가져가므로 실행은 한 번만 됩니다.
+    """
+    grace_before = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.ANALYSIS_PENDING_GRACE_SECONDS
+    )
+    where: dict = {"status": "PENDING", "createdAt": {"lt": grace_before}}
+    local_ids = [*_entries, *_running]
+    if local_ids:
+        where["id"] = {"not_in": local_ids}
+
+    orphans = await db.aianalysis.find_many(
+        where=where,
+        include={"submission": {"include": {"task": True}}},
+        order={"createdAt": "asc"},
+        take=SCHEDULER_BATCH_SIZE,
+    )
+
+    requeued = 0
+    for analysis in orphans:
+        task = analysis.submission.task if analysis.submission else None
+        if enqueue(analysis.id, analysis_service.analysis_priority(task)):
+            requeued += 1
+
+    if requeued:
+        logger.warning(f"Re-enqueued {requeued} orphaned PENDING analyses")
+    _stats["requeued"] += requeued
+    return requeued
+
+
+async def retry_failed_analyses(db: Prisma) -> int:
+    """재시도 예정 시각이 지난 FAILED 분석을 다시 큐에 등록합니다."""
+    due = await db.aianalysis.find_many(
+        where={
+            "status": "FAILED",
+            "retryCount": {"lt": settings.ANALYSIS_MAX_RETRIES},
+            "nextRetryAt": {"lte": datetime.now(timezone.utc)},
+        },
+        order={"nextRetryAt": "asc"},
+        take=SCHEDULER_BATCH_SIZE,
+    )
+
+    retried = 0
+    for analysis in due:
+        # 여러 프로세스가 동시에 스케줄링해도 한 곳에서만 가져가도록 조건부 갱신
+        claimed = await db.aianalysis.update_many(
+            where={"id": analysis.id, "status": "FAILED", "retryCount": analysis.retryCount},
+            data={
+                "status": "PROCESSING",
+                "retryCount": analysis.retryCount + 1,
+                "nextRetryAt": None,
+            },
+        )
+        if claimed and enqueue(analysis.id):
+            retried += 1
+
+    if retried:
+        logger.info(f"Re-enqueued {retried} failed analyses")
+    _stats["retried"] += retried
+    return retried
+
+
+async def enqueue_degraded_enrichment(db: Prisma) -> int:
+    """OpenAI 서킷이 닫혀 있으면 간이 분석(isDegraded)을 GPT 보강 대상으로 등록합니다.
+
+    HALF_OPEN이면 1건만 등록해 시험 호출로 씁니다. 새 제출이 없어도 장애 복구 후 서킷이 닫히도록.
+    """
+    breaker_state = analysis_service.openai_breaker.state
+    if breaker_state not in (CLOSED, HALF_OPEN):
+        return 0
+
+    now = datetime.now(timezone.utc)
+    due = await db.aianalysis.find_many(
+        where={"status": "COMPLETED", "isDegraded": True, "nextRetryAt": {"lte": now}},
+        order={"nextRetryAt": "asc"},
+        take=SCHEDULER_BATCH_SIZE if breaker_state == CLOSED else 1,
+    )
+
+    # 보강 중 프로세스가 죽어도 다시 잡히도록 nextRetryAt을 임대 만료 시각으로 사용
+    lease_until = now + timedelta(seconds=settings.ANALYSIS_STALE_TIMEOUT_SECONDS)
+    queued = 0
+    for analysis in due:
+        claimed = await db.aianalysis.update_many(
+            where={"id": analysis.id, "isDegraded": True, "nextRetryAt": analysis.nextRetryAt},
+            data={"nextRetryAt": lease_until},
+        )
+        if claimed and enqueue(analysis.id, analysis_service.PRIORITY_BACKGROUND):
+            queued += 1
+
+    if queued:
+        logger.info(f"Queued {queued} degraded analyses for GPT enrichment")
+    _stats["enrichQueued"] += queued
+    return queued
+
+
+async def run_scheduler_tick(db: Prisma) -> dict:
+    reaped = await reap_stale_analyses(db)
+    requeued = await requeue_orphaned_pending(db)
+    retried = await retry_failed_analyses(db)
+    enriched = await enqueue_degraded_enrichment(db)
+    batch = await analysis_batch_service.run_batch_tick(db)
+    _stats["batchSubmitted"] += batch["batchSubmitted"]
+    _stats["batchApplied"] += batch["batchApplied"]
+    _stats["lastTickAt"] = datetime.now(timezone.utc)
+    return {
+        "reaped": reaped,
+        "requeued": requeued,
+        "retried": retried,
+        "enrichQueued": enriched,
+        **batch,
+    }
+
+
+async def _scheduler_loop(db: Prisma):
+    while True:
+        try:
+            await run_scheduler_tick(db)
+        except Exception as e:
+            logger.error(f"Analysis scheduler tick failed: {e}")
+        await asyncio.sleep(settings.ANALYSIS_SCHEDULER_INTERVAL_SECONDS)
+
+
+# ---------- lifecycle ----------
+
+async def start(db: Prisma):
+    global _wakeup, _scheduler
+    _wakeup = asyncio.Event()
+    for _ in range(max(1, settings.ANALYSIS_WORKER_CONCURRENCY)):
+        _workers.append(asyncio.create_task(_worker(db)))
+    _scheduler = asyncio.create_task(_scheduler_loop(db))
+
+
+async def stop():
+    global _wakeup, _scheduler
+    tasks = [*_workers, *([_scheduler] if _scheduler else [])]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _workers.clear()
+    _heap.clear()
+    _entries.clear()
+    _running.clear()
+    _wakeup = None
+    _scheduler = None
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 2)
+
+
+def get_stats() -> dict:
+    waits = list(_wait_seconds)
+    return {
+        **_stats,
+        "queueSize": len(_entries),
+        "inFlight": len(_entries) + len(_running),
+        "waitP50Seconds": _percentile(waits, 0.5),
+        "waitP95Seconds": _percentile(waits, 0.95),
+        "workers": len(_workers),
+        "openaiCircuit": analysis_service.openai_breaker.state,
+    }
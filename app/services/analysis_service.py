@@ -2,12 +2,23 @@ import asyncio
 import json
 import logging
 import random
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
 
+import openai
 from fastapi import HTTPException, status
 from openai import AsyncOpenAI
 from prisma import Json, Prisma
 
+from app.core import model_routing
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.config import settings
+from app.core.json_stream import JsonObjectStream
+from app.core.metrics import StageTimer
+from app.core.permissions import check_mentor_access
+from app.schemas.analysis import AnalysisBulkTriggerRequest
+from app.services import analysis_metrics_service, coaching_precompute_service, image_composite_service
 from app.services.upload_service import _key_from_url, generate_presigned_url
 
 logger = logging.getLogger(__name__)
@@ -18,23 +29,57 @@ _openai_client: AsyncOpenAI | None = None
 def _get_openai() -> AsyncOpenAI:
     global _openai_client
     if _openai_client is None:
-        _openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        _openai_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+        )
     return _openai_client
 
 
+openai_breaker = CircuitBreaker(
+    "openai",
+    failure_threshold=settings.OPENAI_BREAKER_FAILURE_THRESHOLD,
+    recovery_seconds=settings.OPENAI_BREAKER_RECOVERY_SECONDS,
+)
+
+# 제공자 장애로 보는 예외 (타임아웃/연결 실패/429/5xx). 4xx 요청 오류는 제외
+_PROVIDER_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
 def _is_mock_mode() -> bool:
+    # OPENAI_BASE_URL(가짜 서버 등)을 지정하면 테스트 환경에서도 실제 호출 경로를 사용
+    if settings.OPENAI_BASE_URL:
+        return False
     return settings.APP_ENV == "test" or not settings.OPENAI_API_KEY
 
 
 # ---------- 학습 밀도 공식 ----------
-# A. 과제점수 (50%): (정답 수 / 전체 문제 수) * 100
-# B. 필기점수 (20%): min(100, (필기율 / 20) * 100) — 필기율 20% 이상이면 만점
-# C. 시간점수 (30%): 목표 이상이면 100, 미만이면 (실제 / 목표) * 100
-# 신호등: 70↑ GREEN, 40↑ YELLOW, 미만 RED
+# A. 과제점수: (정답 수 / 전체 문제 수) * 100
+# B. 필기점수: min(100, (필기율 / 20) * 100) — 필기율 20% 이상이면 만점
+# C. 시간점수: 목표 이상이면 100, 미만이면 (실제 / 목표) * 100
+# 가중치와 신호등 기준은 SCORING_CONFIGS에 버전별로 관리합니다.
+# 기준을 바꿀 때는 기존 버전을 수정하지 말고 새 버전을 추가하세요.
+# 저장된 분석은 rescoring_service로 GPT 호출 없이 일괄 재계산합니다.
 
-WEIGHT_TASK = 0.5
-WEIGHT_WRITING = 0.2
-WEIGHT_TIME = 0.3
+SCORING_CONFIGS: dict[int, dict] = {
+    1: {
+        "weights": {"task": 0.5, "writing": 0.2, "time": 0.3},
+        "thresholds": {"GREEN": 70, "YELLOW": 40},
+    },
+}
+SCORING_VERSION = max(SCORING_CONFIGS)
+
+SCORE_DETAIL_MARKER = "[점수 산출]"
+
+
+def _get_scoring_config(version: int | None = None) -> dict:
+    return SCORING_CONFIGS[version or SCORING_VERSION]
 
 
 def _calc_task_score(submission) -> float:
@@ -66,33 +111,160 @@ def _calc_time_score(task) -> float:
     return (actual / target) * 100
 
 
-def _calc_density(task_score: float, writing_score: float, time_score: float) -> int:
-    """최종 밀도 점수 = A*0.5 + B*0.2 + C*0.3"""
-    raw = task_score * WEIGHT_TASK + writing_score * WEIGHT_WRITING + time_score * WEIGHT_TIME
+def _calc_density(
+    task_score: float, writing_score: float, time_score: float, config: dict | None = None
+) -> int:
+    """최종 밀도 점수 = A*w_task + B*w_writing + C*w_time"""
+    weights = (config or _get_scoring_config())["weights"]
+    raw = (
+        task_score * weights["task"]
+        + writing_score * weights["writing"]
+        + time_score * weights["time"]
+    )
     return max(0, min(100, round(raw)))
 
 
-def _signal_light(score: int) -> str:
-    if score >= 70:
+def _signal_light(score: int, config: dict | None = None) -> str:
+    thresholds = (config or _get_scoring_config())["thresholds"]
+    if score >= thresholds["GREEN"]:
         return "GREEN"
-    if score >= 40:
+    if score >= thresholds["YELLOW"]:
         return "YELLOW"
     return "RED"
 
 
+def _score_detail(
+    task_score: float,
+    writing_score: float,
+    time_score: float,
+    density_score: int,
+    config: dict | None = None,
+) -> str:
+    """상세 분석 앞에 붙는 점수 산출 근거 1줄"""
+    weights = (config or _get_scoring_config())["weights"]
+    return (
+        f"{SCORE_DETAIL_MARKER} "
+        f"과제 {task_score:.0f}×{weights['task']}={task_score * weights['task']:.0f}, "
+        f"필기 {writing_score:.0f}×{weights['writing']}={writing_score * weights['writing']:.0f}, "
+        f"시간 {time_score:.0f}×{weights['time']}={time_score * weights['time']:.0f} → "
+        f"총 {density_score}점"
+    )
+
+
+# ---------- 분석 우선순위 ----------
+# 값이 클수록 먼저 처리합니다. 큐에서 대기 시간만큼 가산(aging)되므로 낮은 우선순위도 결국 처리됩니다.
+
+PRIORITY_BACKGROUND = 0  # 간이 분석 보강 등 급하지 않은 작업
+PRIORITY_NORMAL = 10
+PRIORITY_URGENT = 100  # 멘토의 "지금 분석" 요청
+
+# 멘토가 코칭센터에서 최근 조회한 멘티 (menteeId → 조회 시각)
+_mentee_viewed_at: dict[str, float] = {}
+
+
+def mark_mentee_viewed(mentee_id: str):
+    _mentee_viewed_at[mentee_id] = time.monotonic()
+
+
+def _is_mentee_viewed(mentee_id: str) -> bool:
+    viewed_at = _mentee_viewed_at.get(mentee_id)
+    return (
+        viewed_at is not None
+        and time.monotonic() - viewed_at < settings.ANALYSIS_MENTOR_VIEW_WINDOW_SECONDS
+    )
+
+
+def analysis_priority(task, manual: bool = False) -> int:
+    """과제 날짜(오늘/내일 코칭 대상), 멘토 조회 여부, 수동 요청으로 우선순위 산출"""
+    priority = PRIORITY_NORMAL
+    if task:
+        days_left = (task.date.date() - datetime.now(timezone.utc).date()).days
+        if days_left <= 0:
+            priority += 20
+        elif days_left == 1:
+            priority += 10
+        if _is_mentee_viewed(task.menteeId):
+            priority += 40
+    if manual:
+        priority += 50
+    return priority
+
+
+# ---------- Batch API 대상 판정 ----------
+# 야간에 들어온 급하지 않은 분석(멘토 조회/수동 요청 없음)은 Batch API로 모아서 처리합니다.
+
+KST = timezone(timedelta(hours=9))
+
+
+def _in_batch_window(now: datetime | None = None) -> bool:
+    hour = (now or datetime.now(KST)).astimezone(KST).hour
+    start = settings.ANALYSIS_BATCH_WINDOW_START_HOUR
+    end = settings.ANALYSIS_BATCH_WINDOW_END_HOUR
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+def should_batch(priority: int) -> bool:
+    return (
+        settings.ANALYSIS_BATCH_ENABLED
+        and priority <= settings.ANALYSIS_BATCH_MAX_PRIORITY
+        and _in_batch_window()
+    )
+
+
+async def defer_to_batch(db: Prisma, analysis_id: str) -> bool:
+    """분석을 Batch 대기 상태로 전환 (analysis_batch_service가 모아서 제출)
+
+    이미 Batch 대기/제출된 분석은 batchId를 지우면 다른 배치에 중복 제출되므로 건드리지 않음
+    """
+    count = await db.aianalysis.update_many(
+        where={"id": analysis_id, "status": {"in": ["PENDING", "PROCESSING"]}, "batchMode": False},
+        data={"status": "PROCESSING", "batchMode": True, "batchId": None},
+    )
+    return count > 0
+
+
+async def _claim_for_queue(db: Prisma, analysis) -> bool:
+    """이 요청에서 큐에 넣어도 되는 분석인지 판정합니다.
+
+    - PENDING: 워커가 PENDING→PROCESSING 조건부 갱신으로 가져가므로 중복 등록돼도 한 번만 실행
+    - Batch 대기 중(제출 전) PROCESSING: 조건부 갱신으로 배치에서 빼낸 요청만 등록
+    - 그 외 PROCESSING: 다른 워커가 실행 중이거나 큐에 있으므로 등록하지 않음
+      (이 프로세스 큐에 있으면 라우터에서 우선순위만 올림)
+    """
+    if analysis.status == "PENDING":
+        return True
+    if analysis.status != "PROCESSING" or not analysis.batchMode:
+        return False
+    count = await db.aianalysis.update_many(
+        where={"id": analysis.id, "status": "PROCESSING", "batchMode": True, "batchId": None},
+        data={"batchMode": False},
+    )
+    return count > 0
+
+
 # ---------- trigger / status / retry ----------
 
-async def trigger_analysis(db: Prisma, submission_id: str):
-    submission = await db.tasksubmission.find_unique(where={"id": submission_id})
+async def trigger_analysis(db: Prisma, submission_id: str, manual: bool = False):
+    submission = await db.tasksubmission.find_unique(
+        where={"id": submission_id},
+        include={"task": True},
+    )
     if not submission:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"code": "ANALYSIS_003", "message": "제출물을 찾을 수 없습니다"},
         )
 
+    priority = analysis_priority(submission.task, manual)
+
     existing = await db.aianalysis.find_unique(where={"submissionId": submission_id})
-    if existing and existing.status in ("PROCESSING", "COMPLETED"):
-        return {"analysisId": existing.id, "status": existing.status}
+    # PENDING(제출 시 자동 생성, 큐 대기)도 진행 중으로 보고 새로 만들지 않음
+    if existing and existing.status in ("PENDING", "PROCESSING", "COMPLETED"):
+        # 실행 중/Batch 처리 중인 분석은 큐에 다시 넣지 않음 (PENDING만 재등록)
+        queued = existing.status == "PENDING"
+        return {"analysisId": existing.id, "status": existing.status, "priority": priority, "queued": queued}
 
     if existing:
         await db.aianalysis.update(
@@ -114,7 +286,142 @@ async def trigger_analysis(db: Prisma, submission_id: str):
         data={"status": "ANALYZING"},
     )
 
-    return {"analysisId": analysis_id, "status": "PROCESSING"}
+    return {"analysisId": analysis_id, "status": "PROCESSING", "priority": priority, "queued": True}
+
+
+def _to_utc(d: date) -> datetime:
+    return datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
+
+
+async def _find_bulk_submissions(db: Prisma, data: AnalysisBulkTriggerRequest):
+    if data.submissionIds:
+        return await db.tasksubmission.find_many(
+            where={"id": {"in": list(dict.fromkeys(data.submissionIds))}},
+            include={"task": True, "analysis": True},
+        )
+
+    if not (data.menteeId and data.dateFrom and data.dateTo) or data.dateFrom > data.dateTo:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "code": "ANALYSIS_004",
+                "message": "submissionIds 또는 menteeId와 기간(dateFrom~dateTo)을 입력해주세요",
+            },
+        )
+
+    submissions = await db.tasksubmission.find_many(
+        where={
+            "menteeId": data.menteeId,
+            "task": {
+                "is": {
+                    "date": {"gte": _to_utc(data.dateFrom), "lte": _to_utc(data.dateTo)},
+                }
+            },
+        },
+        include={"task": True, "analysis": True},
+        order={"submittedAt": "desc"},
+    )
+    # 과제별 최신 제출물만 분석 (코칭센터와 동일 기준)
+    latest = {}
+    for sub in submissions:
+        latest.setdefault(sub.taskId, sub)
+    return list(latest.values())
+
+
+async def bulk_trigger_analysis(db: Prisma, user, data: AnalysisBulkTriggerRequest):
+    """여러 제출물의 분석을 한 번에 시작합니다.
+
+    분석 행 생성/재설정은 한 트랜잭션으로 처리하고, 이미 진행 중이거나 완료된 분석은
+    건너뜁니다. 대기(PENDING) 중인 분석은 그대로 두고 큐에만 다시 넣습니다 (trigger_analysis와 동일).
+    큐 등록은 커밋 이후 라우터에서 합니다 (items의 priority 사용).
+    """
+    if user.role != "MENTOR" or not user.mentorProfile:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "PERM_001", "message": "멘토 권한이 필요합니다"},
+        )
+
+    submissions = await _find_bulk_submissions(db, data)
+
+    # 담당 멘티 확인 (멘티 수와 관계없이 쿼리 1회)
+    mentee_ids = {sub.menteeId for sub in submissions}
+    if mentee_ids:
+        links = await db.mentormentee.find_many(
+            where={"mentorId": user.mentorProfile.id, "menteeId": {"in": list(mentee_ids)}}
+        )
+        if len(links) < len(mentee_ids):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail={"code": "PERM_002", "message": "담당 멘티의 데이터만 접근 가능합니다"},
+            )
+
+    items = []
+    to_create = []
+    to_reset = []
+    task_ids = set()
+    for sub in submissions:
+        existing = sub.analysis
+        if existing and existing.status == "PENDING":
+            # 큐 등록은 중복 제거되고 워커가 PENDING→PROCESSING으로 선점하므로 다시 넣어도 한 번만 실행됨
+            items.append({
+                "submissionId": sub.id,
+                "analysisId": existing.id,
+                "status": existing.status,
+                "queued": True,
+                "priority": analysis_priority(sub.task, manual=True),
+            })
+            continue
+        if existing and existing.status in ("PROCESSING", "COMPLETED"):
+            items.append({
+                "submissionId": sub.id,
+                "analysisId": existing.id,
+                "status": existing.status,
+                "queued": False,
+            })
+            continue
+
+        if existing:
+            analysis_id = existing.id
+            to_reset.append(analysis_id)
+        else:
+            analysis_id = str(uuid.uuid4())
+            to_create.append({"id": analysis_id, "submissionId": sub.id, "status": "PROCESSING"})
+
+        items.append({
+            "submissionId": sub.id,
+            "analysisId": analysis_id,
+            "status": "PROCESSING",
+            "queued": True,
+            "priority": analysis_priority(sub.task, manual=True),
+        })
+        task_ids.add(sub.taskId)
+
+    if task_ids:
+        async with db.tx() as tx:
+            if to_create:
+                await tx.aianalysis.create_many(data=to_create)
+            if to_reset:
+                await tx.aianalysis.update_many(
+                    where={"id": {"in": to_reset}},
+                    data={"status": "PROCESSING", "nextRetryAt": None},
+                )
+            await tx.task.update_many(
+                where={"id": {"in": list(task_ids)}},
+                data={"status": "ANALYZING"},
+            )
+
+    if data.submissionIds:
+        found = {sub.id for sub in submissions}
+        for submission_id in dict.fromkeys(data.submissionIds):
+            if submission_id not in found:
+                items.append({
+                    "submissionId": submission_id,
+                    "analysisId": None,
+                    "status": "NOT_FOUND",
+                    "queued": False,
+                })
+
+    return {"total": len(items), "queued": sum(item["queued"] for item in items), "items": items}
 
 
 async def get_analysis(db: Prisma, submission_id: str):
@@ -134,11 +441,38 @@ async def get_analysis_status(db: Prisma, submission_id: str):
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"code": "ANALYSIS_003", "message": "분석 결과를 찾을 수 없습니다"},
         )
-    return {"id": analysis.id, "submissionId": submission_id, "status": analysis.status}
+    # 스트리밍 중 먼저 저장된 점수/요약은 PROCESSING 상태에서 부분 결과로 노출
+    return {
+        "id": analysis.id,
+        "submissionId": submission_id,
+        "status": analysis.status,
+        "isPartial": analysis.status == "PROCESSING" and analysis.densityScore is not None,
+        "signalLight": analysis.signalLight,
+        "densityScore": analysis.densityScore,
+        "writingRatio": analysis.writingRatio,
+        "traceTypes": analysis.traceTypes,
+        "summary": analysis.summary,
+    }
+
+
+def _next_retry_at(retry_count: int) -> datetime | None:
+    """자동 재시도 예정 시각 (지수 백오프 + 지터). 재시도 한도를 넘으면 None"""
+    if retry_count >= settings.ANALYSIS_MAX_RETRIES:
+        return None
+    delay = min(
+        settings.ANALYSIS_RETRY_MAX_SECONDS,
+        settings.ANALYSIS_RETRY_BASE_SECONDS * 2 ** retry_count,
+    )
+    # 동시에 실패한 분석들이 한꺼번에 재시도되지 않도록 분산
+    delay *= random.uniform(0.5, 1.0)
+    return datetime.now(timezone.utc) + timedelta(seconds=delay)
 
 
 async def retry_analysis(db: Prisma, submission_id: str):
-    analysis = await db.aianalysis.find_unique(where={"submissionId": submission_id})
+    analysis = await db.aianalysis.find_unique(
+        where={"submissionId": submission_id},
+        include={"submission": {"include": {"task": True}}},
+    )
     if not analysis:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -153,10 +487,42 @@ async def retry_analysis(db: Prisma, submission_id: str):
 
     await db.aianalysis.update(
         where={"id": analysis.id},
-        data={"status": "PROCESSING", "retryCount": analysis.retryCount + 1},
+        data={
+            "status": "PROCESSING",
+            "retryCount": analysis.retryCount + 1,
+            "nextRetryAt": None,
+        },
+    )
+
+    task = analysis.submission.task if analysis.submission else None
+    return {
+        "analysisId": analysis.id,
+        "status": "PROCESSING",
+        "priority": analysis_priority(task, manual=True),
+    }
+
+
+async def prioritize_analysis(db: Prisma, user, submission_id: str):
+    """멘토의 "지금 분석" 요청: 대기 중인 분석을 최우선으로 올립니다."""
+    if user.role != "MENTOR":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "PERM_001", "message": "멘토만 요청할 수 있습니다"},
+        )
+
+    analysis = await db.aianalysis.find_unique(
+        where={"submissionId": submission_id},
+        include={"submission": True},
     )
+    if not analysis:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "ANALYSIS_003", "message": "분석 결과를 찾을 수 없습니다"},
+        )
+    await check_mentor_access(user, analysis.submission.menteeId, db)
 
-    return {"analysisId": analysis.id, "status": "PROCESSING"}
+    queued = await _claim_for_queue(db, analysis)
+    return {"analysisId": analysis.id, "status": analysis.status, "priority": PRIORITY_URGENT, "queued": queued}
 
 
 # ---------- GPT-4o Vision (필기율 + 정성 분석) ----------
@@ -225,7 +591,7 @@ def _build_analysis_prompt(task, submission) -> str:
     problems_text = ""
     if task and task.problems:
         for p in task.problems:
-            problems_text += f"  {p.number}번: {p.title}\n"
+            problems_text += f"  {p.number}번: {p.bank.title}\n"
 
     comment = submission.comment or "없음"
 
@@ -250,15 +616,13 @@ def _parse_json_response(raw: str) -> dict:
     return json.loads(raw)
 
 
-async def _call_gpt4o_vision(image_urls: list[str], prompt: str) -> dict:
-    """인증샷 이미지 + 과제 정보로 GPT-4o Vision 분석"""
-    client = _get_openai()
-
+def _vision_messages(image_urls: list[str], prompt: str, url_expires_in: int | None = None) -> list[dict]:
+    """인증샷 이미지 + 과제 정보로 GPT-4o Vision 메시지 구성"""
     presigned_urls = []
     for url in image_urls[:4]:
         try:
             key = _key_from_url(url)
-            presigned = generate_presigned_url(key)
+            presigned = generate_presigned_url(key, url_expires_in)
             presigned_urls.append(presigned)
         except Exception:
             presigned_urls.append(url)
@@ -270,28 +634,19 @@ async def _call_gpt4o_vision(image_urls: list[str], prompt: str) -> dict:
             "image_url": {"url": purl, "detail": "high"},
         })
 
-    response = await client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": content},
-        ],
-        max_tokens=2000,
-        temperature=0.3,
-    )
-
-    return _parse_json_response(response.choices[0].message.content or "{}")
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": content},
+    ]
 
 
-async def _analyze_text_only(task, submission) -> dict:
+def _text_only_messages(task, submission) -> list[dict]:
     """이미지 없을 때 텍스트 데이터만으로 간이 분석"""
-    client = _get_openai()
-
     problems_text = ""
     responses_text = ""
     if task and task.problems:
         for p in task.problems:
-            problems_text += f"  {p.number}번: {p.title}\n"
+            problems_text += f"  {p.number}번: {p.bank.title}\n"
 
     if submission.problemResponses:
         for r in submission.problemResponses:
@@ -315,24 +670,39 @@ async def _analyze_text_only(task, submission) -> dict:
 아래 JSON 형식으로만 응답하세요:
 {VISION_JSON_SCHEMA}"""
 
-    response = await client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": prompt},
-        ],
-        max_tokens=2000,
-        temperature=0.3,
-    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+async def _build_gpt_request(task, submission, url_expires_in: int | None = None) -> dict:
+    """chat.completions 요청 본문 (동기 호출과 Batch API가 공유)"""
+    image_urls = submission.images if submission else []
+    if image_urls:
+        prompt = _build_analysis_prompt(task, submission)
+        composite_url = None
+        if task and image_composite_service.is_enabled_for(task.subject):
+            composite_url = await image_composite_service.get_or_create_composite(image_urls)
+        if composite_url:
+            count = min(len(image_urls), image_composite_service.MAX_COMPOSITE_IMAGES)
+            prompt += image_composite_service.COMPOSITE_PROMPT_NOTE.format(count=count)
+            image_urls = [composite_url]
+        messages = _vision_messages(image_urls, prompt, url_expires_in)
+    else:
+        messages = _text_only_messages(task, submission)
 
-    return _parse_json_response(response.choices[0].message.content or "{}")
+    return {
+        "model": settings.OPENAI_MODEL_LARGE,
+        "messages": messages,
+        "max_tokens": 2000,
+        "temperature": 0.3,
+    }
 
 
 # ---------- Mock 분석 (테스트용) ----------
 
-async def _run_mock_analysis(db: Prisma, analysis_id: str, analysis):
-    await asyncio.sleep(2)
-
+async def _run_mock_analysis(db: Prisma, analysis_id: str, analysis, timer: StageTimer):
     submission = analysis.submission
     task = submission.task if submission else None
 
@@ -357,35 +727,153 @@ async def _run_mock_analysis(db: Prisma, analysis_id: str, analysis):
         for prob in task.problems:
             part_density.append({
                 "problemNumber": prob.number,
-                "problemTitle": prob.title[:50] if len(prob.title) > 50 else prob.title,
+                "problemTitle": prob.bank.title[:50],
                 "density": random.randint(max(0, score - 20), min(100, score + 20)),
             })
 
+    # 스트리밍 경로와 같이 점수를 먼저 저장하고 나머지는 뒤에 채움
+    latency = settings.MOCK_ANALYSIS_LATENCY_SECONDS
+    with timer.stage("gpt"):
+        await asyncio.sleep(latency / 2)
+    await _persist_partial(
+        db, analysis_id, submission, task,
+        {"writingRatio": writing_ratio, "traceTypes": trace_types}, set(), timer,
+    )
+    with timer.stage("gpt"):
+        await asyncio.sleep(latency / 2)
+
     mentor_tips = {
         "GREEN": "학습 밀도가 높습니다. 칭찬과 함께 다음 단계 학습을 제안해 보세요.",
         "YELLOW": "일부 보완이 필요합니다. 부족한 부분에 대해 구체적인 피드백을 주세요.",
         "RED": "학습 밀도가 낮습니다. 학습 방법에 대한 안내가 필요해 보입니다.",
     }
 
-    detail = (
-        f"과제점수 {task_score:.0f}점(50%), "
-        f"필기점수 {writing_score:.0f}점(20%), "
-        f"시간점수 {time_score:.0f}점(30%) → "
-        f"종합 {score}점"
-    )
+    detail = _score_detail(task_score, writing_score, time_score, score)
+
+    with timer.stage("write"):
+        await db.aianalysis.update(
+            where={"id": analysis_id},
+            data={
+                "status": "COMPLETED",
+                "signalLight": signal,
+                "densityScore": score,
+                "writingRatio": writing_ratio,
+                "traceTypes": Json(trace_types),
+                "partDensity": Json(part_density),
+                "summary": f"밀도 {score}점 - {'높은 학습!' if signal == 'GREEN' else '보통' if signal == 'YELLOW' else '보완 필요'}",
+                "detailedAnalysis": detail,
+                "mentorTip": mentor_tips.get(signal, ""),
+                "gptResult": Json({"writingRatio": writing_ratio, "traceTypes": trace_types}),
+                "scoringVersion": SCORING_VERSION,
+                **await coaching_precompute_service.precomputed_fields(db, signal, score, task),
+            },
+        )
+
+        if submission:
+            await db.task.update(
+                where={"id": submission.taskId},
+                data={"status": "COMPLETED"},
+            )
+
+
+# ---------- 스트리밍 부분 결과 ----------
+# writingRatio/traceTypes가 도착하면 상세 분석을 기다리지 않고 밀도 점수부터 저장합니다.
+# status는 PROCESSING 그대로 두고, 상태 조회 API가 isPartial로 노출합니다.
+
+PARTIAL_SCORE_FIELDS = ("writingRatio", "traceTypes")
+
+
+async def _persist_partial(
+    db: Prisma, analysis_id: str, submission, task, values: dict, saved: set[str], timer: StageTimer
+):
+    """도착한 필드로 저장 가능한 부분 결과를 한 번씩만 저장합니다."""
+    data: dict = {}
+    if "score" not in saved and all(k in values for k in PARTIAL_SCORE_FIELDS):
+        saved.add("score")
+        writing_ratio = min(float(values["writingRatio"] or 0), 100.0)
+        task_score = _calc_task_score(submission) if submission else 0.0
+        writing_score = _calc_writing_score(writing_ratio)
+        time_score = _calc_time_score(task) if task else 0.0
+        density_score = _calc_density(task_score, writing_score, time_score)
+        data.update({
+            "signalLight": _signal_light(density_score),
+            "densityScore": density_score,
+            "writingRatio": writing_ratio,
+            "traceTypes": Json(values["traceTypes"]),
+            "scoringVersion": SCORING_VERSION,
+        })
+    if "summary" not in saved and "summary" in values:
+        saved.add("summary")
+        data["summary"] = str(values["summary"])[:200]
+    if not data:
+        return
+
+    try:
+        # 회수(reap) 등으로 상태가 바뀐 분석은 건드리지 않음
+        await db.aianalysis.update_many(
+            where={"id": analysis_id, "status": "PROCESSING"},
+            data=data,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to persist partial analysis {analysis_id}: {e}")
+        return
+    if "densityScore" in data:
+        timer.mark("first_score")
+
+
+# ---------- 간이 분석 (OpenAI 장애 시) ----------
+# 필기율을 제출 데이터로 대략 추정해 공식 점수만 산출합니다.
+# isDegraded로 표시하고, 서킷이 닫히면 스케줄러가 GPT 보강을 다시 요청합니다.
+
+DEGRADED_IMAGE_WRITING_RATIO = 10.0  # 인증샷은 있지만 판독 불가 → 필기점수 절반
+
+
+def _estimate_writing_ratio(submission) -> float:
+    """GPT 없이 문제별 메모/그림/형광펜, 제출 텍스트로 필기율(%) 추정"""
+    estimates = [0.0]
+
+    responses = submission.problemResponses or []
+    if responses:
+        traced = sum(
+            1 for r in responses if r.textNote or r.drawingUrl or r.highlightData
+        )
+        estimates.append(25.0 * traced / len(responses))
+
+    if submission.textContent:
+        estimates.append(min(20.0, len(submission.textContent) / 50))
+
+    if submission.images:
+        estimates.append(DEGRADED_IMAGE_WRITING_RATIO)
+
+    return round(max(estimates), 1)
+
+
+async def _run_degraded_analysis(db: Prisma, analysis_id: str, submission, task):
+    writing_ratio = _estimate_writing_ratio(submission) if submission else 0.0
+
+    task_score = _calc_task_score(submission) if submission else 0.0
+    writing_score = _calc_writing_score(writing_ratio)
+    time_score = _calc_time_score(task) if task else 0.0
+    density_score = _calc_density(task_score, writing_score, time_score)
+    signal = _signal_light(density_score)
+
+    detail = _score_detail(task_score, writing_score, time_score, density_score)
+    notice = "AI 분석이 지연되어 제출 데이터 기반 간이 점수입니다. 상세 분석은 자동으로 보강됩니다."
 
     await db.aianalysis.update(
         where={"id": analysis_id},
         data={
             "status": "COMPLETED",
             "signalLight": signal,
-            "densityScore": score,
+            "densityScore": density_score,
             "writingRatio": writing_ratio,
-            "traceTypes": Json(trace_types),
-            "partDensity": Json(part_density),
-            "summary": f"밀도 {score}점 - {'높은 학습!' if signal == 'GREEN' else '보통' if signal == 'YELLOW' else '보완 필요'}",
-            "detailedAnalysis": detail,
-            "mentorTip": mentor_tips.get(signal, ""),
+            "summary": f"밀도 {density_score}점 (간이 분석)",
+            "detailedAnalysis": f"{detail}\n\n{notice}",
+            "scoringVersion": SCORING_VERSION,
+            "isDegraded": True,
+            # 서킷이 닫히면 바로 보강 대상
+            "nextRetryAt": datetime.now(timezone.utc),
+            **await coaching_precompute_service.precomputed_fields(db, signal, density_score, task),
         },
     )
 
@@ -399,100 +887,267 @@ async def _run_mock_analysis(db: Prisma, analysis_id: str, analysis):
 # ---------- 메인 분석 실행 ----------
 
 async def run_analysis_background(db: Prisma, analysis_id: str):
-    """Background task: 공식 기반 밀도 점수 + GPT-4o 필기율 분석"""
+    """Background task: 공식 기반 밀도 점수 + GPT-4o 필기율 분석
+
+    실제로 분석을 수행한 실행은 단계별 시간/토큰/비용을 AnalysisMetric에 남깁니다.
+    """
+    analysis = None
+    timer = StageTimer()
+    mode = None  # 실행 경로가 정해진 뒤에만 기록 (선점 실패 등은 제외)
+    outcome = "FAILED"
+    partial_saved: set[str] = set()
     try:
-        analysis = await db.aianalysis.find_unique(
-            where={"id": analysis_id},
-            include={
-                "submission": {
-                    "include": {
-                        "task": {"include": {"problems": True}},
-                        "problemResponses": True,
+        with timer.stage("load"):
+            analysis = await db.aianalysis.find_unique(
+                where={"id": analysis_id},
+                include={
+                    "submission": {
+                        "include": {
+                            "task": {"include": {"problems": {"include": {"bank": True}}}},
+                            "problemResponses": True,
+                        }
                     }
-                }
-            },
-        )
+                },
+            )
         if not analysis:
             return
+        # Batch 대기/제출된 분석은 배치 결과로 완료되므로 동기 호출하지 않음
+        if analysis.batchMode:
+            return
+
+        # 제출 시 자동 생성된 PENDING 분석은 조건부 갱신으로 한 워커만 가져감
+        if analysis.status == "PENDING":
+            claimed = await db.aianalysis.update_many(
+                where={"id": analysis_id, "status": "PENDING"},
+                data={"status": "PROCESSING"},
+            )
+            if not claimed:
+                return
+            analysis.status = "PROCESSING"
 
         if _is_mock_mode():
-            await _run_mock_analysis(db, analysis_id, analysis)
+            mode = "mock"
+            await _run_mock_analysis(db, analysis_id, analysis, timer)
+            outcome = "COMPLETED"
             return
 
         submission = analysis.submission
         task = submission.task if submission else None
-        image_urls = submission.images if submission else []
+        enrich_only = analysis.status == "COMPLETED" and analysis.isDegraded
+
+        # 서킷이 열려 있으면 GPT를 기다리지 않고 공식만으로 간이 분석
+        if not openai_breaker.allow_request():
+            if not enrich_only:
+                mode = "degraded"
+                with timer.stage("write"):
+                    await _run_degraded_analysis(db, analysis_id, submission, task)
+                outcome = "DEGRADED"
+            return
 
-        # 1) GPT-4o로 필기율 + 정성 분석
-        if image_urls:
-            prompt = _build_analysis_prompt(task, submission)
-            gpt_result = await _call_gpt4o_vision(image_urls, prompt)
-        else:
-            gpt_result = await _analyze_text_only(task, submission)
+        mode = "sync"
+        on_fields = None
+        if not enrich_only:
+            # 간이 분석 보강 중에는 기존 결과를 부분 결과로 덮어쓰지 않음
+            async def on_fields(values: dict):
+                await _persist_partial(db, analysis_id, submission, task, values, partial_saved, timer)
 
-        # 2) GPT 결과에서 필기율 추출 (0~100%)
-        writing_ratio = float(gpt_result.get("writingRatio", 0))
-        if writing_ratio > 100:
-            writing_ratio = 100.0
+        try:
+            gpt_result = await _request_gpt_analysis(task, submission, timer, on_fields)
+        except _PROVIDER_ERRORS as e:
+            openai_breaker.record_failure()
+            logger.warning(f"OpenAI unavailable for {analysis_id}, using formula only: {e}")
+            if not enrich_only:
+                with timer.stage("write"):
+                    await _run_degraded_analysis(db, analysis_id, submission, task)
+                outcome = "DEGRADED"
+            return
+        except Exception:
+            if "first_chunk" in timer.marks_ms:
+                # 응답은 왔지만 파싱 실패 등 — 제공자 장애는 아님
+                openai_breaker.record_success()
+            else:
+                # 요청 준비(presign 등)나 부분 저장 실패 — 제공자 상태는 알 수 없음
+                openai_breaker.release_probe()
+            raise
+        openai_breaker.record_success()
+
+        with timer.stage("write"):
+            await _apply_gpt_result(db, analysis_id, submission, task, gpt_result)
+        outcome = "COMPLETED"
 
-        # 3) 공식 기반 밀도 점수 계산
-        task_score = _calc_task_score(submission) if submission else 0.0
-        writing_score = _calc_writing_score(writing_ratio)
-        time_score = _calc_time_score(task) if task else 0.0
-        density_score = _calc_density(task_score, writing_score, time_score)
-        signal = _signal_light(density_score)
-
-        # 4) partDensity 보강
-        part_density = gpt_result.get("partDensity", [])
-        if not part_density and task and task.problems:
-            for prob in task.problems:
-                part_density.append({
-                    "problemNumber": prob.number,
-                    "problemTitle": prob.title[:50],
-                    "density": density_score,
-                })
+    except Exception as e:
+        logger.error(f"Analysis failed for {analysis_id}: {e}")
+        try:
+            if analysis and analysis.status == "COMPLETED":
+                # 간이 분석 보강 실패: 기존 결과는 유지하고 보강만 나중에 재시도
+                await db.aianalysis.update(
+                    where={"id": analysis_id},
+                    data={
+                        "retryCount": analysis.retryCount + 1,
+                        "nextRetryAt": _next_retry_at(analysis.retryCount),
+                    },
+                )
+                return
+            retry_count = analysis.retryCount if analysis else 0
+            data = {"status": "FAILED", "nextRetryAt": _next_retry_at(retry_count)}
+            if partial_saved:
+                # 스트리밍 중 저장한 점수는 최종 결과가 아니므로 비움
+                data.update({"signalLight": None, "densityScore": None, "writingRatio": None, "summary": None})
+            await db.aianalysis.update(where={"id": analysis_id}, data=data)
+        except Exception:
+            pass
 
-        trace_types = gpt_result.get("traceTypes", {
-            "underlineRatio": 0.0,
-            "memoRatio": 0.0,
-            "solutionRatio": 0.0,
-        })
+    finally:
+        if mode:
+            submission = analysis.submission
+            subject = submission.task.subject if submission and submission.task else None
+            await analysis_metrics_service.record_run(db, analysis_id, subject, timer, mode, outcome)
+
+
+def _is_valid_analysis_result(result) -> bool:
+    """작은 모델 응답 검증 (실패 시 큰 모델로 재요청)"""
+    if not isinstance(result, dict):
+        return False
+    ratio = result.get("writingRatio")
+    if isinstance(ratio, bool) or not isinstance(ratio, (int, float)) or not 0 <= ratio <= 100:
+        return False
+    if not isinstance(result.get("traceTypes"), dict):
+        return False
+    return isinstance(result.get("summary"), str) and isinstance(result.get("detailedAnalysis"), str)
+
+
+def _analysis_tier(task, request: dict) -> str:
+    user_content = request["messages"][-1]["content"]
+    if not isinstance(user_content, str):
+        return model_routing.select_tier(model_routing.MODALITY_VISION, None, 0)
+    return model_routing.select_tier(
+        model_routing.MODALITY_TEXT, task.subject if task else None, len(user_content)
+    )
 
-        detail_prefix = (
-            f"[점수 산출] 과제 {task_score:.0f}×0.5={task_score*WEIGHT_TASK:.0f}, "
-            f"필기 {writing_score:.0f}×0.2={writing_score*WEIGHT_WRITING:.0f}, "
-            f"시간 {time_score:.0f}×0.3={time_score*WEIGHT_TIME:.0f} → 총 {density_score}점\n\n"
-        )
-        gpt_detail = gpt_result.get("detailedAnalysis", "")
-        full_detail = (detail_prefix + gpt_detail)[:1000]
 
-        await db.aianalysis.update(
-            where={"id": analysis_id},
-            data={
-                "status": "COMPLETED",
-                "signalLight": signal,
-                "densityScore": density_score,
-                "writingRatio": writing_ratio,
-                "traceTypes": Json(trace_types),
-                "partDensity": Json(part_density),
-                "summary": gpt_result.get("summary", "")[:200],
-                "detailedAnalysis": full_detail,
-                "mentorTip": gpt_result.get("mentorTip", "")[:500],
-            },
-        )
+async def _request_gpt_analysis(task, submission, timer: StageTimer, on_fields=None) -> dict:
+    """GPT로 필기율 + 정성 분석 (스트리밍)
 
-        if submission:
-            await db.task.update(
-                where={"id": submission.taskId},
-                data={"status": "COMPLETED"},
-            )
+    최상위 필드가 완성될 때마다 on_fields(지금까지 받은 필드)를 호출합니다.
+    응답 스키마가 writingRatio, traceTypes를 먼저 두므로 점수는 상세 분석보다 먼저 저장됩니다.
+    이미지는 OpenAI 쪽에서 URL로 가져가므로, 서버에서 잴 수 있는 것은 presigned URL 발급까지입니다.
+    텍스트 분석은 입력이 작으면 작은 모델로 먼저 요청하고, 응답이 검증에 실패하면 큰 모델로 다시 요청합니다.
+    """
+    with timer.stage("presign"):
+        request = await _build_gpt_request(task, submission)
 
-    except Exception as e:
-        logger.error(f"Analysis failed for {analysis_id}: {e}")
+    timer.tier = _analysis_tier(task, request)
+    request["model"] = model_routing.model_for(timer.tier)
+    if timer.tier == model_routing.TIER_SMALL:
         try:
-            await db.aianalysis.update(
-                where={"id": analysis_id},
-                data={"status": "FAILED"},
-            )
-        except Exception:
-            pass
+            result = await _stream_completion(request, timer, on_fields)
+        except ValueError as e:  # JSON 파싱 실패
+            result = None
+            logger.info(f"Small model returned unparseable JSON, escalating: {e}")
+        if _is_valid_analysis_result(result):
+            return result
+        timer.tier = model_routing.TIER_LARGE
+        timer.escalated = True
+        request["model"] = model_routing.model_for(model_routing.TIER_LARGE)
+
+    return await _stream_completion(request, timer, on_fields)
+
+
+async def _stream_completion(request: dict, timer: StageTimer, on_fields=None) -> dict:
+    parser: JsonObjectStream | None = JsonObjectStream()
+    content: list[str] = []
+    with timer.stage("gpt"):
+        stream = await _get_openai().chat.completions.create(
+            **request,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        async for chunk in stream:
+            timer.mark("first_chunk")  # 제공자 응답 수신 (서킷 판정용)
+            if chunk.usage:
+                timer.record_usage(chunk.model, chunk.usage)
+            if not chunk.choices or not chunk.choices[0].delta.content:
+                continue
+            delta = chunk.choices[0].delta.content
+            content.append(delta)
+            if parser is None:
+                continue
+            try:
+                completed = parser.feed(delta)
+            except ValueError:
+                # 형식이 어긋난 응답은 점진 파싱을 멈추고 마지막에 전체를 파싱
+                parser = None
+                continue
+            if completed and on_fields:
+                await on_fields(parser.values)
+
+    with timer.stage("parse"):
+        if parser and parser.done:
+            return parser.values
+        return _parse_json_response("".join(content) or "{}")
+
+
+async def _apply_gpt_result(db: Prisma, analysis_id: str, submission, task, gpt_result: dict):
+    # 1) GPT 결과에서 필기율 추출 (0~100%)
+    writing_ratio = float(gpt_result.get("writingRatio", 0))
+    if writing_ratio > 100:
+        writing_ratio = 100.0
+
+    # 2) 공식 기반 밀도 점수 계산
+    task_score = _calc_task_score(submission) if submission else 0.0
+    writing_score = _calc_writing_score(writing_ratio)
+    time_score = _calc_time_score(task) if task else 0.0
+    density_score = _calc_density(task_score, writing_score, time_score)
+    signal = _signal_light(density_score)
+
+    # 3) partDensity 보강
+    part_density = gpt_result.get("partDensity", [])
+    if not part_density and task and task.problems:
+        for prob in task.problems:
+            part_density.append({
+                "problemNumber": prob.number,
+                "problemTitle": prob.bank.title[:50],
+                "density": density_score,
+            })
+
+    trace_types = gpt_result.get("traceTypes", {
+        "underlineRatio": 0.0,
+        "memoRatio": 0.0,
+        "solutionRatio": 0.0,
+    })
+
+    detail_prefix = _score_detail(task_score, writing_score, time_score, density_score)
+    gpt_detail = gpt_result.get("detailedAnalysis", "")
+    full_detail = (detail_prefix + "\n\n" + gpt_detail)[:1000]
+
+    await db.aianalysis.update(
+        where={"id": analysis_id},
+        data={
+            "status": "COMPLETED",
+            "signalLight": signal,
+            "densityScore": density_score,
+            "writingRatio": writing_ratio,
+            "traceTypes": Json(trace_types),
+            "partDensity": Json(part_density),
+            "summary": gpt_result.get("summary", "")[:200],
+            "detailedAnalysis": full_detail,
+            "mentorTip": gpt_result.get("mentorTip", "")[:500],
+            # 합성 이미지 분석은 사진별 필기율을 함께 받음
+            **({"pageHeatmap": Json(gpt_result["pageHeatmap"])} if gpt_result.get("pageHeatmap") else {}),
+            # GPT 원본 입력은 파생 점수와 분리해 보관 (재채점용)
+            "gptResult": Json(gpt_result),
+            "scoringVersion": SCORING_VERSION,
+            "isDegraded": False,
+            "nextRetryAt": None,
+            "batchMode": False,
+            "batchId": None,
+            # 코칭센터 조회 시 다시 계산하지 않도록 초안/추천을 함께 저장
+            **await coaching_precompute_service.precomputed_fields(db, signal, density_score, task),
+        },
+    )
+
+    if submission:
+        await db.task.update(
+            where={"id": submission.taskId},
+            data={"status": "COMPLETED"},
+        )
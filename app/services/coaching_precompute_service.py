@@ -0,0 +1,88 @@
+import logging
+
+from prisma import Json, Prisma
+
+from app.services import material_catalog_service, recommendation_service
+
+logger = logging.getLogger(__name__)
+
+# 분석 완료 시 AI 피드백 초안과 추천 학습지를 미리 계산해 AiAnalysis에 저장합니다.
+# 추천은 학습지 카탈로그 버전과 함께 저장하고, 카탈로그가 바뀐 경우에만 다시 계산합니다.
+# 점수 계산은 recommendation_service의 역색인을 사용합니다.
+
+RECOMMENDATION_LIMIT = 5
+
+_DRAFT_TEMPLATES = {
+    "GREEN": "'{title}' 과제의 학습 밀도가 높습니다(점수: {score}). 풀이 흔적이 충분하고 이해도가 높아 보입니다. 이 조자로 계속 학습하면 좋겠습니다.",
+    "YELLOW": "'{title}' 과제의 학습 밀도가 보통입니다(점수: {score}). 일부 풀이 과정이 생략된 부분이 있어 보충이 필요합니다.",
+    "RED": "'{title}' 과제의 학습 밀도가 낮습니다(점수: {score}). 풀이 흔적이 부족하여 다시 한번 꼼꼼히 학습해 주세요.",
+}
+
+
+def build_ai_draft(signal: str | None, score: int | None, task_title: str) -> str:
+    """AI 피드백 초안"""
+    template = _DRAFT_TEMPLATES.get(signal or "YELLOW", _DRAFT_TEMPLATES["YELLOW"])
+    return template.format(title=task_title, score=score if score is not None else 50)
+
+
+async def compute_recommendations(
+    db: Prisma,
+    task,
+    version: str | None = None,
+    context: recommendation_service.MenteeContext | None = None,
+    offset: int = 0,
+    limit: int = RECOMMENDATION_LIMIT,
+) -> tuple[list[dict], int]:
+    """(추천 목록, 전체 후보 수). context를 넘기면 멘티 정보 조회를 생략합니다."""
+    catalog = await material_catalog_service.get_catalog(db, version)
+    if context is None:
+        context = await recommendation_service.mentee_context(db, task.menteeId if task else None)
+    return recommendation_service.recommend(
+        catalog,
+        task.subject if task else None,
+        recommendation_service.query_tags(task),
+        context,
+        offset,
+        limit,
+    )
+
+
+def is_stale(analysis, version: str) -> bool:
+    return analysis.aiDraft is None or analysis.recommendationsVersion != version
+
+
+async def precomputed_fields(
+    db: Prisma,
+    signal: str | None,
+    score: int | None,
+    task,
+    version: str | None = None,
+    context: recommendation_service.MenteeContext | None = None,
+) -> dict:
+    """분석 완료 저장에 함께 넣을 초안/추천 필드.
+
+    완료 저장을 막지 않도록 실패하면 빈 dict를 반환하고, 조회 시 다시 계산합니다.
+    """
+    try:
+        version = version or await material_catalog_service.current_version(db)
+        recommendations, _ = await compute_recommendations(db, task, version, context)
+    except Exception as e:
+        logger.warning(f"Coaching precompute failed: {e}")
+        return {}
+    return {
+        "aiDraft": build_ai_draft(signal, score, task.title if task else ""),
+        "recommendations": Json(recommendations),
+        "recommendationsVersion": version,
+    }
+
+
+async def refresh(
+    db: Prisma, analysis, task, version: str, context: recommendation_service.MenteeContext | None = None
+):
+    """카탈로그가 바뀌었거나 미리 계산되지 않은 완료 분석을 갱신해 반환합니다."""
+    data = await precomputed_fields(
+        db, analysis.signalLight, analysis.densityScore, task, version, context
+    )
+    if not data:
+        return analysis
+    return await db.aianalysis.update(where={"id": analysis.id}, data=data)
@@ -8,6 +8,18 @@ from app.schemas.coaching import (
     DailySummaryRequest,
     TaskFeedbackRequest,
 )
+from app.services import (
+    analysis_queue_service,
+    analysis_service,
+    coaching_precompute_service,
+    material_catalog_service,
+    material_service,
+    recommendation_service,
+    task_service,
+)
+
+SESSION_RECOMMENDATION_LIMIT = 3
+RECOMMENDATION_PAGE_LIMIT = 5
 
 
 async def get_coaching_detail(db: Prisma, user, submission_id: str):
@@ -64,23 +76,22 @@ async def get_ai_draft(db: Prisma, user, submission_id: str):
 
     signal = analysis.signalLight or "YELLOW"
     score = analysis.densityScore or 50
-    task_title = submission.task.title if submission.task else ""
-
-    drafts = {
-        "GREEN": f"'{task_title}' 과제의 학습 밀도가 높습니다(점수: {score}). 풀이 흔적이 충분하고 이해도가 높아 보입니다. 이 조자로 계속 학습하면 좋겠습니다.",
-        "YELLOW": f"'{task_title}' 과제의 학습 밀도가 보통입니다(점수: {score}). 일부 풀이 과정이 생략된 부분이 있어 보충이 필요합니다.",
-        "RED": f"'{task_title}' 과제의 학습 밀도가 낮습니다(점수: {score}). 풀이 흔적이 부족하여 다시 한번 꼼꼼히 학습해 주세요.",
-    }
+    # 분석 완료 시 미리 만든 초안 (이전 분석은 즉석 생성)
+    draft = analysis.aiDraft or coaching_precompute_service.build_ai_draft(
+        signal, score, submission.task.title if submission.task else ""
+    )
 
     return {
         "submissionId": submission_id,
-        "draft": drafts.get(signal, drafts["YELLOW"]),
+        "draft": draft,
         "suggestedSignalLight": signal,
         "suggestedScore": score,
     }
 
 
-async def get_recommendations(db: Prisma, user, submission_id: str):
+async def get_recommendations(
+    db: Prisma, user, submission_id: str, page: int = 1, limit: int = RECOMMENDATION_PAGE_LIMIT
+):
     if not user.mentorProfile:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -89,7 +100,7 @@ async def get_recommendations(db: Prisma, user, submission_id: str):
 
     submission = await db.tasksubmission.find_unique(
         where={"id": submission_id},
-        include={"task": True},
+        include={"task": True, "analysis": True},
     )
     if not submission:
         raise HTTPException(
@@ -97,35 +108,35 @@ async def get_recommendations(db: Prisma, user, submission_id: str):
             detail={"code": "SUBMIT_003", "message": "제출 내역을 찾을 수 없습니다"},
         )
 
-    subject = submission.task.subject if submission.task else None
-    ability_tag = submission.task.abilityTag if submission.task else None
-
-    where: dict = {}
-    if subject:
-        where["subject"] = subject
-
-    materials = await db.material.find_many(
-        where=where,
-        take=5,
-        order={"createdAt": "desc"},
-    )
-
-    recs = []
-    for m in materials:
-        tag_match = ability_tag and ability_tag in m.abilityTags
-        reason = f"과목 일치({subject})"
-        if tag_match:
-            reason += f", 능력 태그 일치({ability_tag})"
-        recs.append({
-            "materialId": m.id,
-            "title": m.title,
-            "subject": m.subject,
-            "abilityTags": m.abilityTags,
-            "difficulty": m.difficulty,
-            "reason": reason,
-        })
-
-    return {"submissionId": submission_id, "recommendations": recs}
+    task = submission.task
+    analysis = submission.analysis
+    catalog = await material_catalog_service.get_catalog(db)
+    version = catalog.version
+    total = len(catalog.view(task.subject if task else None))
+
+    recs = None
+    first_page = page == 1 and limit <= coaching_precompute_service.RECOMMENDATION_LIMIT
+    if analysis and analysis.status == "COMPLETED" and first_page:
+        # 첫 페이지는 분석 완료 시 저장한 추천을 사용하고, 카탈로그가 바뀐 경우에만 다시 계산
+        if coaching_precompute_service.is_stale(analysis, version):
+            analysis = await coaching_precompute_service.refresh(db, analysis, task, version)
+        if analysis.recommendations is not None:
+            recs = analysis.recommendations[:limit]
+
+    if recs is None:
+        recs, total = await coaching_precompute_service.compute_recommendations(
+            db, task, version, offset=(page - 1) * limit, limit=limit
+        )
+    return {
+        "submissionId": submission_id,
+        "recommendations": recs,
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "total_pages": (total + limit - 1) // limit,
+        },
+    }
 
 
 async def assign_material(db: Prisma, user, data: AssignMaterialRequest):
@@ -135,12 +146,7 @@ async def assign_material(db: Prisma, user, data: AssignMaterialRequest):
             detail={"code": "PERM_001", "message": "멘토 권한이 필요합니다"},
         )
 
-    material = await db.material.find_unique(where={"id": data.materialId})
-    if not material:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={"code": "MATERIAL_001", "message": "학습지를 찾을 수 없습니다"},
-        )
+    material = await material_service.get_material(db, data.materialId)
 
     mentee_link = await db.mentormentee.find_first(
         where={"mentorId": user.mentorProfile.id, "menteeId": data.menteeId}
@@ -193,22 +199,6 @@ async def _verify_mentor_mentee(db: Prisma, user, mentee_id: str):
     return user.mentorProfile
 
 
-def _generate_ai_draft(analysis, task_title: str) -> str:
-    """AI 피드백 초안 생성"""
-    if not analysis or analysis.status != "COMPLETED":
-        return None
-
-    signal = analysis.signalLight or "YELLOW"
-    score = analysis.densityScore or 50
-
-    drafts = {
-        "GREEN": f"'{task_title}' 과제의 학습 밀도가 높습니다(점수: {score}). 풀이 흔적이 충분하고 이해도가 높아 보입니다. 이 조자로 계속 학습하면 좋겠습니다.",
-        "YELLOW": f"'{task_title}' 과제의 학습 밀도가 보통입니다(점수: {score}). 일부 풀이 과정이 생략된 부분이 있어 보충이 필요합니다.",
-        "RED": f"'{task_title}' 과제의 학습 밀도가 낮습니다(점수: {score}). 풀이 흔적이 부족하여 다시 한번 꼼꼼히 학습해 주세요.",
-    }
-    return drafts.get(signal, drafts["YELLOW"])
-
-
 async def get_coaching_session(
     db: Prisma, user, mentee_id: str, session_date: date
 ):
@@ -226,7 +216,11 @@ async def get_coaching_session(
             detail={"code": "MENTEE_001", "message": "멘티를 찾을 수 없습니다"},
         )
 
-    # 해당 날짜의 과제 목록
+    # 멘토가 보고 있는 멘티의 분석은 우선 처리
+    analysis_service.mark_mentee_viewed(mentee_id)
+
+    # 해당 날짜의 과제 목록 (반복 회차 포함)
+    await task_service.materialize_recurrences(db, mentee_id, session_date)
     tasks = await db.task.find_many(
         where={"menteeId": mentee_id, "date": _to_utc(session_date)},
         include={
@@ -234,7 +228,7 @@ async def get_coaching_session(
             "submissions": {
                 "include": {
                     "analysis": True,
-                    "problemResponses": {"include": {"problem": True}},
+                    "problemResponses": {"include": {"problem": {"include": {"bank": True}}}},
                 },
                 "order_by": {"submittedAt": "desc"},
                 "take": 1,
@@ -255,11 +249,20 @@ async def get_coaching_session(
     )
     assigned_material_ids = {t.materialId for t in assigned_tasks if t.materialId}
 
+    # 초안/추천은 분석 완료 시 저장된 값을 읽기만 함 (카탈로그가 바뀐 경우에만 갱신)
+    catalog = await material_catalog_service.get_catalog(db)
+    catalog_version = catalog.version
+
+    # 학습지는 프로세스 메모리 색인에서 읽고, 멘티 정보는 한 번만 조회 (과제 수와 무관하게 쿼리 수 고정)
+    mentee_context = await recommendation_service.mentee_context(db, mentee_id)
+
     # 과제별 데이터 빌드
     task_items = []
     for task in tasks:
         submission = task.submissions[0] if task.submissions else None
         analysis = submission.analysis if submission else None
+        if analysis and analysis.status in ("PENDING", "PROCESSING"):
+            analysis_queue_service.bump(analysis.id, analysis_service.analysis_priority(task))
 
         # 문제별 응답 매핑
         problem_responses = []
@@ -268,7 +271,7 @@ async def get_coaching_session(
                 problem_responses.append({
                     "problemId": pr.problemId,
                     "problemNumber": pr.problem.number if pr.problem else 0,
-                    "problemTitle": pr.problem.title if pr.problem else "",
+                    "problemTitle": pr.problem.bank.title if pr.problem else "",
                     "answer": pr.answer,
                     "isCorrect": pr.isCorrect,
                     "textNote": pr.textNote,
@@ -305,25 +308,34 @@ async def get_coaching_session(
                 "mentorTip": analysis.mentorTip,
             }
 
-        # AI 피드백 초안
-        ai_draft = _generate_ai_draft(analysis, task.title)
-
-        # 추천 학습지 (과목 기반)
-        materials = await db.material.find_many(
-            where={"subject": task.subject},
-            take=3,
-            order={"createdAt": "desc"},
-        )
+        # AI 피드백 초안 + 추천 학습지 (과목 기반)
+        ai_draft = None
+        recommendations = None
+        if analysis and analysis.status == "COMPLETED":
+            if coaching_precompute_service.is_stale(analysis, catalog_version):
+                analysis = await coaching_precompute_service.refresh(
+                    db, analysis, task, catalog_version, mentee_context
+                )
+            ai_draft = analysis.aiDraft
+            recommendations = analysis.recommendations
+        if recommendations is None:
+            recommendations, _ = recommendation_service.recommend(
+                catalog,
+                task.subject,
+                recommendation_service.query_tags(task),
+                mentee_context,
+                limit=SESSION_RECOMMENDATION_LIMIT,
+            )
         recommended_materials = [
             {
-                "id": m.id,
-                "title": m.title,
-                "subject": m.subject,
-                "abilityTags": m.abilityTags,
-                "difficulty": m.difficulty,
-                "isAssigned": m.id in assigned_material_ids,
+                "id": r["materialId"],
+                "title": r["title"],
+                "subject": r["subject"],
+                "abilityTags": r["abilityTags"],
+                "difficulty": r["difficulty"],
+                "isAssigned": r["materialId"] in assigned_material_ids,
             }
-            for m in materials
+            for r in recommendations[:SESSION_RECOMMENDATION_LIMIT]
         ]
 
         # 저장된 상세 피드백
@@ -3,21 +3,34 @@ from datetime import date, datetime, timezone
 from fastapi import HTTPException, status
 from prisma import Prisma
 
+from app.core import pagination
+
 
 def _date_to_utc(d: date) -> datetime:
     return datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
 
 
-async def get_feedback_by_date(db: Prisma, mentee_id: str, feedback_date: date):
-    dt = _date_to_utc(feedback_date)
-    feedbacks = await db.feedback.find_many(
-        where={"menteeId": mentee_id, "date": dt},
+async def get_feedback_by_date(
+    db: Prisma,
+    mentee_id: str,
+    feedback_date: date,
+    cursor: str | None = None,
+    limit: int = pagination.DEFAULT_LIMIT,
+    with_total: bool = False,
+):
+    """날짜 피드백 최신순 커서 페이지. 반환: {items, nextCursor, total}"""
+    page = await pagination.paginate(
+        db.feedback,
+        {"menteeId": mentee_id, "date": _date_to_utc(feedback_date)},
+        "sentAt",
+        cursor,
+        limit,
         include={"items": True, "mentor": {"include": {"user": True}}},
-        order={"sentAt": "desc"},
+        with_total=with_total,
     )
 
     results = []
-    for f in feedbacks:
+    for f in page["items"]:
         mentor_name = f.mentor.user.name if f.mentor and f.mentor.user else None
         results.append({
             "id": f.id,
@@ -30,38 +43,56 @@ async def get_feedback_by_date(db: Prisma, mentee_id: str, feedback_date: date):
             "items": f.items,
             "mentorName": mentor_name,
         })
-    return results
-
-
-async def get_feedback_by_subject(db: Prisma, mentee_id: str, subject: str):
-    feedbacks = await db.feedback.find_many(
-        where={"menteeId": mentee_id},
+    return {**page, "items": results}
+
+
+async def get_feedback_by_subject(
+    db: Prisma,
+    mentee_id: str,
+    subject: str,
+    cursor: str | None = None,
+    limit: int = pagination.DEFAULT_LIMIT,
+    with_total: bool = False,
+):
+    """과목 피드백을 (sentAt, id) 최신순 커서로 조회합니다.
+
+    과목 필터와 과제별 최신 제출 1건 조회를 쿼리에 넣어, 누적 피드백 수와 관계없이
+    한 페이지 분량만 읽습니다. 반환: {items, nextCursor, total}
+    """
+    subject_items = {"task": {"is": {"subject": subject}}}
+    page = await pagination.paginate(
+        db.feedback,
+        {"menteeId": mentee_id, "items": {"some": subject_items}},
+        "sentAt",
+        cursor,
+        limit,
         include={
             "items": {
+                "where": subject_items,
                 "include": {
                     "task": {
                         "include": {
                             "submissions": {
-                                "include": {"analysis": True}
+                                "include": {"analysis": True},
+                                "order_by": {"submittedAt": "desc"},
+                                "take": 1,
                             }
                         }
                     }
-                }
+                },
             },
             "mentor": {"include": {"user": True}},
         },
-        order={"sentAt": "desc"},
+        with_total=with_total,
+        error_code="FEEDBACK_003",
     )
 
     results = []
-    for f in feedbacks:
-        subject_items = [item for item in f.items if item.task and item.task.subject == subject]
-        if not subject_items:
-            continue
+    for f in page["items"]:
         mentor_name = f.mentor.user.name if f.mentor and f.mentor.user else None
 
         enriched_items = []
-        for item in subject_items:
+        for item in f.items:
             task = item.task
             task_date = task.date
             if hasattr(task_date, "date"):
@@ -73,7 +104,7 @@ async def get_feedback_by_subject(db: Prisma, mentee_id: str, subject: str):
             submission_id = None
 
             if task.submissions:
-                latest = sorted(task.submissions, key=lambda s: s.submittedAt, reverse=True)[0]
+                latest = task.submissions[0]
                 submission_id = latest.id
                 if latest.analysis:
                     ai_summary = latest.analysis.summary
@@ -105,7 +136,7 @@ async def get_feedback_by_subject(db: Prisma, mentee_id: str, subject: str):
             "mentorName": mentor_name,
             "items": enriched_items,
         })
-    return results
+    return {**page, "items": results}
 
 
 async def get_feedback_detail(db: Prisma, feedback_id: str):
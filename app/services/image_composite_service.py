@@ -0,0 +1,142 @@
+import hashlib
+import io
+import logging
+import math
+
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+from app.core.config import settings
+from app.services.upload_service import _get_s3, _is_mock_mode, _key_from_url, _s3_url, _upload_to_s3
+
+logger = logging.getLogger(__name__)
+
+# 제출 이미지 여러 장을 한 장의 캔버스로 합쳐 Vision 호출당 이미지 과금을 줄입니다.
+#
+# detail=high 이미지는 2048px 안으로 줄인 뒤 짧은 변을 768px로 맞추고, 512px 타일 수만큼
+# 과금됩니다 (타일당 170 + 기본 85 토큰). 캔버스를 처음부터 그 크기로 만들면 추가 축소 없이
+# 타일을 꽉 채워 쓸 수 있습니다.
+
+VISION_SHORT_SIDE = 768
+VISION_MAX_SIDE = 2048
+VISION_TILE = 512
+VISION_TOKENS_PER_TILE = 170
+VISION_BASE_TOKENS = 85
+
+MAX_COMPOSITE_IMAGES = 4
+CELL_ASPECT = 3 / 4  # 세로 사진 기준 (가로/세로)
+LABEL_HEIGHT = 28
+COMPOSITE_PREFIX = "composites"
+
+COMPOSITE_PROMPT_NOTE = """
+
+[이미지 구성]
+첨부 이미지는 인증샷 {count}장을 한 장으로 합친 것입니다.
+각 영역 왼쪽 위의 [1]~[{count}] 번호가 원본 사진 순서입니다. 번호 띠와 여백은 필기 면적에서 제외하세요.
+JSON에 "pageHeatmap": [{{"image": 번호, "writingRatio": 0~100}}] 항목을 추가해 사진별 필기율도 응답하세요."""
+
+
+def vision_image_tokens(width: int, height: int) -> int:
+    """detail=high 이미지 1장의 입력 토큰 수"""
+    scale = min(1.0, VISION_MAX_SIDE / max(width, height))
+    w, h = width * scale, height * scale
+    scale = VISION_SHORT_SIDE / min(w, h)
+    if scale < 1:
+        w, h = w * scale, h * scale
+    tiles = math.ceil(w / VISION_TILE) * math.ceil(h / VISION_TILE)
+    return VISION_BASE_TOKENS + VISION_TOKENS_PER_TILE * tiles
+
+
+def is_enabled_for(subject: str | None) -> bool:
+    return bool(subject) and subject in settings.analysis_composite_subjects
+
+
+def _grid(count: int) -> tuple[int, int]:
+    """(열, 행)"""
+    if count <= 1:
+        return 1, 1
+    if count == 2:
+        return 2, 1
+    return 2, 2
+
+
+def _canvas_size(cols: int, rows: int) -> tuple[int, int]:
+    """모델이 추가로 축소하지 않는 캔버스 크기 (짧은 변 768, 긴 변은 타일 경계로 내림)"""
+    aspect = (cols * CELL_ASPECT) / rows
+    long_side = int(VISION_SHORT_SIDE * max(aspect, 1 / aspect))
+    long_side = max(VISION_SHORT_SIDE, min(VISION_MAX_SIDE, long_side) // VISION_TILE * VISION_TILE)
+    if aspect >= 1:
+        return long_side, VISION_SHORT_SIDE
+    return VISION_SHORT_SIDE, long_side
+
+
+def _label_font() -> ImageFont.ImageFont:
+    try:
+        return ImageFont.load_default(size=LABEL_HEIGHT - 8)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def compose(images: list[Image.Image]) -> Image.Image:
+    """이미지를 격자로 배치하고 각 칸 왼쪽 위에 [번호] 라벨을 붙입니다."""
+    images = images[:MAX_COMPOSITE_IMAGES]
+    cols, rows = _grid(len(images))
+    width, height = _canvas_size(cols, rows)
+    cell_w, cell_h = width // cols, height // rows
+
+    canvas = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(canvas)
+    font = _label_font()
+
+    for index, img in enumerate(images):
+        x, y = (index % cols) * cell_w, (index // cols) * cell_h
+        photo = ImageOps.exif_transpose(img).convert("RGB")
+        photo.thumbnail((cell_w, cell_h - LABEL_HEIGHT), Image.Resampling.LANCZOS)
+        canvas.paste(
+            photo,
+            (x + (cell_w - photo.width) // 2, y + LABEL_HEIGHT + (cell_h - LABEL_HEIGHT - photo.height) // 2),
+        )
+        draw.rectangle([x, y, x + cell_w - 1, y + LABEL_HEIGHT - 1], fill="black")
+        draw.text((x + 6, y + 4), f"[{index + 1}]", fill="white", font=font)
+        draw.rectangle([x, y, x + cell_w - 1, y + cell_h - 1], outline="black")
+
+    return canvas
+
+
+def _composite_key(image_urls: list[str]) -> str:
+    # 같은 사진 묶음이면 재시도/배치 제출 때 다시 만들지 않도록 내용 주소로 저장
+    digest = hashlib.sha256("\n".join(image_urls).encode()).hexdigest()[:32]
+    return f"{COMPOSITE_PREFIX}/{digest}.jpg"
+
+
+def _load_image(url: str) -> Image.Image:
+    s3 = _get_s3()
+    resp = s3.get_object(Bucket=settings.S3_BUCKET_NAME, Key=_key_from_url(url))
+    return Image.open(io.BytesIO(resp["Body"].read()))
+
+
+def _exists(key: str) -> bool:
+    try:
+        _get_s3().head_object(Bucket=settings.S3_BUCKET_NAME, Key=key)
+        return True
+    except Exception:
+        return False
+
+
+async def get_or_create_composite(image_urls: list[str]) -> str | None:
+    """합성 이미지 S3 URL. 2장 미만이거나 합성할 수 없으면 None (개별 이미지로 분석)"""
+    image_urls = image_urls[:MAX_COMPOSITE_IMAGES]
+    if len(image_urls) < 2 or _is_mock_mode():
+        return None
+
+    key = _composite_key(image_urls)
+    if _exists(key):
+        return _s3_url(key)
+
+    try:
+        canvas = compose([_load_image(url) for url in image_urls])
+        buf = io.BytesIO()
+        canvas.save(buf, format="JPEG", quality=90)
+    except Exception as e:
+        logger.warning(f"Composite build failed, falling back to separate images: {e}")
+        return None
+    return await _upload_to_s3(buf.getvalue(), key, "image/jpeg")
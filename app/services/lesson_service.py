@@ -2,7 +2,7 @@ import logging
 from datetime import datetime, timezone
 
 from fastapi import HTTPException, status
-from prisma import Json, Prisma
+from prisma import Prisma
 
 from app.schemas.lesson import (
     ABILITY_TAGS,
@@ -10,6 +10,7 @@ from app.schemas.lesson import (
     LessonProblemCreate,
     LessonUpdateRequest,
 )
+from app.services import task_service
 from app.services.upload_service import load_parsed_json
 
 logger = logging.getLogger(__name__)
@@ -84,47 +85,27 @@ async def create_lesson(db: Prisma, user, data: LessonCreateRequest):
                     for i, p in enumerate(raw_problems)
                 ]
 
-    task = await db.task.create(
-        data={
-            "menteeId": data.menteeId,
-            "createdByMentorId": profile.id,
-            "date": _date_to_utc(data.date),
-            "title": data.title,
-            "goal": data.goal,
-            "subject": data.subject,
-            "abilityTag": data.abilityTags[0] if data.abilityTags else None,
-            "tags": data.abilityTags,
-            "materialId": data.materialId,
-            "materialUrl": data.materialUrl,
-            "materialType": "PDF" if data.materialUrl or data.materialId else None,
-            "content": content,
-            "targetStudyMinutes": data.targetStudyMinutes,
-            "isLocked": True,
-            "createdBy": "MENTOR",
-            "status": "PENDING",
-        },
-        include={"problems": True},
-    )
-
-    # 문제 생성 (PDF 자동 추출, S3 자동 로드, 또는 직접 입력)
-    if problems:
-        for p in problems:
-            create_data: dict = {
-                "task": {"connect": {"id": task.id}},
-                "number": p.number,
-                "title": p.title,
-                "content": p.content,
-                "correctAnswer": p.correctAnswer,
-                "displayOrder": p.displayOrder,
-            }
-            if p.options is not None:
-                create_data["options"] = Json(p.options)
-            await db.taskproblem.create(data=create_data)
+    task_row = {
+        "menteeId": data.menteeId,
+        "createdByMentorId": profile.id,
+        "date": _date_to_utc(data.date),
+        "title": data.title,
+        "goal": data.goal,
+        "subject": data.subject,
+        "abilityTag": data.abilityTags[0] if data.abilityTags else None,
+        "tags": data.abilityTags,
+        "materialId": data.materialId,
+        "materialUrl": data.materialUrl,
+        "materialType": "PDF" if data.materialUrl or data.materialId else None,
+        "content": content,
+        "targetStudyMinutes": data.targetStudyMinutes,
+        "isLocked": True,
+        "createdBy": "MENTOR",
+        "status": "PENDING",
+    }
 
-        task = await db.task.find_unique(
-            where={"id": task.id},
-            include={"problems": {"order_by": {"displayOrder": "asc"}}},
-        )
+    # 학습 + 문제 (PDF 자동 추출, S3 자동 로드, 또는 직접 입력)를 한 트랜잭션에서 일괄 생성
+    task = await task_service.create_tasks_with_problems(db, [task_row], problems)
 
     return _task_to_lesson_response(task)
 
@@ -146,7 +127,7 @@ async def get_lessons(
             "createdBy": "MENTOR",
         },
         order={"createdAt": "desc"},
-        include={"problems": {"order_by": {"displayOrder": "asc"}}},
+        include={"problems": task_service.PROBLEMS_INCLUDE},
     )
 
     return {
@@ -161,7 +142,7 @@ async def get_lesson(db: Prisma, user, lesson_id: str):
 
     task = await db.task.find_unique(
         where={"id": lesson_id},
-        include={"problems": {"order_by": {"displayOrder": "asc"}}},
+        include={"problems": task_service.PROBLEMS_INCLUDE},
     )
     if not task:
         raise HTTPException(
@@ -217,12 +198,12 @@ async def update_lesson(db: Prisma, user, lesson_id: str, data: LessonUpdateRequ
         task = await db.task.update(
             where={"id": lesson_id},
             data=update_data,
-            include={"problems": {"order_by": {"displayOrder": "asc"}}},
+            include={"problems": task_service.PROBLEMS_INCLUDE},
         )
     else:
         task = await db.task.find_unique(
             where={"id": lesson_id},
-            include={"problems": {"order_by": {"displayOrder": "asc"}}},
+            include={"problems": task_service.PROBLEMS_INCLUDE},
         )
 
     return _task_to_lesson_response(task)
@@ -256,7 +237,7 @@ def _task_to_lesson_response(task):
     """Task를 LessonResponse 형식으로 변환"""
     problems = []
     if hasattr(task, "problems") and task.problems:
-        problems = task.problems
+        problems = [task_service.problem_to_response(p) for p in task.problems]
     return {
         "id": task.id,
         "menteeId": task.menteeId,
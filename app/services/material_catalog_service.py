@@ -0,0 +1,166 @@
+import bisect
+import logging
+import time
+
+from prisma import Prisma
+from prisma.models import Material
+
+from app.core import pagination
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 학습지 카탈로그 프로세스 메모리 스냅샷.
+#
+# 카탈로그는 학습지 등록 때만 바뀌므로 목록/추천은 DB 대신 스냅샷에서 필터·정렬합니다.
+# 버전은 DB의 (개수, 최신 등록 시각)이라 워커 간에 따로 전파할 필요가 없고, 이 프로세스에서
+# 등록한 학습지는 즉시 반영, 다른 워커의 등록은 MATERIAL_CATALOG_VERSION_CHECK_SECONDS 주기로
+# 버전을 확인해 반영합니다.
+
+# 필터 값 (prisma Subject / MaterialType enum). 이 밖의 값은 필터별 목록 캐시에 넣지 않습니다.
+SUBJECTS = frozenset({"KOREAN", "ENGLISH", "MATH"})
+MATERIAL_TYPES = frozenset({"COLUMN", "PDF"})
+
+_CATALOG_VERSION_SQL = """
+SELECT COUNT(*)::int AS "count",
+       FLOOR(EXTRACT(EPOCH FROM MAX("createdAt")) * 1000)::bigint AS "latestMs"
+FROM "Material"
+"""
+
+
+def _created_ms(material) -> int:
+    return pagination.timestamp_ms(material.createdAt)
+
+
+def _sort_key(material) -> tuple[int, str]:
+    """목록 정렬 키 (최신순, 같은 시각이면 ID순). 커서도 이 키를 담습니다."""
+    return -_created_ms(material), material.id
+
+
+def _version(count: int, latest_ms: int | None) -> str:
+    return f"{count}:{latest_ms}" if count else "0"
+
+
+async def catalog_version(db: Prisma) -> str:
+    """DB 기준 카탈로그 버전 (개수 + 최신 등록 시각). 학습지가 추가/삭제되면 바뀝니다."""
+    row = (await db.query_raw(_CATALOG_VERSION_SQL))[0]
+    return _version(row["count"], row["latestMs"])
+
+
+class MaterialCatalog:
+    """학습지 스냅샷 + (과목, 능력 태그) 역색인 + 필터별 정렬 목록 캐시"""
+
+    def __init__(self):
+        self.version: str | None = None
+        self.checked_at = 0.0
+        self.materials: dict[str, Material] = {}
+        self.by_tag: dict[tuple[str, str], set[str]] = {}
+        self.latest_ms: int | None = None
+        self._views: dict[tuple[str | None, str | None], tuple[list[Material], list[tuple[int, str]]]] = {}
+
+    def load(self, materials: list[Material], version: str):
+        self.materials = {}
+        self.by_tag = {}
+        self.latest_ms = None
+        for m in materials:
+            self._index(m)
+        self._views = {}
+        self.version = version
+
+    def add(self, material: Material):
+        if material.id in self.materials:
+            return
+        self._index(material)
+        self._views = {}
+        self.version = _version(len(self.materials), self.latest_ms)
+
+    def _index(self, material: Material):
+        self.materials[material.id] = material
+        for tag in material.abilityTags:
+            self.by_tag.setdefault((material.subject, tag), set()).add(material.id)
+        created = _created_ms(material)
+        self.latest_ms = created if self.latest_ms is None else max(self.latest_ms, created)
+
+    def view(self, subject: str | None = None, material_type: str | None = None) -> list[Material]:
+        """필터 조건별 최신순 목록 (카탈로그가 바뀔 때까지 캐시)"""
+        return self._view(subject, material_type)[0]
+
+    def _view(self, subject: str | None, material_type: str | None):
+        key = (subject, material_type)
+        if key in self._views:
+            return self._views[key]
+        items = sorted(
+            (
+                m for m in self.materials.values()
+                if (not subject or m.subject == subject)
+                and (not material_type or m.type == material_type)
+            ),
+            key=_sort_key,
+        )
+        view = (items, [_sort_key(m) for m in items])
+        # 캐시 키는 enum 조합으로만 한정 (임의 문자열로 캐시가 무한히 커지지 않도록)
+        if (not subject or subject in SUBJECTS) and (not material_type or material_type in MATERIAL_TYPES):
+            self._views[key] = view
+        return view
+
+    def tagged_ids(self, subject: str | None, tags: set[str]) -> set[str]:
+        subjects = [subject] if subject else {s for s, _ in self.by_tag}
+        found: set[str] = set()
+        for s in subjects:
+            for tag in tags:
+                found |= self.by_tag.get((s, tag), set())
+        return found
+
+    def page(
+        self,
+        subject: str | None,
+        material_type: str | None,
+        cursor: str | None,
+        limit: int,
+    ) -> tuple[list[Material], str | None]:
+        """(목록, 다음 커서). 다음 페이지가 없으면 커서는 None"""
+        items, keys = self._view(subject, material_type)
+        start = bisect.bisect_right(keys, decode_cursor(cursor)) if cursor else 0
+        chunk = items[start:start + limit]
+        has_more = start + limit < len(items)
+        return chunk, encode_cursor(chunk[-1]) if has_more and chunk else None
+
+
+_catalog = MaterialCatalog()
+
+
+def encode_cursor(material) -> str:
+    return pagination.encode_cursor(material.createdAt, material.id)
+
+
+def decode_cursor(cursor: str) -> tuple[int, str]:
+    """커서 → 정렬 키 (-등록 시각 ms, id)"""
+    created_at, material_id = pagination.decode_cursor(cursor, "MATERIAL_002")
+    return -pagination.timestamp_ms(created_at), material_id
+
+
+async def get_catalog(db: Prisma, version: str | None = None) -> MaterialCatalog:
+    """스냅샷 반환. 버전을 넘기지 않으면 확인 주기가 지났을 때만 DB 버전을 조회합니다."""
+    now = time.monotonic()
+    if version is None:
+        fresh = now - _catalog.checked_at < settings.MATERIAL_CATALOG_VERSION_CHECK_SECONDS
+        if _catalog.version is not None and fresh:
+            return _catalog
+        version = await catalog_version(db)
+    _catalog.checked_at = now
+
+    if _catalog.version != version:
+        materials = await db.material.find_many()
+        _catalog.load(materials, version)
+        logger.info(f"Material catalog reloaded: {len(materials)} materials (version {version})")
+    return _catalog
+
+
+async def current_version(db: Prisma) -> str:
+    return (await get_catalog(db)).version
+
+
+def add_material(material: Material):
+    """이 프로세스에서 등록한 학습지를 바로 반영 (아직 로드 전이면 첫 조회 때 읽음)"""
+    if _catalog.version is not None:
+        _catalog.add(material)
@@ -1,27 +1,49 @@
 from fastapi import HTTPException, status
 from prisma import Prisma
 
+from app.core import pagination
 from app.schemas.material import MaterialCreateRequest
+from app.services import material_catalog_service
+
+
+def _validate_filters(subject: str | None, material_type: str | None) -> None:
+    if subject and subject not in material_catalog_service.SUBJECTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "MATERIAL_003", "message": f"잘못된 과목: {subject}. 허용: KOREAN, ENGLISH, MATH"},
+        )
+    if material_type and material_type not in material_catalog_service.MATERIAL_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "MATERIAL_003", "message": f"잘못된 유형: {material_type}. 허용: COLUMN, PDF"},
+        )
 
 
 async def get_materials(
     db: Prisma,
     subject: str | None = None,
     material_type: str | None = None,
+    cursor: str | None = None,
+    limit: int = pagination.DEFAULT_LIMIT,
 ):
-    where: dict = {}
-    if subject:
-        where["subject"] = subject
-    if material_type:
-        where["type"] = material_type
-
-    return await db.material.find_many(
-        where=where,
-        order={"createdAt": "desc"},
-    )
+    """카탈로그 스냅샷에서 최신순 커서 페이지 조회 (DB는 버전 확인만)"""
+    _validate_filters(subject, material_type)
+    catalog = await material_catalog_service.get_catalog(db)
+    materials, next_cursor = catalog.page(subject, material_type, cursor, limit)
+    return {
+        "materials": materials,
+        "nextCursor": next_cursor,
+        "total": len(catalog.view(subject, material_type)),
+        "etag": f'"materials-{catalog.version}"',
+    }
 
 
 async def get_material(db: Prisma, material_id: str):
+    catalog = await material_catalog_service.get_catalog(db)
+    material = catalog.materials.get(material_id)
+    if material:
+        return material
+    # 다른 워커에서 방금 등록해 스냅샷에 아직 없는 경우
     material = await db.material.find_unique(where={"id": material_id})
     if not material:
         raise HTTPException(
@@ -32,7 +54,7 @@ async def get_material(db: Prisma, material_id: str):
 
 
 async def create_material(db: Prisma, data: MaterialCreateRequest):
-    return await db.material.create(
+    material = await db.material.create(
         data={
             "title": data.title,
             "type": data.type,
@@ -42,3 +64,6 @@ async def create_material(db: Prisma, data: MaterialCreateRequest):
             "contentUrl": data.contentUrl,
         }
     )
+    # 스냅샷에 바로 반영 (다른 워커는 카탈로그 버전이 바뀐 것을 보고 다시 읽음)
+    material_catalog_service.add_material(material)
+    return material
@@ -1,9 +1,12 @@
+import uuid
 from datetime import date, datetime, timezone
 
 from fastapi import HTTPException, status
 from prisma import Prisma
 
-from app.schemas.mentor import FeedbackCreateRequest, JudgmentModifyRequest
+from app.core import pagination
+from app.schemas.mentor import BulkPlanRequest, FeedbackCreateRequest, JudgmentModifyRequest
+from app.services import task_service
 
 
 def _today_utc() -> datetime:
@@ -39,7 +42,8 @@ async def get_mentee_list(db: Prisma, user):
     for link in links:
         m = link.mentee
 
-        # 전체 과제 완수율 계산
+        # 전체 과제 완수율 계산 (아직 조회되지 않은 반복 회차도 포함)
+        await task_service.materialize_through_week(db, m.id)
         all_tasks = await db.task.find_many(where={"menteeId": m.id})
         total = len(all_tasks)
         completed = sum(1 for t in all_tasks if t.status in ("SUBMITTED", "COMPLETED"))
@@ -92,6 +96,7 @@ async def get_mentee_detail(db: Prisma, user, mentee_id: str):
         )
 
     today = _today_utc()
+    await task_service.materialize_recurrences(db, mentee_id, today.date())
     tasks = await db.task.find_many(
         where={"menteeId": mentee_id, "date": today},
         order={"displayOrder": "asc"},
@@ -162,24 +167,34 @@ async def get_review_queue(db: Prisma, user):
     return queue
 
 
-async def get_comment_queue(db: Prisma, user):
-    """코멘트 답변 대기열 조회"""
+async def get_comment_queue(
+    db: Prisma,
+    user,
+    cursor: str | None = None,
+    limit: int = pagination.DEFAULT_LIMIT,
+    with_total: bool = False,
+):
+    """코멘트 답변 대기열 최신순 커서 페이지. 반환: {items, nextCursor, total}"""
     profile = await _require_mentor_profile(user)
     links = await db.mentormentee.find_many(where={"mentorId": profile.id})
     mentee_ids = [link.menteeId for link in links]
 
     if not mentee_ids:
-        return []
-
-    comments = await db.dailycomment.find_many(
-        where={"menteeId": {"in": mentee_ids}},
+        return pagination.empty_page(with_total)
+
+    page = await pagination.paginate(
+        db.dailycomment,
+        {"menteeId": {"in": mentee_ids}},
+        "createdAt",
+        cursor,
+        limit,
         include={"mentee": {"include": {"user": True}}},
-        order={"createdAt": "desc"},
+        with_total=with_total,
     )
 
     now = datetime.now(timezone.utc)
     queue = []
-    for c in comments:
+    for c in page["items"]:
         # 경과시간 계산 (분)
         elapsed = int((now - c.createdAt.replace(tzinfo=timezone.utc)).total_seconds() / 60)
 
@@ -193,17 +208,19 @@ async def get_comment_queue(db: Prisma, user):
             "hasReply": c.mentorReply is not None,
         })
 
-    return queue
+    return {**page, "items": queue}
 
 
 async def get_dashboard(db: Prisma, user):
     mentees = await get_mentee_list(db, user)
     review_queue = await get_review_queue(db, user)
-    comment_queue = await get_comment_queue(db, user)
+    # 코멘트 대기열은 첫 페이지만 싣고, 남은 항목이 있음을 페이지 정보로 알림
+    comment_queue = await get_comment_queue(db, user, with_total=True)
     return {
         "mentees": mentees,
         "reviewQueue": review_queue,
-        "commentQueue": comment_queue,
+        "commentQueue": comment_queue["items"],
+        "commentQueuePagination": pagination.page_info(comment_queue, pagination.DEFAULT_LIMIT),
     }
 
 
@@ -360,3 +377,64 @@ async def reply_to_comment(db: Prisma, user, comment_id: str, reply: str):
     )
 
     return updated
+
+
+async def create_bulk_plan(db: Prisma, user, data: BulkPlanRequest):
+    """여러 멘티의 주간 계획을 한 번에 배정합니다.
+
+    담당 관계는 쿼리 1회로 검증하고, 할 일과 문제는 ID를 미리 정해 한 트랜잭션에서
+    create_many로 넣으므로 배정 수와 관계없이 쿼리 수가 고정됩니다.
+    """
+    profile = await _require_mentor_profile(user)
+
+    templates = {t.key: t for t in data.templates}
+    if len(templates) != len(data.templates):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "PLAN_001", "message": "템플릿 key가 중복되었습니다"},
+        )
+    unknown = {a.templateKey for a in data.assignments} - templates.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "PLAN_001", "message": f"존재하지 않는 템플릿입니다: {', '.join(sorted(unknown))}"},
+        )
+
+    mentee_ids = {a.menteeId for a in data.assignments}
+    links = await db.mentormentee.find_many(
+        where={"mentorId": profile.id, "menteeId": {"in": list(mentee_ids)}}
+    )
+    if len({link.menteeId for link in links}) != len(mentee_ids):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"code": "PERM_002", "message": "담당 멘티의 데이터만 접근 가능합니다"},
+        )
+
+    # 템플릿별 공통 필드는 한 번만 만들어 배정마다 날짜/멘티만 바꿉니다
+    bases = {key: t.model_dump(exclude={"key", "problems"}) for key, t in templates.items()}
+    task_rows, problems_by_task = [], {}
+    for a in data.assignments:
+        row = {
+            **bases[a.templateKey],
+            "id": str(uuid.uuid4()),
+            "menteeId": a.menteeId,
+            "date": _date_to_utc(a.date),
+            "isLocked": True,
+            "createdBy": "MENTOR",
+            "createdByMentorId": profile.id,
+        }
+        if a.displayOrder is not None:
+            row["displayOrder"] = a.displayOrder
+        task_rows.append(row)
+        problems_by_task[row["id"]] = templates[a.templateKey].problems
+
+    # 같은 템플릿의 문제 내용은 ProblemBank에 한 번만 저장되고 할 일마다 연결 행만 추가됨
+    async with db.tx() as tx:
+        await tx.task.create_many(data=task_rows)
+        problem_count = await task_service.insert_problems(tx, problems_by_task)
+
+    return {
+        "taskCount": len(task_rows),
+        "problemCount": problem_count,
+        "taskIds": [row["id"] for row in task_rows],
+    }
@@ -11,6 +11,7 @@ from app.schemas.my import (
     MyPageUpdateRequest,
     SubjectStat,
 )
+from app.services import task_service
 
 
 async def get_my_page(db: Prisma, user: User) -> MyPageResponse:
@@ -71,6 +72,9 @@ async def _get_mentee_my_page(
             department=mentor.department,
         )
 
+    # 아직 조회되지 않은 반복 회차도 통계(과목별/활동 요약)의 과제 수에 포함
+    await task_service.materialize_through_week(db, mentee.id)
+
     # 과목별 통계 계산
     subject_stats = await _calculate_subject_stats(db, mentee.id, mentee.subjects)
 
@@ -4,6 +4,7 @@ from fastapi import HTTPException, status
 from prisma import Prisma
 
 from app.schemas.parent import MentorBasicInfo
+from app.services import task_service
 
 
 def _today_utc() -> datetime:
@@ -38,6 +39,7 @@ async def get_dashboard(db: Prisma, user):
     parent_profile, mentee = await _require_parent(user, db)
 
     today = _today_utc()
+    await task_service.materialize_recurrences(db, mentee.id, today.date())
     tasks = await db.task.find_many(where={"menteeId": mentee.id, "date": today})
     total = len(tasks)
     completed = sum(1 for t in tasks if t.status in ("SUBMITTED", "COMPLETED"))
@@ -100,6 +102,7 @@ async def get_mentee_status(db: Prisma, user):
     today = date.today()
     monday = today - timedelta(days=today.weekday())
     monday_dt = _date_to_utc(monday)
+    await task_service.materialize_recurrences(db, mentee.id, monday, monday + timedelta(days=6))
     weekly_rates = []
     total_week = 0
     completed_week = 0
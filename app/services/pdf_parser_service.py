@@ -1,10 +1,13 @@
+import asyncio
 import base64
 import json
 import logging
+import time
 
 import fitz  # PyMuPDF
 from openai import AsyncOpenAI
 
+from app.core import metrics, model_routing
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -18,11 +21,16 @@ _openai_client: AsyncOpenAI | None = None
 def _get_openai() -> AsyncOpenAI:
     global _openai_client
     if _openai_client is None:
-        _openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        _openai_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL or None,
+        )
     return _openai_client
 
 
 def _is_mock_mode() -> bool:
+    if settings.OPENAI_BASE_URL:
+        return False
     return settings.APP_ENV == "test" or not settings.OPENAI_API_KEY
 
 
@@ -133,16 +141,54 @@ async def _call_gpt_text(full_text: str) -> dict:
 [응답 JSON 형식]
 {PDF_PARSE_JSON_SCHEMA}"""
 
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
+
+    # 깨끗한 디지털 PDF는 작은 모델로 먼저 파싱하고, 결과가 형식에 맞지 않으면 큰 모델로 재요청
+    tier = model_routing.select_tier(model_routing.MODALITY_PDF_TEXT, None, len(full_text))
+    if tier == model_routing.TIER_SMALL:
+        try:
+            result = await _request_parse(client, messages, tier)
+        except ValueError as e:
+            result = None
+            logger.info(f"Small model PDF parse unparseable, escalating: {e}")
+        if _is_valid_parse_result(result):
+            return result
+        tier = model_routing.TIER_LARGE
+        logger.info("Small model PDF parse failed validation, escalating to large model")
+
+    return await _request_parse(client, messages, tier)
+
+
+def _is_valid_parse_result(result) -> bool:
+    if not isinstance(result, dict) or not isinstance(result.get("content"), str):
+        return False
+    problems = result.get("problems")
+    if not isinstance(problems, list):
+        return False
+    return all(
+        isinstance(p, dict) and isinstance(p.get("number"), int) and isinstance(p.get("title"), str)
+        for p in problems
+    )
+
+
+async def _request_parse(client: AsyncOpenAI, messages: list[dict], tier: str) -> dict:
+    started = time.perf_counter()
     response = await client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_prompt},
-        ],
+        model=model_routing.model_for(tier),
+        messages=messages,
         max_tokens=4000,
         temperature=0.1,
     )
-
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    metrics.observe(f"pdf_parse.{tier}_ms", elapsed_ms)
+    usage = response.usage
+    logger.info(
+        f"PDF parse via {tier} model {response.model} in {elapsed_ms:.0f}ms "
+        f"(tokens {usage.prompt_tokens if usage else '?'}/{usage.completion_tokens if usage else '?'})"
+    )
     return _parse_json_response(response.choices[0].message.content or "{}")
 
 
@@ -172,7 +218,7 @@ async def _call_gpt_vision(base64_images: list[str], partial_text: str) -> dict:
         })
 
     response = await client.chat.completions.create(
-        model="gpt-4o",
+        model=settings.OPENAI_MODEL_LARGE,
         messages=[
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": content},
@@ -225,6 +271,8 @@ def _mock_parse_result() -> dict:
 async def parse_pdf_content(pdf_bytes: bytes) -> dict:
     """PDF 바이트에서 지문/문제를 추출. 실패 시 빈 결과 반환."""
     if _is_mock_mode():
+        if settings.MOCK_PDF_PARSE_LATENCY_SECONDS > 0:
+            await asyncio.sleep(settings.MOCK_PDF_PARSE_LATENCY_SECONDS)
         return _mock_parse_result()
 
     try:
@@ -5,6 +5,7 @@ from fastapi import HTTPException, status
 from prisma import Prisma
 
 from app.schemas.planner import CommentCreateRequest, CommentReplyRequest
+from app.services import task_service
 
 
 def _date_to_utc(d: date) -> datetime:
@@ -25,6 +26,7 @@ def _count_completed(tasks) -> int:
 async def get_planner(db: Prisma, mentee_id: str, planner_date: date):
     dt = _date_to_utc(planner_date)
 
+    await task_service.materialize_recurrences(db, mentee_id, planner_date)
     tasks = await db.task.find_many(
         where={"menteeId": mentee_id, "date": dt},
         order={"displayOrder": "asc"},
@@ -83,6 +85,7 @@ async def get_planner(db: Prisma, mentee_id: str, planner_date: date):
 
 async def get_completion_rate(db: Prisma, mentee_id: str, rate_date: date):
     dt = _date_to_utc(rate_date)
+    await task_service.materialize_recurrences(db, mentee_id, rate_date)
     tasks = await db.task.find_many(
         where={"menteeId": mentee_id, "date": dt}
     )
@@ -99,6 +102,7 @@ async def get_completion_rate(db: Prisma, mentee_id: str, rate_date: date):
 async def get_weekly(db: Prisma, mentee_id: str, week_of: date):
     monday = week_of - timedelta(days=week_of.weekday())
     days = []
+    await task_service.materialize_recurrences(db, mentee_id, monday, monday + timedelta(days=6))
 
     for i in range(7):
         d = monday + timedelta(days=i)
@@ -121,6 +125,7 @@ async def get_weekly(db: Prisma, mentee_id: str, week_of: date):
 async def get_monthly(db: Prisma, mentee_id: str, year: int, month: int):
     _, last_day = calendar.monthrange(year, month)
     days = []
+    await task_service.materialize_recurrences(db, mentee_id, date(year, month, 1), date(year, month, last_day))
 
     for day in range(1, last_day + 1):
         d = date(year, month, day)
@@ -0,0 +1,136 @@
+from prisma import Prisma
+from prisma.models import Material
+
+from app.services.material_catalog_service import MaterialCatalog
+
+# 보완 학습지 추천 엔진.
+#
+# 학습지 카탈로그 스냅샷(material_catalog_service)의 (과목, 능력 태그) 역색인에서 후보를 뽑아
+# 태그 일치도 + 최근 학습 밀도 대비 난이도 적합도 + 미배정 여부로 점수를 매깁니다.
+# 태그가 일치하는 후보를 먼저, 나머지 같은 과목 학습지는 그 뒤에 점수순으로 이어 붙입니다.
+
+TAG_WEIGHT = 0.6
+DIFFICULTY_WEIGHT = 0.25
+UNASSIGNED_WEIGHT = 0.15
+
+MIN_DIFFICULTY = 1
+MAX_DIFFICULTY = 5
+RECENT_DENSITY_WINDOW = 10  # 난이도 목표 계산에 쓰는 최근 완료 분석 수
+
+_ASSIGNED_MATERIALS_SQL = """
+SELECT DISTINCT "materialId"
+FROM "Task"
+WHERE "menteeId" = $1 AND "materialId" IS NOT NULL
+"""
+
+
+class MenteeContext:
+    """멘티별 점수 계산 입력 (최근 밀도 기준 목표 난이도, 배정된 적 있는 학습지)"""
+
+    def __init__(self, target_difficulty: int | None = None, assigned_ids: set[str] | None = None):
+        self.target_difficulty = target_difficulty
+        self.assigned_ids = assigned_ids or set()
+
+
+def target_difficulty(densities: list[int]) -> int | None:
+    """최근 학습 밀도 평균 0~100을 난이도 1~5로 (밀도가 낮으면 쉬운 학습지)"""
+    if not densities:
+        return None
+    avg = sum(densities) / len(densities)
+    level = MIN_DIFFICULTY + round(avg * (MAX_DIFFICULTY - MIN_DIFFICULTY) / 100)
+    return max(MIN_DIFFICULTY, min(MAX_DIFFICULTY, level))
+
+
+async def mentee_context(db: Prisma, mentee_id: str | None) -> MenteeContext:
+    if not mentee_id:
+        return MenteeContext()
+    recent = await db.aianalysis.find_many(
+        where={
+            "status": "COMPLETED",
+            "densityScore": {"not": None},
+            "submission": {"is": {"task": {"is": {"menteeId": mentee_id}}}},
+        },
+        order={"updatedAt": "desc"},
+        take=RECENT_DENSITY_WINDOW,
+    )
+    assigned = await db.query_raw(_ASSIGNED_MATERIALS_SQL, mentee_id)
+    return MenteeContext(
+        target_difficulty([a.densityScore for a in recent]),
+        {row["materialId"] for row in assigned},
+    )
+
+
+def query_tags(task) -> set[str]:
+    """과제의 능력 태그 + 자유 태그"""
+    if not task:
+        return set()
+    tags = set(getattr(task, "tags", None) or [])
+    if task.abilityTag:
+        tags.add(task.abilityTag)
+    return tags
+
+
+def _difficulty_fit(difficulty: int | None, target: int | None) -> float:
+    if difficulty is None or target is None:
+        return 0.5
+    return 1 - abs(difficulty - target) / (MAX_DIFFICULTY - MIN_DIFFICULTY)
+
+
+def _score(material: Material, tags: set[str], context: MenteeContext) -> tuple[float, list[str]]:
+    matched = sorted(tags & set(material.abilityTags))
+    overlap = len(matched) / len(tags) if tags else 0.0
+    fit = _difficulty_fit(material.difficulty, context.target_difficulty)
+    unassigned = material.id not in context.assigned_ids
+    score = TAG_WEIGHT * overlap + DIFFICULTY_WEIGHT * fit + UNASSIGNED_WEIGHT * unassigned
+
+    reasons = []
+    if matched:
+        reasons.append(f"능력 태그 일치({', '.join(matched)})")
+    if context.target_difficulty is not None and material.difficulty == context.target_difficulty:
+        reasons.append(f"난이도 적합({material.difficulty})")
+    if unassigned:
+        reasons.append("미배정")
+    return score, reasons
+
+
+def _ranked(materials, tags: set[str], context: MenteeContext) -> list[tuple[float, list[str], Material]]:
+    # 같은 점수면 최신순 (materials는 카탈로그 정렬 순서)
+    scored = [(*_score(m, tags, context), m) for m in materials]
+    scored.sort(key=lambda s: s[0], reverse=True)
+    return scored
+
+
+def to_recommendation(material: Material, subject: str | None, score: float, reasons: list[str]) -> dict:
+    return {
+        "materialId": material.id,
+        "title": material.title,
+        "subject": material.subject,
+        "abilityTags": material.abilityTags,
+        "difficulty": material.difficulty,
+        "score": round(score, 3),
+        "reason": ", ".join([f"과목 일치({subject})" if subject else "전체 과목", *reasons]),
+    }
+
+
+def recommend(
+    catalog: MaterialCatalog,
+    subject: str | None,
+    tags: set[str],
+    context: MenteeContext,
+    offset: int = 0,
+    limit: int = 5,
+) -> tuple[list[dict], int]:
+    """(추천 목록, 전체 후보 수). DB 조회 없이 스냅샷에서 계산합니다."""
+    candidates = catalog.view(subject)
+    total = len(candidates)
+    if offset >= total:
+        return [], total
+
+    tagged = catalog.tagged_ids(subject, tags)
+    ranked = _ranked([m for m in candidates if m.id in tagged], tags, context)
+    # 태그 일치 후보로 페이지가 채워지면 나머지 과목 학습지는 점수 계산 생략
+    if len(ranked) < offset + limit:
+        ranked += _ranked([m for m in candidates if m.id not in tagged], tags, context)
+
+    page = ranked[offset:offset + limit]
+    return [to_recommendation(m, subject, score, reasons) for score, reasons, m in page], total
@@ -0,0 +1,204 @@
+import json
+import logging
+
+from prisma import Prisma
+
+from app.services.rescoring_service import rescore_analyses
+from app.services.submission_service import _normalize_answer
+
+logger = logging.getLogger(__name__)
+
+# 정답 변경 후 기존 제출 재채점.
+#
+# 대상 문제(TaskProblem ID 또는 ProblemBank ID로 지정)의 응답을 읽어 제출 채점과 같은 규칙으로 다시 채점하고,
+# 채점 결과가 바뀐 제출의 자동 채점 점수/오답 번호를 다시 집계합니다. 오답 학습지는 새로 틀린
+# 응답만 추가, 더 이상 틀리지 않은 응답은 삭제, 계속 틀린 응답은 정답/제목만 갱신합니다.
+# 채점 가능한 문제가 하나도 남지 않은 제출은 점수가 자동 채점 값 그대로일 때만 비웁니다.
+# 모든 단계가 집합 단위 UPDATE/INSERT/DELETE라 제출 수와 관계없이 쿼리 수가 고정됩니다.
+
+_PROBLEM_FILTER = 'tp."id" IN (SELECT jsonb_array_elements_text($1::jsonb))'
+_BANK_FILTER = 'tp."bankId" IN (SELECT jsonb_array_elements_text($1::jsonb))'
+
+_RESPONSES_SQL = """
+SELECT r."id", r."answer", r."isCorrect", b."correctAnswer"
+FROM "ProblemResponse" r
+JOIN "TaskProblem" tp ON tp."id" = r."problemId"
+JOIN "ProblemBank" b ON b."id" = tp."bankId"
+WHERE {filter}
+"""
+
+# 채점 결과는 submission_service와 같은 Python 정규화로 계산해 한 번에 반영 (SQL btrim/lower는
+# 공백 문자 집합과 비 ASCII 소문자 변환이 str.strip().lower()와 달라 채점이 어긋날 수 있음).
+# 변경된 응답마다 (제출 ID, 재채점 전 자동 채점 집계)를 반환. CTE는 모두 UPDATE 이전 스냅샷을 봄
+_APPLY_GRADES_SQL = """
+WITH graded AS (
+    SELECT g."id", g."isCorrect", r."submissionId"
+    FROM jsonb_to_recordset($1::jsonb) AS g("id" text, "isCorrect" boolean)
+    JOIN "ProblemResponse" r ON r."id" = g."id"
+),
+before AS (
+    SELECT r."submissionId",
+           (COUNT(*) FILTER (WHERE r."isCorrect"))::int AS "correct",
+           COUNT(r."isCorrect")::int AS "total"
+    FROM "ProblemResponse" r
+    WHERE r."submissionId" IN (SELECT "submissionId" FROM graded)
+    GROUP BY r."submissionId"
+),
+updated AS (
+    UPDATE "ProblemResponse" AS r
+    SET "isCorrect" = g."isCorrect"
+    FROM graded g
+    WHERE r."id" = g."id" AND r."isCorrect" IS DISTINCT FROM g."isCorrect"
+    RETURNING r."submissionId"
+)
+SELECT u."submissionId", b."correct", b."total"
+FROM updated u
+JOIN before b ON b."submissionId" = u."submissionId"
+"""
+
+# 채점 가능한 문제가 하나도 남지 않은 제출은 _CLEAR_AUTO_SCORES_SQL에서 처리
+_RECOUNT_SUBMISSIONS_SQL = """
+UPDATE "TaskSubmission" AS s
+SET "selfScoreCorrect" = g."correct",
+    "selfScoreTotal" = g."total",
+    "wrongQuestions" = g."wrong"
+FROM (
+    SELECT r."submissionId",
+           (COUNT(*) FILTER (WHERE r."isCorrect"))::int AS "correct",
+           COUNT(r."isCorrect")::int AS "total",
+           COALESCE(array_agg(tp."number" ORDER BY tp."number") FILTER (WHERE NOT r."isCorrect"), '{}'::int[]) AS "wrong"
+    FROM "ProblemResponse" r
+    JOIN "TaskProblem" tp ON tp."id" = r."problemId"
+    WHERE r."submissionId" IN (SELECT jsonb_array_elements_text($1::jsonb))
+    GROUP BY r."submissionId"
+) g
+WHERE s."id" = g."submissionId" AND g."total" > 0
+"""
+
+# 재채점 후 채점 가능한 응답이 없는 제출: 저장된 점수가 재채점 전 자동 채점 값과 같으면
+# 자동 채점 결과로 보고 비움 (멘티가 자기채점으로 고친 값은 유지)
+_CLEAR_AUTO_SCORES_SQL = """
+UPDATE "TaskSubmission" AS s
+SET "selfScoreCorrect" = NULL,
+    "selfScoreTotal" = NULL,
+    "wrongQuestions" = '{}'::int[]
+FROM jsonb_to_recordset($1::jsonb) AS b("submissionId" text, "correct" int, "total" int)
+WHERE s."id" = b."submissionId"
+  AND b."total" > 0
+  AND s."selfScoreCorrect" = b."correct"
+  AND s."selfScoreTotal" = b."total"
+  AND NOT EXISTS (
+      SELECT 1 FROM "ProblemResponse" r
+      WHERE r."submissionId" = s."id" AND r."isCorrect" IS NOT NULL
+  )
+"""
+
+_DELETE_SHEETS_SQL = """
+DELETE FROM "WrongAnswerSheet" AS w
+USING "ProblemResponse" r
+JOIN "TaskProblem" tp ON tp."id" = r."problemId"
+WHERE w."submissionId" = r."submissionId" AND w."problemId" = r."problemId"
+  AND r."isCorrect" IS NOT FALSE
+  AND {filter}
+"""
+
+_INSERT_SHEETS_SQL = """
+INSERT INTO "WrongAnswerSheet" (
+    "id", "submissionId", "menteeId", "problemId", "problemNumber", "problemTitle",
+    "originalAnswer", "correctAnswer", "relatedConcepts"
+)
+SELECT gen_random_uuid()::text, r."submissionId", s."menteeId", r."problemId", tp."number", b."title",
+       r."answer", b."correctAnswer", '{}'
+FROM "ProblemResponse" r
+JOIN "TaskSubmission" s ON s."id" = r."submissionId"
+JOIN "TaskProblem" tp ON tp."id" = r."problemId"
+JOIN "ProblemBank" b ON b."id" = tp."bankId"
+WHERE r."isCorrect" = FALSE
+  AND {filter}
+  AND NOT EXISTS (
+      SELECT 1 FROM "WrongAnswerSheet" w
+      WHERE w."submissionId" = r."submissionId" AND w."problemId" = r."problemId"
+  )
+"""
+
+_REFRESH_SHEETS_SQL = """
+UPDATE "WrongAnswerSheet" AS w
+SET "correctAnswer" = b."correctAnswer",
+    "problemTitle" = b."title",
+    "problemNumber" = tp."number"
+FROM "TaskProblem" tp
+JOIN "ProblemBank" b ON b."id" = tp."bankId"
+WHERE w."problemId" = tp."id"
+  AND {filter}
+  AND (w."correctAnswer" IS DISTINCT FROM b."correctAnswer"
+       OR w."problemTitle" IS DISTINCT FROM b."title"
+       OR w."problemNumber" IS DISTINCT FROM tp."number")
+"""
+
+_COMPLETED_ANALYSES_SQL = """
+SELECT "id" FROM "AiAnalysis"
+WHERE "status" = 'COMPLETED'
+  AND "submissionId" IN (SELECT jsonb_array_elements_text($1::jsonb))
+"""
+
+
+def _grade(answer: str | None, correct_answer: str | None) -> bool | None:
+    """submission_service._grade_responses와 같은 규칙 (정답이 없으면 채점 불가 None)"""
+    if not correct_answer:
+        return None
+    return _normalize_answer(answer) == _normalize_answer(correct_answer)
+
+
+async def regrade(
+    db: Prisma,
+    problem_ids: list[str] | None = None,
+    bank_ids: list[str] | None = None,
+) -> dict:
+    """문제(또는 ProblemBank 항목을 쓰는 모든 문제)의 기존 응답을 현재 정답으로 재채점합니다.
+
+    채점 결과가 바뀐 제출의 완료 분석은 밀도 점수를 다시 계산합니다 (GPT 호출 없음).
+    """
+    if bank_ids:
+        row_filter, param = _BANK_FILTER, json.dumps(bank_ids)
+    elif problem_ids:
+        row_filter, param = _PROBLEM_FILTER, json.dumps(problem_ids)
+    else:
+        return {"responses": 0, "submissions": 0, "sheetsAdded": 0, "sheetsRemoved": 0,
+                "sheetsUpdated": 0, "analyses": 0}
+
+    async with db.tx() as tx:
+        responses = await tx.query_raw(_RESPONSES_SQL.format(filter=row_filter), param)
+        grades = []
+        for row in responses:
+            is_correct = _grade(row["answer"], row["correctAnswer"])
+            if is_correct != row["isCorrect"]:
+                grades.append({"id": row["id"], "isCorrect": is_correct})
+        changed = await tx.query_raw(_APPLY_GRADES_SQL, json.dumps(grades)) if grades else []
+        before = {row["submissionId"]: row for row in changed}
+        submission_ids = sorted(before)
+        if submission_ids:
+            await tx.execute_raw(_RECOUNT_SUBMISSIONS_SQL, json.dumps(submission_ids))
+            await tx.execute_raw(_CLEAR_AUTO_SCORES_SQL, json.dumps(list(before.values())))
+        removed = await tx.execute_raw(_DELETE_SHEETS_SQL.format(filter=row_filter), param)
+        added = await tx.execute_raw(_INSERT_SHEETS_SQL.format(filter=row_filter), param)
+        updated = await tx.execute_raw(_REFRESH_SHEETS_SQL.format(filter=row_filter), param)
+
+    analyses = 0
+    if submission_ids:
+        rows = await db.query_raw(_COMPLETED_ANALYSES_SQL, json.dumps(submission_ids))
+        if rows:
+            result = await rescore_analyses(db, analysis_ids=[row["id"] for row in rows])
+            analyses = result["scanned"]
+
+    logger.info(
+        f"Regraded {len(changed)} responses in {len(submission_ids)} submissions "
+        f"(sheets +{added} -{removed} ~{updated}, {analyses} analyses rescored)"
+    )
+    return {
+        "responses": len(changed),
+        "submissions": len(submission_ids),
+        "sheetsAdded": added,
+        "sheetsRemoved": removed,
+        "sheetsUpdated": updated,
+        "analyses": analyses,
+    }
@@ -0,0 +1,144 @@
+import json
+import logging
+from types import SimpleNamespace
+
+from prisma import Prisma
+
+from app.services.analysis_service import (
+    SCORE_DETAIL_MARKER,
+    SCORING_VERSION,
+    _calc_density,
+    _calc_task_score,
+    _calc_time_score,
+    _calc_writing_score,
+    _get_scoring_config,
+    _score_detail,
+    _signal_light,
+)
+from app.services.coaching_precompute_service import build_ai_draft
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# 재채점에 필요한 컬럼만 조인해서 읽는다 (Task.content 등 대용량 컬럼 제외)
+_SELECT_CHUNK_SQL = """
+SELECT a."id", a."writingRatio", a."detailedAnalysis",
+       a."gptResult"->>'detailedAnalysis' AS "gptDetail",
+       s."selfScoreCorrect", s."selfScoreTotal",
+       t."targetStudyMinutes", t."studyTimeMinutes", t."title" AS "taskTitle"
+FROM "AiAnalysis" a
+JOIN "TaskSubmission" s ON s."id" = a."submissionId"
+JOIN "Task" t ON t."id" = s."taskId"
+WHERE a."status" = 'COMPLETED'
+  AND a."writingRatio" IS NOT NULL
+  AND a."id" > $1
+  AND {filter}
+ORDER BY a."id"
+LIMIT $3
+"""
+
+_VERSION_FILTER = 'a."scoringVersion" IS DISTINCT FROM $2::int'
+_IDS_FILTER = 'a."id" IN (SELECT jsonb_array_elements_text($2::jsonb))'
+
+# 청크 전체를 UPDATE 1회로 반영
+_UPDATE_CHUNK_SQL = """
+UPDATE "AiAnalysis" AS a
+SET "densityScore" = v."densityScore",
+    "signalLight" = v."signalLight"::"SignalLight",
+    "detailedAnalysis" = v."detailedAnalysis",
+    "aiDraft" = v."aiDraft",
+    "scoringVersion" = v."scoringVersion",
+    "updatedAt" = CURRENT_TIMESTAMP
+FROM jsonb_to_recordset($1::jsonb) AS v(
+    "id" TEXT,
+    "densityScore" INTEGER,
+    "signalLight" TEXT,
+    "detailedAnalysis" TEXT,
+    "aiDraft" TEXT,
+    "scoringVersion" INTEGER
+)
+WHERE a."id" = v."id"
+"""
+
+
+def _gpt_detail_body(row: dict) -> str:
+    """점수 산출 줄을 제외한 GPT 상세 분석 본문"""
+    if row["gptDetail"] is not None:
+        return row["gptDetail"]
+    detail = row["detailedAnalysis"] or ""
+    if detail.startswith(SCORE_DETAIL_MARKER):
+        return detail.partition("\n\n")[2]
+    return detail
+
+
+def _rescore_row(row: dict, config: dict, version: int) -> dict:
+    inputs = SimpleNamespace(**row)
+    task_score = _calc_task_score(inputs)
+    writing_score = _calc_writing_score(min(100.0, float(row["writingRatio"])))
+    time_score = _calc_time_score(inputs)
+    density_score = _calc_density(task_score, writing_score, time_score, config)
+
+    score_line = _score_detail(task_score, writing_score, time_score, density_score, config)
+    body = _gpt_detail_body(row)
+    detail = f"{score_line}\n\n{body}" if body else score_line
+
+    signal = _signal_light(density_score, config)
+    return {
+        "id": row["id"],
+        "densityScore": density_score,
+        "signalLight": signal,
+        "detailedAnalysis": detail[:1000],
+        # 초안은 신호등/점수로 만들어지므로 함께 갱신
+        "aiDraft": build_ai_draft(signal, density_score, row["taskTitle"] or ""),
+        "scoringVersion": version,
+    }
+
+
+async def rescore_analyses(
+    db: Prisma,
+    version: int | None = None,
+    analysis_ids: list[str] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    """완료된 분석의 밀도 점수를 저장된 입력값으로 재계산합니다 (GPT 호출 없음).
+
+    analysis_ids가 없으면 scoringVersion이 다른 모든 분석을, 있으면 해당 분석만
+    버전과 관계없이 다시 계산합니다. 청크당 SELECT 1회 + UPDATE 1회.
+    """
+    version = version or SCORING_VERSION
+    config = _get_scoring_config(version)
+
+    if analysis_ids is not None:
+        if not analysis_ids:
+            return {"version": version, "scanned": 0, "changed": 0, "chunks": 0}
+        query = _SELECT_CHUNK_SQL.format(filter=_IDS_FILTER)
+        filter_param = json.dumps(analysis_ids)
+    else:
+        query = _SELECT_CHUNK_SQL.format(filter=_VERSION_FILTER)
+        filter_param = version
+
+    last_id = ""
+    scanned = changed = chunks = 0
+    while True:
+        rows = await db.query_raw(query, last_id, filter_param, chunk_size)
+        if not rows:
+            break
+
+        updates = [_rescore_row(row, config, version) for row in rows]
+        await db.execute_raw(_UPDATE_CHUNK_SQL, json.dumps(updates, ensure_ascii=False))
+
+        old_scores = {row["id"]: row for row in rows}
+        changed += sum(
+            1 for u in updates
+            if old_scores[u["id"]]["detailedAnalysis"] != u["detailedAnalysis"]
+        )
+        scanned += len(rows)
+        chunks += 1
+        last_id = rows[-1]["id"]
+        logger.info(f"Rescored chunk {chunks}: {scanned} analyses (v{version})")
+
+        if len(rows) < chunk_size:
+            break
+
+    return {"version": version, "scanned": scanned, "changed": changed, "chunks": chunks}
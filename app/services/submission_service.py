@@ -1,12 +1,16 @@
+import uuid
+
 from fastapi import HTTPException, status
 from prisma import Json, Prisma
 
+from app.core import pagination
 from app.schemas.submission import SelfScoreRequest, SubmissionCreateRequest
+from app.services.rescoring_service import rescore_analyses
 from app.services.wrong_answer_service import create_wrong_answer_sheets_for_submission
 
 
 def _normalize_answer(s: str | None) -> str:
-    """정답 비교용 정규화: 공백 제거 + 소문자"""
+    """정답 비교용 정규화: 공백 제거 + 소문자 (regrade_service 재채점도 이 함수로 비교)"""
     if s is None:
         return ""
     return s.strip().lower()
@@ -23,7 +27,7 @@ async def create_submission(
 
     task = await db.task.find_unique(
         where={"id": task_id},
-        include={"problems": True},
+        include={"problems": {"include": {"bank": True}}},
     )
     if not task:
         raise HTTPException(
@@ -60,107 +64,111 @@ async def create_submission(
                 detail={"code": "SUBMIT_004", "message": "맞은 문제 수가 전체 문제 수보다 클 수 없습니다"},
             )
 
-    submission = await db.tasksubmission.create(
-        data={
-            "task": {"connect": {"id": task_id}},
-            "mentee": {"connect": {"id": user.menteeProfile.id}},
-            "submissionType": data.submissionType,
-            "textContent": data.textContent,
-            "images": data.images or [],
-            "selfScoreCorrect": data.selfScoreCorrect,
-            "selfScoreTotal": data.selfScoreTotal,
-            "wrongQuestions": data.wrongQuestions or [],
-            "comment": data.comment,
-        }
-    )
-
-    # problemResponses 생성
+    # 문제 소속 검증과 자동 채점을 쓰기 전에 메모리에서 끝냄
+    problem_map = {p.id: p for p in (task.problems or [])}
     if has_problems:
-        task_problem_ids = {p.id for p in (task.problems or [])}
         for pr in data.problemResponses:
-            if pr.problemId not in task_problem_ids:
+            if pr.problemId not in problem_map:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail={"code": "SUBMIT_005", "message": f"문제 {pr.problemId}가 이 과제에 속하지 않습니다"},
                 )
-            pr_data: dict = {
-                "submission": {"connect": {"id": submission.id}},
-                "problem": {"connect": {"id": pr.problemId}},
-                "answer": pr.answer,
-                "textNote": pr.textNote,
-                "drawingUrl": pr.drawingUrl,
-            }
-            if pr.highlightData is not None:
-                pr_data["highlightData"] = Json(pr.highlightData)
-            await db.problemresponse.create(data=pr_data)
-
-    # 자동 채점: correctAnswer가 있는 문제의 정답 비교
-    if has_problems and task.problems:
-        problem_map = {p.id: p for p in task.problems}
-        auto_correct = 0
-        auto_total = 0
-        wrong_problems = []
-
-        for pr in data.problemResponses:
-            problem = problem_map.get(pr.problemId)
-            if not problem or not problem.correctAnswer:
-                continue
-
-            is_correct = (
-                _normalize_answer(pr.answer)
-                == _normalize_answer(problem.correctAnswer)
-            )
-            auto_total += 1
-            if is_correct:
-                auto_correct += 1
-            else:
-                wrong_problems.append({
-                    "problemId": problem.id,
-                    "problemNumber": problem.number,
-                    "problemTitle": problem.title,
-                    "originalAnswer": pr.answer,
-                    "correctAnswer": problem.correctAnswer,
-                })
-
-            await db.problemresponse.update_many(
-                where={
-                    "submissionId": submission.id,
-                    "problemId": pr.problemId,
-                },
-                data={"isCorrect": is_correct},
-            )
-
-        if auto_total > 0:
-            wrong_numbers = [wp["problemNumber"] for wp in wrong_problems]
-            await db.tasksubmission.update(
-                where={"id": submission.id},
-                data={
-                    "selfScoreCorrect": auto_correct,
-                    "selfScoreTotal": auto_total,
-                    "wrongQuestions": wrong_numbers,
-                },
-            )
-
-            if wrong_problems:
-                await create_wrong_answer_sheets_for_submission(
-                    db, submission.id, user.menteeProfile.id, wrong_problems
-                )
+    grading = _grade_responses(problem_map, data.problemResponses if has_problems else [])
+
+    submission_id = str(uuid.uuid4())
+    submission_data: dict = {
+        "id": submission_id,
+        "task": {"connect": {"id": task_id}},
+        "mentee": {"connect": {"id": user.menteeProfile.id}},
+        "submissionType": data.submissionType,
+        "textContent": data.textContent,
+        "images": data.images or [],
+        "selfScoreCorrect": data.selfScoreCorrect,
+        "selfScoreTotal": data.selfScoreTotal,
+        "wrongQuestions": data.wrongQuestions or [],
+        "comment": data.comment,
+        # 분석 행은 제출과 함께 원자적으로 생성하고, 큐 등록은 커밋 후 라우터에서
+        **({"analysis": {"create": {"status": "PENDING"}}} if data.autoAnalyze else {}),
+    }
+    # 자동 채점 가능한 문제가 있으면 자기채점 대신 채점 결과 사용
+    if grading["total"] > 0:
+        submission_data["selfScoreCorrect"] = grading["correct"]
+        submission_data["selfScoreTotal"] = grading["total"]
+        submission_data["wrongQuestions"] = [wp["problemNumber"] for wp in grading["wrongProblems"]]
+
+    response_rows = []
+    for pr, is_correct in zip(data.problemResponses or [], grading["isCorrect"]):
+        row: dict = {
+            "submissionId": submission_id,
+            "problemId": pr.problemId,
+            "answer": pr.answer,
+            "isCorrect": is_correct,
+            "textNote": pr.textNote,
+            "drawingUrl": pr.drawingUrl,
+        }
+        if pr.highlightData is not None:
+            row["highlightData"] = Json(pr.highlightData)
+        response_rows.append(row)
 
     # Task 업데이트: status + studyTimeMinutes
     task_update: dict = {"status": "SUBMITTED"}
     if data.studyTimeMinutes is not None:
         task_update["studyTimeMinutes"] = data.studyTimeMinutes
-    await db.task.update(where={"id": task_id}, data=task_update)
 
-    # 응답에 problemResponses 포함
+    # 제출 + 문제별 응답 + 오답 학습지 + 과제 상태를 한 트랜잭션으로 (중간 실패 시 전부 롤백)
+    async with db.tx() as tx:
+        await tx.tasksubmission.create(data=submission_data)
+        if response_rows:
+            await tx.problemresponse.create_many(data=response_rows)
+        await create_wrong_answer_sheets_for_submission(
+            tx, submission_id, user.menteeProfile.id, grading["wrongProblems"]
+        )
+        await tx.task.update(where={"id": task_id}, data=task_update)
+
+    # 응답에 problemResponses 포함 (task/analysis는 분석 큐 등록용)
     result = await db.tasksubmission.find_unique(
-        where={"id": submission.id},
-        include={"problemResponses": True},
+        where={"id": submission_id},
+        include={"problemResponses": True, "analysis": True, "task": True},
     )
     return result
 
 
-async def get_submissions(db: Prisma, task_id: str):
+def _grade_responses(problem_map: dict, responses: list) -> dict:
+    """correctAnswer가 있는 문제만 채점. isCorrect는 응답 순서대로 (채점 불가는 None)"""
+    is_correct_list: list[bool | None] = []
+    wrong_problems = []
+    correct = 0
+    total = 0
+    for pr in responses:
+        problem = problem_map.get(pr.problemId)
+        if not problem or not problem.bank.correctAnswer:
+            is_correct_list.append(None)
+            continue
+
+        is_correct = _normalize_answer(pr.answer) == _normalize_answer(problem.bank.correctAnswer)
+        is_correct_list.append(is_correct)
+        total += 1
+        if is_correct:
+            correct += 1
+        else:
+            wrong_problems.append({
+                "problemId": problem.id,
+                "problemNumber": problem.number,
+                "problemTitle": problem.bank.title,
+                "originalAnswer": pr.answer,
+                "correctAnswer": problem.bank.correctAnswer,
+            })
+    return {"isCorrect": is_correct_list, "correct": correct, "total": total, "wrongProblems": wrong_problems}
+
+
+async def get_submissions(
+    db: Prisma,
+    task_id: str,
+    cursor: str | None = None,
+    limit: int = pagination.DEFAULT_LIMIT,
+    with_total: bool = False,
+):
+    """제출 내역 최신순 커서 페이지. 반환: {items, nextCursor, total}"""
     task = await db.task.find_unique(where={"id": task_id})
     if not task:
         raise HTTPException(
@@ -168,10 +176,14 @@ async def get_submissions(db: Prisma, task_id: str):
             detail={"code": "TASK_002", "message": "할 일을 찾을 수 없습니다"},
         )
 
-    return await db.tasksubmission.find_many(
-        where={"taskId": task_id},
-        order={"submittedAt": "desc"},
+    return await pagination.paginate(
+        db.tasksubmission,
+        {"taskId": task_id},
+        "submittedAt",
+        cursor,
+        limit,
         include={"problemResponses": True},
+        with_total=with_total,
     )
 
 
@@ -204,6 +216,10 @@ async def update_self_score(
             "selfScoreTotal": data.selfScoreTotal,
             "wrongQuestions": data.wrongQuestions,
         },
-        include={"problemResponses": True},
+        include={"problemResponses": True, "analysis": True},
     )
+
+    # 자동 분석이 먼저 끝났으면 바뀐 자기채점으로 점수만 다시 계산 (GPT 재호출 없음)
+    if updated.analysis and updated.analysis.status == "COMPLETED":
+        await rescore_analyses(db, analysis_ids=[updated.analysis.id])
     return updated
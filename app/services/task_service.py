@@ -1,4 +1,9 @@
+import hashlib
+import json
+import logging
+import uuid
 from datetime import date, datetime, timedelta, timezone
+from typing import NamedTuple
 
 from fastapi import HTTPException, status
 from prisma import Json, Prisma
@@ -9,6 +14,9 @@ from app.schemas.task import (
     TaskProblemUpdateRequest,
     TaskUpdateRequest,
 )
+from app.services import regrade_service
+
+logger = logging.getLogger(__name__)
 
 DAY_MAP = {"MON": 0, "TUE": 1, "WED": 2, "THU": 3, "FRI": 4, "SAT": 5, "SUN": 6}
 
@@ -20,7 +28,8 @@ def _to_utc(d: date) -> datetime:
 def _build_task_data(data: TaskCreateRequest, mentee_id: str, task_date: date,
                      is_locked: bool, created_by: str, mentor_id: str | None) -> dict:
     return {
-        "mentee": {"connect": {"id": mentee_id}},
+        "id": str(uuid.uuid4()),
+        "menteeId": mentee_id,
         "date": _to_utc(task_date),
         "title": data.title,
         "goal": data.goal,
@@ -43,42 +52,115 @@ def _build_task_data(data: TaskCreateRequest, mentee_id: str, task_date: date,
     }
 
 
-def _get_repeat_dates(base_date: date, repeat_days: list[str]) -> list[date]:
-    """base_date가 속한 주(월~일)에서 repeat_days에 해당하는 날짜들을 반환 (base_date 제외)."""
-    monday = base_date - timedelta(days=base_date.weekday())
-    dates = []
-    for day_name in repeat_days:
-        offset = DAY_MAP.get(day_name)
-        if offset is None:
-            continue
-        d = monday + timedelta(days=offset)
-        if d != base_date:
-            dates.append(d)
-    return sorted(dates)
+# ===== 문제 =====
+# 문제 내용은 ProblemBank에 내용 해시를 ID로 한 번만 저장하고, TaskProblem은 할 일별 번호/순서만 갖는
+# 연결 행입니다. 같은 학습지를 여러 할 일/반복 회차/멘티에 배정해도 내용은 복사되지 않습니다.
+
+PROBLEMS_INCLUDE = {"order_by": {"displayOrder": "asc"}, "include": {"bank": True}}
+
 
+def _jsonb_text(value) -> str:
+    """Postgres jsonb::text와 같은 직렬화 (키는 길이순 → 바이트순, 구분자 ', ' / ': ')"""
+    if isinstance(value, dict):
+        keys = sorted(value, key=lambda k: (len(k.encode()), k.encode()))
+        return "{" + ", ".join(f"{_jsonb_text(k)}: {_jsonb_text(value[k])}" for k in keys) + "}"
+    if isinstance(value, list):
+        return "[" + ", ".join(_jsonb_text(v) for v in value) + "]"
+    return json.dumps(value, ensure_ascii=False)
 
-async def _create_problems_for_task(
-    db: Prisma, task_id: str, problems: list[TaskProblemCreateRequest]
+
+def problem_hash(title: str, content: str | None, options, correct_answer: str | None) -> str:
+    """ProblemBank ID. 마이그레이션의 sha256(jsonb_build_array(...)::text)와 같은 값입니다."""
+    canonical = _jsonb_text([title, content, options, correct_answer])
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _bank_row(title: str, content: str | None, options, correct_answer: str | None) -> dict:
+    row: dict = {
+        "id": problem_hash(title, content, options, correct_answer),
+        "title": title,
+        "content": content,
+        "correctAnswer": correct_answer,
+    }
+    if options is not None:
+        row["options"] = Json(options)
+    return row
+
+
+async def insert_problems(tx, problems_by_task: dict[str, list]) -> int:
+    """할 일별 문제를 create_many 2회로 저장하고 연결 행 수를 반환합니다.
+
+    problems는 TaskProblemCreateRequest/LessonProblemCreate이거나, 반복 회차처럼 이미 bankId가 있는
+    TaskProblem입니다. 이미 있는 내용은 건너뛰므로 ProblemBank에는 새 내용만 추가됩니다.
+    """
+    bank_rows: dict[str, dict] = {}
+    bank_ids: dict[int, str] = {}  # 같은 요청 객체를 여러 할 일에 쓰면 해시는 한 번만
+    problem_rows = []
+    for task_id, problems in problems_by_task.items():
+        for p in problems:
+            bank_id = getattr(p, "bankId", None) or bank_ids.get(id(p))
+            if not bank_id:
+                row = _bank_row(p.title, p.content, p.options, p.correctAnswer)
+                bank_id = bank_ids[id(p)] = row["id"]
+                bank_rows.setdefault(bank_id, row)
+            problem_rows.append({
+                "taskId": task_id,
+                "bankId": bank_id,
+                "number": p.number,
+                "displayOrder": p.displayOrder,
+            })
+
+    if bank_rows:
+        await tx.problembank.create_many(data=list(bank_rows.values()), skip_duplicates=True)
+    if problem_rows:
+        await tx.taskproblem.create_many(data=problem_rows)
+    return len(problem_rows)
+
+
+def problem_to_response(problem) -> dict:
+    """TaskProblem(+bank) → 문제 응답 dict"""
+    bank = problem.bank
+    return {
+        "id": problem.id,
+        "taskId": problem.taskId,
+        "number": problem.number,
+        "title": bank.title,
+        "content": bank.content,
+        "options": bank.options,
+        "correctAnswer": bank.correctAnswer,
+        "displayOrder": problem.displayOrder,
+    }
+
+
+async def create_tasks_with_problems(
+    db: Prisma, task_rows: list[dict], problems: list | None = None, recurrence: dict | None = None
 ):
-    for p in problems:
-        data: dict = {
-            "task": {"connect": {"id": task_id}},
-            "number": p.number,
-            "title": p.title,
-            "content": p.content,
-            "correctAnswer": p.correctAnswer,
-            "displayOrder": p.displayOrder,
-        }
-        if p.options is not None:
-            data["options"] = Json(p.options)
-        await db.taskproblem.create(data=data)
+    """할 일과 문제(, 반복 규칙)를 한 트랜잭션에서 create_many로 만들고 첫 할 일을 반환합니다.
+
+    ID를 미리 정해 두므로 문제 수와 관계없이 쿼리 수가 고정됩니다.
+    """
+    for row in task_rows:
+        row.setdefault("id", str(uuid.uuid4()))
+
+    async with db.tx() as tx:
+        # 원본 할 일이 규칙의 첫 회차이므로 규칙을 먼저 만듦
+        if recurrence:
+            await tx.recurrencerule.create(data=recurrence)
+        await tx.task.create_many(data=task_rows)
+        if problems:
+            await insert_problems(tx, {row["id"]: problems for row in task_rows})
+
+    return await db.task.find_unique(
+        where={"id": task_rows[0]["id"]},
+        include={"problems": PROBLEMS_INCLUDE},
+    )
 
 
 def _task_to_response(task) -> dict:
     """Task DB 객체를 응답 dict로 변환 (problems 포함)."""
     problems = []
     if hasattr(task, "problems") and task.problems:
-        problems = task.problems
+        problems = [problem_to_response(p) for p in task.problems]
     return {
         **{k: v for k, v in task.__dict__.items() if not k.startswith("_")},
         "problems": problems,
@@ -86,11 +168,213 @@ def _task_to_response(task) -> dict:
     }
 
 
+# ===== 반복 할 일 =====
+# 반복 할 일은 RecurrenceRule에 회차 템플릿(할 일 필드 + 문제 연결)을 저장하고, 날짜를 조회할 때(할 일
+# 목록, 플래너, 코칭센터 등) 조회 범위의 회차를 한 번에 생성합니다. 처음 만든 할 일도 규칙의 한 회차라
+# 지워도 규칙은 남습니다. 회차는 (규칙, 날짜) 유니크라 동시 조회에도 중복되지 않고, 삭제한 회차는
+# exceptDates에 남겨 다시 만들지 않습니다.
+
+# 회차로 복사하는 할 일 필드 (날짜/상태/공부 시간 등 회차별 값은 제외)
+_TEMPLATE_FIELDS = (
+    "createdByMentorId", "title", "goal", "subject", "abilityTag", "materialType", "materialId",
+    "materialUrl", "isLocked", "repeat", "repeatDays", "targetStudyMinutes", "memo", "tags",
+    "keyPoints", "content", "createdBy", "displayOrder",
+)
+
+
+class _TemplateProblem(NamedTuple):
+    """규칙 templateProblems의 한 항목 (insert_problems에 bankId가 있는 문제로 전달)"""
+    bankId: str
+    number: int
+    displayOrder: int
+
+
+# 모든 규칙 시작일보다 이른 날짜 (구간 전체 회차 생성용, 실제 시작은 규칙 startDate)
+_RULES_EPOCH = date(2000, 1, 1)
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def expand_recurrence(rule, start: date, end: date) -> list[date]:
+    """규칙의 [start, end] 구간 회차 날짜 (삭제된 회차 제외)"""
+    lo = max(start, _as_date(rule.startDate))
+    hi = min(end, _as_date(rule.endDate)) if rule.endDate else end
+    if lo > hi:
+        return []
+
+    weekdays = {DAY_MAP[d] for d in rule.weekdays if d in DAY_MAP}
+    skipped = {_as_date(d) for d in (rule.exceptDates or [])}
+
+    dates = []
+    for offset in range((hi - lo).days + 1):
+        d = lo + timedelta(days=offset)
+        if d.weekday() in weekdays and d not in skipped:
+            dates.append(d)
+    return dates
+
+
+def _template_problem(problem) -> dict:
+    """요청 문제(bankId 없음)는 내용 해시로 ProblemBank ID를 미리 구함 (같은 트랜잭션에서 저장)"""
+    bank_id = getattr(problem, "bankId", None) or problem_hash(
+        problem.title, problem.content, problem.options, problem.correctAnswer
+    )
+    return {"bankId": bank_id, "number": problem.number, "displayOrder": problem.displayOrder}
+
+
+def _build_recurrence_data(
+    task_row: dict, problems: list | None, weekdays: list[str], anchor: date, until: date | None = None
+) -> dict:
+    """task_row를 템플릿으로 하는 규칙. 원본 할 일 날짜가 속한 주 월요일부터 until(없으면 무기한)까지"""
+    return {
+        "id": str(uuid.uuid4()),
+        "menteeId": task_row["menteeId"],
+        "template": Json({k: task_row.get(k) for k in _TEMPLATE_FIELDS}),
+        "templateProblems": Json([_template_problem(p) for p in problems or []]),
+        "weekdays": [d for d in weekdays if d in DAY_MAP],
+        "startDate": _to_utc(anchor - timedelta(days=anchor.weekday())),
+        "endDate": _to_utc(until) if until else None,
+        "exceptDates": [],
+    }
+
+
+def _create_recurrence(task_row: dict, data: TaskCreateRequest, problems: list | None = None) -> dict | None:
+    """생성 요청에 반복 요일이 있으면 규칙을 만들고 원본 할 일을 첫 회차로 연결"""
+    if not data.repeat or not data.repeatDays:
+        return None
+    recurrence = _build_recurrence_data(task_row, problems, data.repeatDays, data.date, data.repeatUntil)
+    task_row["recurrenceRuleId"] = recurrence["id"]
+    return recurrence
+
+
+def _occurrence_row(rule, d: date) -> dict:
+    return {
+        **rule.template,
+        "id": str(uuid.uuid4()),
+        "menteeId": rule.menteeId,
+        "date": _to_utc(d),
+        "recurrenceRuleId": rule.id,
+    }
+
+
+async def materialize_recurrences(db: Prisma, mentee_id: str, start: date, end: date | None = None) -> int:
+    """[start, end] 구간에 아직 없는 반복 회차를 일괄 생성하고 생성한 수를 반환합니다.
+
+    반복 규칙이 없거나 회차가 모두 있으면 쿼리 1회로 끝납니다.
+    """
+    end = end or start
+    rules = await db.recurrencerule.find_many(
+        where={
+            "menteeId": mentee_id,
+            "startDate": {"lte": _to_utc(end)},
+            "OR": [{"endDate": None}, {"endDate": {"gte": _to_utc(start)}}],
+        },
+        include={
+            "occurrences": {"where": {"date": {"gte": _to_utc(start), "lte": _to_utc(end)}}},
+        },
+    )
+
+    missing: list[tuple] = []
+    for rule in rules:
+        existing = {_as_date(t.date) for t in (rule.occurrences or [])}
+        missing += [(rule, d) for d in expand_recurrence(rule, start, end) if d not in existing]
+    if not missing:
+        return 0
+
+    # 회차에는 템플릿 문제의 연결 행만 복사 (내용은 ProblemBank 공유)
+    task_rows = []
+    problems_by_task: dict[str, list] = {}
+    for rule, d in missing:
+        row = _occurrence_row(rule, d)
+        task_rows.append(row)
+        problems_by_task[row["id"]] = [_TemplateProblem(**p) for p in rule.templateProblems or []]
+
+    async with db.tx() as tx:
+        # 동시에 같은 구간을 조회한 요청이 먼저 만든 회차는 건너뜀 (규칙, 날짜 유니크)
+        created = await tx.task.create_many(data=task_rows, skip_duplicates=True)
+        task_ids = [row["id"] for row in task_rows]
+        if created < len(task_rows):
+            task_ids = [t.id for t in await tx.task.find_many(where={"id": {"in": task_ids}})]
+        await insert_problems(tx, {task_id: problems_by_task[task_id] for task_id in task_ids})
+
+    logger.info(f"Materialized {len(task_ids)} recurring tasks for mentee {mentee_id} ({start}~{end})")
+    return len(task_ids)
+
+
+async def materialize_through_week(db: Prisma, mentee_id: str, today: date | None = None) -> int:
+    """전체 할 일을 셀 때(완수율, 과목별 통계): 각 규칙 시작일부터 이번 주 일요일까지 회차를 생성합니다.
+
+    반복을 회차로 복사하던 때와 같이 이번 주 회차까지 통계에 포함됩니다.
+    """
+    today = today or date.today()
+    week_end = today + timedelta(days=6 - today.weekday())
+    return await materialize_recurrences(db, mentee_id, _RULES_EPOCH, week_end)
+
+
+async def _apply_repeat_change(db: Prisma, task, update_data: dict):
+    """할 일의 repeat/repeatDays 수정을 반복 규칙에 반영합니다.
+
+    - 규칙이 없고 반복 요일이 생기면: 이 할 일을 첫 회차로 하는 규칙 생성
+    - 반복을 끄면: 규칙을 오늘로 종료
+    - 요일을 바꾸면: 규칙 요일 변경 (중지했던 규칙이면 다시 무기한)
+    이미 만들어진 내일 이후 회차 중 제출이 없고 더 이상 규칙에 맞지 않는 것은 삭제합니다.
+    """
+    repeat = update_data.get("repeat", task.repeat)
+    weekdays = [d for d in (update_data.get("repeatDays", task.repeatDays) or []) if d in DAY_MAP]
+    active = bool(repeat and weekdays)
+    if active and "repeatDays" in update_data:
+        update_data["repeatDays"] = weekdays
+
+    if not task.recurrenceRuleId:
+        if not active:
+            return
+        problems = await db.taskproblem.find_many(where={"taskId": task.id})
+        task_row = {**task.__dict__, **update_data, "repeat": True}
+        recurrence = _build_recurrence_data(task_row, problems, weekdays, _as_date(task.date))
+        async with db.tx() as tx:
+            await tx.recurrencerule.create(data=recurrence)
+            await tx.task.update(where={"id": task.id}, data={"recurrenceRuleId": recurrence["id"]})
+        return
+
+    rule = await db.recurrencerule.find_unique(where={"id": task.recurrenceRuleId})
+    if not rule:
+        return
+    today = date.today()
+    rule_data: dict = {
+        "template": Json({**rule.template, "repeat": active, "repeatDays": weekdays if active else rule.weekdays}),
+    }
+    if active:
+        rule_data["weekdays"] = weekdays
+        if not rule.template.get("repeat", True):
+            rule_data["endDate"] = None  # 중지했던 반복을 다시 켬
+    else:
+        rule_data["endDate"] = _to_utc(today)
+
+    future = await db.task.find_many(
+        where={
+            "recurrenceRuleId": rule.id,
+            "id": {"not": task.id},
+            "date": {"gt": _to_utc(today)},
+            "submissions": {"none": {}},
+            "feedbackItems": {"none": {}},
+        },
+    )
+    kept = {DAY_MAP[d] for d in weekdays} if active else set()
+    stale_ids = [t.id for t in future if _as_date(t.date).weekday() not in kept]
+
+    async with db.tx() as tx:
+        await tx.recurrencerule.update(where={"id": rule.id}, data=rule_data)
+        if stale_ids:
+            await tx.task.delete_many(where={"id": {"in": stale_ids}})
+
+
 async def get_tasks(db: Prisma, mentee_id: str, task_date: date):
+    await materialize_recurrences(db, mentee_id, task_date)
     tasks = await db.task.find_many(
         where={"menteeId": mentee_id, "date": _to_utc(task_date)},
         order={"displayOrder": "asc"},
-        include={"problems": {"order_by": {"displayOrder": "asc"}}},
+        include={"problems": PROBLEMS_INCLUDE},
     )
     return [_task_to_response(t) for t in tasks]
 
@@ -115,14 +399,10 @@ async def create_task(db: Prisma, user, data: TaskCreateRequest):
             detail={"code": "PERM_001", "message": "접근 권한이 없습니다"},
         )
 
-    task_data = _build_task_data(data, mentee_id, data.date, False, "MENTEE", mentor_id)
-    task = await db.task.create(data=task_data, include={"problems": True})
-
-    if data.repeat and data.repeatDays:
-        for rd in _get_repeat_dates(data.date, data.repeatDays):
-            rd_data = _build_task_data(data, mentee_id, rd, False, "MENTEE", mentor_id)
-            await db.task.create(data=rd_data)
-
+    # 반복 요일은 규칙으로만 저장하고 회차는 조회 시 생성
+    task_row = _build_task_data(data, mentee_id, data.date, False, "MENTEE", mentor_id)
+    recurrence = _create_recurrence(task_row, data)
+    task = await create_tasks_with_problems(db, [task_row], recurrence=recurrence)
     return _task_to_response(task)
 
 
@@ -144,23 +424,10 @@ async def create_task_by_mentor(
             detail={"code": "PERM_002", "message": "담당 멘티의 데이터만 접근 가능합니다"},
         )
 
-    task_data = _build_task_data(data, mentee_id, data.date, True, "MENTOR", user.mentorProfile.id)
-    task = await db.task.create(data=task_data, include={"problems": True})
-
-    if data.problems:
-        await _create_problems_for_task(db, task.id, data.problems)
-        task = await db.task.find_unique(
-            where={"id": task.id},
-            include={"problems": {"order_by": {"displayOrder": "asc"}}},
-        )
-
-    if data.repeat and data.repeatDays:
-        for rd in _get_repeat_dates(data.date, data.repeatDays):
-            rd_data = _build_task_data(data, mentee_id, rd, True, "MENTOR", user.mentorProfile.id)
-            repeat_task = await db.task.create(data=rd_data)
-            if data.problems:
-                await _create_problems_for_task(db, repeat_task.id, data.problems)
-
+    # 반복 요일은 규칙으로만 저장하고 회차(문제 포함)는 조회 시 생성
+    task_row = _build_task_data(data, mentee_id, data.date, True, "MENTOR", user.mentorProfile.id)
+    recurrence = _create_recurrence(task_row, data, data.problems)
+    task = await create_tasks_with_problems(db, [task_row], data.problems, recurrence)
     return _task_to_response(task)
 
 
@@ -178,7 +445,7 @@ async def get_task_detail(db: Prisma, task_id: str):
     task = await db.task.find_unique(
         where={"id": task_id},
         include={
-            "problems": {"order_by": {"displayOrder": "asc"}},
+            "problems": PROBLEMS_INCLUDE,
         },
     )
     if not task:
@@ -227,10 +494,13 @@ async def update_task(db: Prisma, user, task_id: str, data: TaskUpdateRequest):
     if not update_data:
         return await get_task_detail(db, task_id)
 
+    if "repeat" in update_data or "repeatDays" in update_data:
+        await _apply_repeat_change(db, task, update_data)
+
     updated = await db.task.update(
         where={"id": task_id},
         data=update_data,
-        include={"problems": {"order_by": {"displayOrder": "asc"}}},
+        include={"problems": PROBLEMS_INCLUDE},
     )
     return _task_to_response(updated)
 
@@ -269,6 +539,12 @@ async def delete_task(db: Prisma, user, task_id: str):
             detail={"code": "PERM_001", "message": "접근 권한이 없습니다"},
         )
 
+    if task.recurrenceRuleId:
+        # 삭제한 반복 회차는 다시 생성하지 않음
+        await db.recurrencerule.update(
+            where={"id": task.recurrenceRuleId},
+            data={"exceptDates": {"push": [task.date]}},
+        )
     await db.task.delete(where={"id": task_id})
 
 
@@ -284,7 +560,7 @@ async def update_study_time(db: Prisma, user, task_id: str, minutes: int):
     updated = await db.task.update(
         where={"id": task_id},
         data={"studyTimeMinutes": minutes},
-        include={"problems": {"order_by": {"displayOrder": "asc"}}},
+        include={"problems": PROBLEMS_INCLUDE},
     )
     return _task_to_response(updated)
 
@@ -301,7 +577,7 @@ async def toggle_bookmark(db: Prisma, user, task_id: str, is_bookmarked: bool):
     updated = await db.task.update(
         where={"id": task_id},
         data={"isBookmarked": is_bookmarked},
-        include={"problems": {"order_by": {"displayOrder": "asc"}}},
+        include={"problems": PROBLEMS_INCLUDE},
     )
     return _task_to_response(updated)
 
@@ -328,18 +604,19 @@ async def _verify_mentor_for_task(db: Prisma, user, task_id: str):
 
 async def add_problem(db: Prisma, user, task_id: str, data: TaskProblemCreateRequest):
     await _verify_mentor_for_task(db, user, task_id)
-    create_data: dict = {
-        "task": {"connect": {"id": task_id}},
-        "number": data.number,
-        "title": data.title,
-        "content": data.content,
-        "correctAnswer": data.correctAnswer,
-        "displayOrder": data.displayOrder,
-    }
-    if data.options is not None:
-        create_data["options"] = Json(data.options)
-    problem = await db.taskproblem.create(data=create_data)
-    return problem
+    bank = _bank_row(data.title, data.content, data.options, data.correctAnswer)
+    async with db.tx() as tx:
+        await tx.problembank.create_many(data=[bank], skip_duplicates=True)
+        problem = await tx.taskproblem.create(
+            data={
+                "task": {"connect": {"id": task_id}},
+                "bank": {"connect": {"id": bank["id"]}},
+                "number": data.number,
+                "displayOrder": data.displayOrder,
+            },
+            include={"bank": True},
+        )
+    return problem_to_response(problem)
 
 
 async def update_problem(
@@ -347,7 +624,8 @@ async def update_problem(
 ):
     await _verify_mentor_for_task(db, user, task_id)
     problem = await db.taskproblem.find_first(
-        where={"id": problem_id, "taskId": task_id}
+        where={"id": problem_id, "taskId": task_id},
+        include={"bank": True},
     )
     if not problem:
         raise HTTPException(
@@ -355,9 +633,32 @@ async def update_problem(
             detail={"code": "PROBLEM_001", "message": "문제를 찾을 수 없습니다"},
         )
     update_data = data.model_dump(exclude_unset=True)
-    if not update_data:
-        return problem
-    return await db.taskproblem.update(where={"id": problem_id}, data=update_data)
+    content = {k: update_data.pop(k) for k in ("title", "content", "options", "correctAnswer") if k in update_data}
+    if not update_data and not content:
+        return problem_to_response(problem)
+
+    current = problem.bank
+    # ProblemBank 행은 다른 할 일과 공유하므로 수정하지 않고, 바뀐 내용의 행으로 연결만 바꿈 (copy-on-write)
+    async with db.tx() as tx:
+        if content:
+            bank = _bank_row(
+                content.get("title") or current.title,
+                content.get("content", current.content),
+                content.get("options", current.options),
+                content.get("correctAnswer", current.correctAnswer),
+            )
+            if bank["id"] != problem.bankId:
+                await tx.problembank.create_many(data=[bank], skip_duplicates=True)
+                update_data["bank"] = {"connect": {"id": bank["id"]}}
+        if update_data:
+            problem = await tx.taskproblem.update(
+                where={"id": problem_id}, data=update_data, include={"bank": True}
+            )
+
+    # 정답이 바뀌면 기존 제출의 채점/오답 학습지/밀도 점수를 일괄 갱신
+    if "correctAnswer" in content and content["correctAnswer"] != current.correctAnswer:
+        await regrade_service.regrade(db, problem_ids=[problem_id])
+    return problem_to_response(problem)
 
 
 async def delete_problem(db: Prisma, user, task_id: str, problem_id: str):
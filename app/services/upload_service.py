@@ -44,7 +44,7 @@ def _is_mock_mode() -> bool:
     return settings.AWS_ACCESS_KEY_ID == "test" or settings.APP_ENV == "test"
 
 
-def generate_presigned_url(key: str) -> str:
+def generate_presigned_url(key: str, expires_in: int | None = None) -> str:
     if _is_mock_mode():
         return f"{_s3_url(key)}?mock-presigned=true"
 
@@ -52,7 +52,7 @@ def generate_presigned_url(key: str) -> str:
     return s3.generate_presigned_url(
         "get_object",
         Params={"Bucket": settings.S3_BUCKET_NAME, "Key": key},
-        ExpiresIn=settings.PRESIGNED_URL_EXPIRE_SECONDS,
+        ExpiresIn=expires_in or settings.PRESIGNED_URL_EXPIRE_SECONDS,
     )
 
 
@@ -1,18 +1,25 @@
 from fastapi import HTTPException, status
 from prisma import Prisma
 
+from app.core import pagination
 
-async def get_wrong_answer_sheets(db: Prisma, mentee_id: str, submission_id: str | None = None):
-    """오답 학습지 목록 조회"""
+
+async def get_wrong_answer_sheets(
+    db: Prisma,
+    mentee_id: str,
+    submission_id: str | None = None,
+    cursor: str | None = None,
+    limit: int = pagination.DEFAULT_LIMIT,
+    with_total: bool = False,
+):
+    """오답 학습지 최신순 커서 페이지. 반환: {items, nextCursor, total}"""
     where: dict = {"menteeId": mentee_id}
     if submission_id:
         where["submissionId"] = submission_id
 
-    sheets = await db.wronganswersheet.find_many(
-        where=where,
-        order={"createdAt": "desc"},
+    return await pagination.paginate(
+        db.wronganswersheet, where, "createdAt", cursor, limit, with_total=with_total
     )
-    return sheets
 
 
 async def get_wrong_answer_sheet(db: Prisma, sheet_id: str):
@@ -59,10 +66,12 @@ async def complete_wrong_answer_sheet(db: Prisma, user, sheet_id: str, is_comple
 async def create_wrong_answer_sheets_for_submission(
     db: Prisma, submission_id: str, mentee_id: str, wrong_problems: list[dict]
 ):
-    """제출물의 틀린 문제에 대한 오답 학습지 생성"""
-    for wp in wrong_problems:
-        await db.wronganswersheet.create(
-            data={
+    """제출물의 틀린 문제에 대한 오답 학습지 일괄 생성 (트랜잭션 클라이언트도 받음)"""
+    if not wrong_problems:
+        return
+    await db.wronganswersheet.create_many(
+        data=[
+            {
                 "submissionId": submission_id,
                 "menteeId": mentee_id,
                 "problemId": wp["problemId"],
@@ -73,4 +82,6 @@ async def create_wrong_answer_sheets_for_submission(
                 "explanation": wp.get("explanation"),
                 "relatedConcepts": wp.get("relatedConcepts", []),
             }
-        )
+            for wp in wrong_problems
+        ]
+    )
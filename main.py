@@ -6,6 +6,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings as app_settings
 from app.core.deps import db
 from app.routers import (
+    admin,
     analysis,
     auth,
     coaching,
@@ -23,12 +24,15 @@ from app.routers import (
     uploads,
     wrong_answers,
 )
+from app.services import analysis_queue_service
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await db.connect()
+    await analysis_queue_service.start(db)
     yield
+    await analysis_queue_service.stop()
     await db.disconnect()
 
 
@@ -64,6 +68,7 @@ app.include_router(settings.router)
 app.include_router(wrong_answers.router)
 app.include_router(my.router)
 app.include_router(lessons.router)
+app.include_router(admin.router)
 
 
 @app.get("/health")
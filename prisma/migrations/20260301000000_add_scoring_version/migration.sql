@@ -0,0 +1,9 @@
+-- AlterTable
+ALTER TABLE "AiAnalysis" ADD COLUMN "gptResult" JSONB,
+ADD COLUMN "scoringVersion" INTEGER;
+
+-- Backfill: 기존 분석은 모두 v1 기준으로 산출됨
+UPDATE "AiAnalysis" SET "scoringVersion" = 1 WHERE "status" = 'COMPLETED' AND "densityScore" IS NOT NULL;
+
+-- CreateIndex
+CREATE INDEX "AiAnalysis_status_scoringVersion_idx" ON "AiAnalysis"("status", "scoringVersion");
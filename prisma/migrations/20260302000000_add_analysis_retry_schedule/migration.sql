@@ -0,0 +1,8 @@
+-- AlterTable
+ALTER TABLE "AiAnalysis" ADD COLUMN "nextRetryAt" TIMESTAMP(3);
+
+-- CreateIndex
+CREATE INDEX "AiAnalysis_status_updatedAt_idx" ON "AiAnalysis"("status", "updatedAt");
+
+-- CreateIndex
+CREATE INDEX "AiAnalysis_status_nextRetryAt_idx" ON "AiAnalysis"("status", "nextRetryAt");
@@ -0,0 +1,5 @@
+-- AlterTable
+ALTER TABLE "AiAnalysis" ADD COLUMN "isDegraded" BOOLEAN NOT NULL DEFAULT false;
+
+-- CreateIndex
+CREATE INDEX "AiAnalysis_isDegraded_nextRetryAt_idx" ON "AiAnalysis"("isDegraded", "nextRetryAt");
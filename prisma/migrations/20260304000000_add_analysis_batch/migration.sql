@@ -0,0 +1,30 @@
+-- CreateEnum
+CREATE TYPE "AnalysisBatchStatus" AS ENUM ('SUBMITTING', 'SUBMITTED', 'COMPLETED', 'FAILED');
+
+-- AlterTable
+ALTER TABLE "AiAnalysis" ADD COLUMN "batchMode" BOOLEAN NOT NULL DEFAULT false,
+ADD COLUMN "batchId" TEXT;
+
+-- CreateTable
+CREATE TABLE "AnalysisBatch" (
+    "id" TEXT NOT NULL,
+    "backend" TEXT NOT NULL,
+    "providerBatchId" TEXT,
+    "status" "AnalysisBatchStatus" NOT NULL DEFAULT 'SUBMITTING',
+    "itemCount" INTEGER NOT NULL,
+    "succeededCount" INTEGER NOT NULL DEFAULT 0,
+    "failedCount" INTEGER NOT NULL DEFAULT 0,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "completedAt" TIMESTAMP(3),
+
+    CONSTRAINT "AnalysisBatch_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE INDEX "AiAnalysis_batchMode_batchId_idx" ON "AiAnalysis"("batchMode", "batchId");
+
+-- CreateIndex
+CREATE INDEX "AiAnalysis_batchId_idx" ON "AiAnalysis"("batchId");
+
+-- CreateIndex
+CREATE INDEX "AnalysisBatch_status_idx" ON "AnalysisBatch"("status");
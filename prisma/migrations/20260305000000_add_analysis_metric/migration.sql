@@ -0,0 +1,33 @@
+-- CreateTable
+CREATE TABLE "AnalysisMetric" (
+    "id" TEXT NOT NULL,
+    "analysisId" TEXT NOT NULL,
+    "subject" "Subject",
+    "mode" TEXT NOT NULL,
+    "outcome" TEXT NOT NULL,
+    "model" TEXT,
+    "loadMs" INTEGER,
+    "presignMs" INTEGER,
+    "gptMs" INTEGER,
+    "parseMs" INTEGER,
+    "writeMs" INTEGER,
+    "totalMs" INTEGER NOT NULL,
+    "promptTokens" INTEGER,
+    "completionTokens" INTEGER,
+    "costUsd" DOUBLE PRECISION,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "AnalysisMetric_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE INDEX "AnalysisMetric_createdAt_idx" ON "AnalysisMetric"("createdAt");
+
+-- CreateIndex
+CREATE INDEX "AnalysisMetric_subject_createdAt_idx" ON "AnalysisMetric"("subject", "createdAt");
+
+-- CreateIndex
+CREATE INDEX "AnalysisMetric_analysisId_idx" ON "AnalysisMetric"("analysisId");
+
+-- AddForeignKey
+ALTER TABLE "AnalysisMetric" ADD CONSTRAINT "AnalysisMetric_analysisId_fkey" FOREIGN KEY ("analysisId") REFERENCES "AiAnalysis"("id") ON DELETE CASCADE ON UPDATE CASCADE;
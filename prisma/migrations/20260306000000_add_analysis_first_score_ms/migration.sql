@@ -0,0 +1,2 @@
+-- AlterTable
+ALTER TABLE "AnalysisMetric" ADD COLUMN "firstScoreMs" INTEGER;
@@ -0,0 +1,3 @@
+-- AlterTable
+ALTER TABLE "AnalysisMetric" ADD COLUMN "modelTier" TEXT,
+ADD COLUMN "escalated" BOOLEAN NOT NULL DEFAULT false;
@@ -0,0 +1,4 @@
+-- AlterTable
+ALTER TABLE "AiAnalysis" ADD COLUMN "aiDraft" TEXT,
+ADD COLUMN "recommendations" JSONB,
+ADD COLUMN "recommendationsVersion" TEXT;
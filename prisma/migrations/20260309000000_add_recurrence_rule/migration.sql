@@ -0,0 +1,36 @@
+-- AlterTable
+ALTER TABLE "Task" ADD COLUMN "recurrenceRuleId" TEXT;
+
+-- CreateTable
+CREATE TABLE "RecurrenceRule" (
+    "id" TEXT NOT NULL,
+    "menteeId" TEXT NOT NULL,
+    "templateTaskId" TEXT NOT NULL,
+    "weekdays" TEXT[],
+    "anchorDate" DATE NOT NULL,
+    "startDate" DATE NOT NULL,
+    "endDate" DATE,
+    "exceptDates" DATE[],
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL,
+
+    CONSTRAINT "RecurrenceRule_pkey" PRIMARY KEY ("id")
+);
+
+-- CreateIndex
+CREATE UNIQUE INDEX "Task_recurrenceRuleId_date_key" ON "Task"("recurrenceRuleId", "date");
+
+-- CreateIndex
+CREATE UNIQUE INDEX "RecurrenceRule_templateTaskId_key" ON "RecurrenceRule"("templateTaskId");
+
+-- CreateIndex
+CREATE INDEX "RecurrenceRule_menteeId_startDate_idx" ON "RecurrenceRule"("menteeId", "startDate");
+
+-- AddForeignKey
+ALTER TABLE "Task" ADD CONSTRAINT "Task_recurrenceRuleId_fkey" FOREIGN KEY ("recurrenceRuleId") REFERENCES "RecurrenceRule"("id") ON DELETE SET NULL ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "RecurrenceRule" ADD CONSTRAINT "RecurrenceRule_menteeId_fkey" FOREIGN KEY ("menteeId") REFERENCES "MenteeProfile"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE "RecurrenceRule" ADD CONSTRAINT "RecurrenceRule_templateTaskId_fkey" FOREIGN KEY ("templateTaskId") REFERENCES "Task"("id") ON DELETE CASCADE ON UPDATE CASCADE;
@@ -0,0 +1,37 @@
+-- CreateTable
+CREATE TABLE "ProblemBank" (
+    "id" TEXT NOT NULL,
+    "title" TEXT NOT NULL,
+    "content" TEXT,
+    "options" JSONB,
+    "correctAnswer" TEXT,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "ProblemBank_pkey" PRIMARY KEY ("id")
+);
+
+-- 기존 문제 내용을 해시로 묶어 ProblemBank로 옮김 (task_service.problem_hash와 같은 해시)
+ALTER TABLE "TaskProblem" ADD COLUMN "bankId" TEXT;
+
+UPDATE "TaskProblem"
+SET "bankId" = encode(sha256(convert_to(
+    jsonb_build_array("title", "content", "options", "correctAnswer")::text, 'UTF8'
+)), 'hex');
+
+INSERT INTO "ProblemBank" ("id", "title", "content", "options", "correctAnswer", "createdAt")
+SELECT DISTINCT ON ("bankId") "bankId", "title", "content", "options", "correctAnswer", "createdAt"
+FROM "TaskProblem"
+ORDER BY "bankId", "createdAt";
+
+-- AlterTable
+ALTER TABLE "TaskProblem" ALTER COLUMN "bankId" SET NOT NULL,
+DROP COLUMN "title",
+DROP COLUMN "content",
+DROP COLUMN "options",
+DROP COLUMN "correctAnswer";
+
+-- CreateIndex
+CREATE INDEX "TaskProblem_bankId_idx" ON "TaskProblem"("bankId");
+
+-- AddForeignKey
+ALTER TABLE "TaskProblem" ADD CONSTRAINT "TaskProblem_bankId_fkey" FOREIGN KEY ("bankId") REFERENCES "ProblemBank"("id") ON DELETE RESTRICT ON UPDATE CASCADE;
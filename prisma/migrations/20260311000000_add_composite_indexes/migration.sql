@@ -0,0 +1,35 @@
+-- CreateIndex
+CREATE INDEX "Task_menteeId_date_idx" ON "Task"("menteeId", "date");
+
+-- CreateIndex
+CREATE INDEX "Task_menteeId_subject_idx" ON "Task"("menteeId", "subject");
+
+-- CreateIndex
+CREATE INDEX "TaskSubmission_menteeId_submittedAt_idx" ON "TaskSubmission"("menteeId", "submittedAt");
+
+-- CreateIndex
+CREATE INDEX "TaskSubmission_taskId_submittedAt_idx" ON "TaskSubmission"("taskId", "submittedAt");
+
+-- CreateIndex
+CREATE INDEX "ProblemResponse_problemId_idx" ON "ProblemResponse"("problemId");
+
+-- CreateIndex
+CREATE INDEX "WrongAnswerSheet_menteeId_createdAt_idx" ON "WrongAnswerSheet"("menteeId", "createdAt");
+
+-- CreateIndex
+CREATE INDEX "Feedback_menteeId_date_idx" ON "Feedback"("menteeId", "date");
+
+-- CreateIndex
+CREATE INDEX "Feedback_menteeId_sentAt_idx" ON "Feedback"("menteeId", "sentAt");
+
+-- CreateIndex
+CREATE INDEX "Feedback_mentorId_date_idx" ON "Feedback"("mentorId", "date");
+
+-- CreateIndex
+CREATE INDEX "DailyComment_menteeId_date_idx" ON "DailyComment"("menteeId", "date");
+
+-- CreateIndex
+CREATE INDEX "DailyComment_menteeId_createdAt_idx" ON "DailyComment"("menteeId", "createdAt");
+
+-- CreateIndex
+CREATE INDEX "Material_subject_createdAt_idx" ON "Material"("subject", "createdAt");
@@ -0,0 +1,57 @@
+-- 반복 규칙의 템플릿을 원본 할 일에서 분리 (원본 할 일 삭제 시 규칙이 함께 지워지지 않도록)
+
+-- AlterTable
+ALTER TABLE "RecurrenceRule" ADD COLUMN "template" JSONB,
+ADD COLUMN "templateProblems" JSONB;
+
+-- 기존 템플릿 할 일의 필드/문제 연결을 규칙으로 복사
+UPDATE "RecurrenceRule" AS r
+SET "template" = jsonb_build_object(
+        'createdByMentorId', t."createdByMentorId",
+        'title', t."title",
+        'goal', t."goal",
+        'subject', t."subject",
+        'abilityTag', t."abilityTag",
+        'materialType', t."materialType",
+        'materialId', t."materialId",
+        'materialUrl', t."materialUrl",
+        'isLocked', t."isLocked",
+        'repeat', t."repeat",
+        'repeatDays', to_jsonb(COALESCE(t."repeatDays", '{}')),
+        'targetStudyMinutes', t."targetStudyMinutes",
+        'memo', t."memo",
+        'tags', to_jsonb(COALESCE(t."tags", '{}')),
+        'keyPoints', t."keyPoints",
+        'content', t."content",
+        'createdBy', t."createdBy",
+        'displayOrder', t."displayOrder"
+    ),
+    "templateProblems" = COALESCE((
+        SELECT jsonb_agg(
+                   jsonb_build_object('bankId', tp."bankId", 'number', tp."number", 'displayOrder', tp."displayOrder")
+                   ORDER BY tp."displayOrder", tp."number"
+               )
+        FROM "TaskProblem" tp
+        WHERE tp."taskId" = t."id"
+    ), '[]'::jsonb)
+FROM "Task" t
+WHERE t."id" = r."templateTaskId";
+
+-- 원본 할 일은 규칙의 첫 회차로 연결 (템플릿 날짜는 회차 생성에서 제외돼 있었으므로 (규칙, 날짜) 충돌 없음)
+UPDATE "Task" AS t
+SET "recurrenceRuleId" = r."id"
+FROM "RecurrenceRule" r
+WHERE t."id" = r."templateTaskId" AND t."recurrenceRuleId" IS NULL;
+
+ALTER TABLE "RecurrenceRule" ALTER COLUMN "template" SET NOT NULL,
+ALTER COLUMN "templateProblems" SET NOT NULL;
+
+-- DropForeignKey
+ALTER TABLE "RecurrenceRule" DROP CONSTRAINT "RecurrenceRule_templateTaskId_fkey";
+
+-- DropIndex
+DROP INDEX "RecurrenceRule_templateTaskId_key";
+
+-- AlterTable
+ALTER TABLE "RecurrenceRule" DROP COLUMN "templateTaskId",
+DROP COLUMN "anchorDate";
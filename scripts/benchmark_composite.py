@@ -0,0 +1,128 @@
+"""저장된 제출물로 이미지 합성(타일링) 효과를 오프라인 측정.
+
+기본은 이미지 크기만으로 입력 토큰을 비교하고, --call을 주면 개별/합성 두 방식으로 실제 분석을
+요청해 지연 시간, 실제 토큰, 필기율/신호등 일치율을 비교합니다.
+
+사용법: python -m scripts.benchmark_composite [--subject MATH] [--limit 50] [--call]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+
+from prisma import Prisma
+
+from app.core.config import settings
+from app.core.metrics import StageTimer
+from app.services import analysis_service, image_composite_service, task_service
+
+
+def _density(task, submission, writing_ratio: float) -> tuple[int, str]:
+    score = analysis_service._calc_density(
+        analysis_service._calc_task_score(submission),
+        analysis_service._calc_writing_score(min(writing_ratio, 100.0)),
+        analysis_service._calc_time_score(task),
+    )
+    return score, analysis_service._signal_light(score)
+
+
+async def _analyze(task, submission, composite: bool) -> tuple[dict, StageTimer]:
+    # 합성 여부는 과목 토글로 결정되므로 실행 동안만 바꿔 끼움
+    original = settings.ANALYSIS_COMPOSITE_SUBJECTS
+    settings.ANALYSIS_COMPOSITE_SUBJECTS = task.subject if composite else ""
+    try:
+        timer = StageTimer()
+        result = await analysis_service._request_gpt_analysis(task, submission, timer)
+        return result, timer
+    finally:
+        settings.ANALYSIS_COMPOSITE_SUBJECTS = original
+
+
+async def main(subject: str | None, limit: int, call: bool):
+    db = Prisma()
+    await db.connect()
+    try:
+        where: dict = {"images": {"isEmpty": False}}
+        if subject:
+            where["task"] = {"is": {"subject": subject}}
+        submissions = await db.tasksubmission.find_many(
+            where=where,
+            include={"task": {"include": {"problems": task_service.PROBLEMS_INCLUDE}}, "problemResponses": True},
+            order={"submittedAt": "desc"},
+            take=limit,
+        )
+    finally:
+        await db.disconnect()
+
+    rows = []
+    for submission in submissions:
+        urls = submission.images[: image_composite_service.MAX_COMPOSITE_IMAGES]
+        if len(urls) < 2:
+            continue
+        try:
+            images = [image_composite_service._load_image(url) for url in urls]
+        except Exception as e:
+            print(f"  {submission.id}: 이미지 로드 실패 ({e})")
+            continue
+
+        canvas = image_composite_service.compose(images)
+        row = {
+            "id": submission.id,
+            "separateTokens": sum(image_composite_service.vision_image_tokens(*img.size) for img in images),
+            "compositeTokens": image_composite_service.vision_image_tokens(*canvas.size),
+        }
+
+        if call:
+            task = submission.task
+            separate, separate_timer = await _analyze(task, submission, composite=False)
+            combined, combined_timer = await _analyze(task, submission, composite=True)
+            separate_ratio = float(separate.get("writingRatio", 0))
+            combined_ratio = float(combined.get("writingRatio", 0))
+            row.update({
+                "separateMs": separate_timer.total_ms(),
+                "compositeMs": combined_timer.total_ms(),
+                "separatePromptTokens": separate_timer.prompt_tokens or 0,
+                "compositePromptTokens": combined_timer.prompt_tokens or 0,
+                "writingRatioDiff": abs(separate_ratio - combined_ratio),
+                "scoreDiff": abs(_density(task, submission, separate_ratio)[0] - _density(task, submission, combined_ratio)[0]),
+                "signalMatch": _density(task, submission, separate_ratio)[1] == _density(task, submission, combined_ratio)[1],
+            })
+        rows.append(row)
+        print(f"  {row}")
+
+    if not rows:
+        print("이미지 2장 이상인 제출물이 없습니다.")
+        return
+
+    separate_tokens = sum(r["separateTokens"] for r in rows)
+    composite_tokens = sum(r["compositeTokens"] for r in rows)
+    print(f"\n제출물 {len(rows)}건")
+    print(
+        f"이미지 토큰(추정): 개별 {separate_tokens} → 합성 {composite_tokens} "
+        f"({100 * (1 - composite_tokens / separate_tokens):.1f}% 절감)"
+    )
+    if call:
+        print(
+            f"실제 입력 토큰: 개별 {sum(r['separatePromptTokens'] for r in rows)} → "
+            f"합성 {sum(r['compositePromptTokens'] for r in rows)}"
+        )
+        print(
+            f"지연 중앙값(ms): 개별 {statistics.median(r['separateMs'] for r in rows)} → "
+            f"합성 {statistics.median(r['compositeMs'] for r in rows)}"
+        )
+        print(
+            f"필기율 차이 평균 {statistics.mean(r['writingRatioDiff'] for r in rows):.1f}%p, "
+            f"밀도 점수 차이 평균 {statistics.mean(r['scoreDiff'] for r in rows):.1f}, "
+            f"신호등 일치 {100 * sum(r['signalMatch'] for r in rows) / len(rows):.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="인증샷 이미지 합성 벤치마크")
+    parser.add_argument("--subject", choices=["KOREAN", "ENGLISH", "MATH"], default=None)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--call", action="store_true", help="실제 분석 요청으로 품질/지연 비교")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(args.subject, args.limit, args.call))
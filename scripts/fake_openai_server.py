@@ -0,0 +1,242 @@
+"""부하 테스트용 OpenAI 호환 가짜 서버 (/v1/chat/completions).
+
+네트워크 없이 실제 AsyncOpenAI 클라이언트 경로(재시도, 타임아웃, 스트리밍, JSON 파싱)를
+검증하기 위한 서버입니다. 지연 분포, 오류율, 429 비율, 토큰 사용량을 조절할 수 있습니다.
+
+사용법:
+    python -m scripts.fake_openai_server --port 8900 --latency-median 8 --latency-sigma 0.5 \\
+        --error-rate 0.02 --rate-limit-rate 0.05
+
+앱 쪽 설정:
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1
+    OPENAI_API_KEY=fake
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# 이미지 1장(detail=high) 입력 토큰 근사치
+IMAGE_TOKENS = 765
+STREAM_CHUNK_CHARS = 16
+
+
+class FakeConfig:
+    def __init__(self, args: argparse.Namespace):
+        self.latency_median = args.latency_median
+        self.latency_sigma = args.latency_sigma
+        self.first_token_ratio = args.first_token_ratio
+        self.error_rate = args.error_rate
+        self.rate_limit_rate = args.rate_limit_rate
+        self.retry_after = args.retry_after
+        self.malformed_rate = args.malformed_rate
+        self.completion_tokens = args.completion_tokens
+        self.seed = args.seed
+
+    def latency(self) -> float:
+        """로그정규 분포 (median, sigma). sigma=0이면 고정 지연"""
+        if self.latency_sigma <= 0:
+            return self.latency_median
+        return random.lognormvariate(math.log(max(self.latency_median, 1e-3)), self.latency_sigma)
+
+
+stats = {"requests": 0, "ok": 0, "errors": 0, "rateLimited": 0, "malformed": 0, "inFlight": 0, "maxInFlight": 0}
+
+
+def _prompt_tokens(messages: list[dict]) -> int:
+    chars = 0
+    images = 0
+    for m in messages:
+        content = m.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+            continue
+        for part in content or []:
+            if part.get("type") == "text":
+                chars += len(part.get("text", ""))
+            elif part.get("type") == "image_url":
+                images += 1
+    # 한국어 프롬프트는 대략 2자당 1토큰
+    return chars // 2 + images * IMAGE_TOKENS
+
+
+def _analysis_content() -> dict:
+    writing_ratio = random.randint(5, 60)
+    return {
+        "writingRatio": writing_ratio,
+        "traceTypes": {
+            "underlineRatio": random.randint(0, 80),
+            "memoRatio": random.randint(0, 50),
+            "solutionRatio": random.randint(0, 90),
+        },
+        "partDensity": [],
+        "summary": f"가짜 서버 분석 (필기율 {writing_ratio}%)",
+        "detailedAnalysis": "부하 테스트용 응답입니다. " * 40,
+        "mentorTip": "부하 테스트용 코칭 팁입니다.",
+    }
+
+
+def _pdf_content() -> dict:
+    return {
+        "content": "[지문 1]\n부하 테스트용 지문입니다.",
+        "problems": [
+            {
+                "number": i,
+                "title": f"부하 테스트 문제 {i}",
+                "content": None,
+                "options": [{"label": str(n), "text": f"선지 {n}"} for n in range(1, 6)],
+                "correctAnswer": None,
+            }
+            for i in range(1, 6)
+        ],
+    }
+
+
+def _response_text(messages: list[dict], malformed: bool) -> str:
+    system = next((m.get("content") for m in messages if m.get("role") == "system"), "") or ""
+    body = _pdf_content() if "PDF" in system else _analysis_content()
+    text = json.dumps(body, ensure_ascii=False)
+    if malformed:
+        return text[: len(text) // 2]
+    return text
+
+
+def create_app(config: FakeConfig) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI")
+    if config.seed is not None:
+        random.seed(config.seed)
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        stats["requests"] += 1
+
+        roll = random.random()
+        if roll < config.rate_limit_rate:
+            stats["rateLimited"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": str(config.retry_after)},
+                content={"error": {"message": "Rate limit reached (fake)", "type": "rate_limit_error"}},
+            )
+        if roll < config.rate_limit_rate + config.error_rate:
+            stats["errors"] += 1
+            return JSONResponse(
+                status_code=500,
+                content={"error": {"message": "Internal error (fake)", "type": "server_error"}},
+            )
+
+        malformed = random.random() < config.malformed_rate
+        if malformed:
+            stats["malformed"] += 1
+        messages = payload.get("messages", [])
+        model = payload.get("model", "gpt-4o")
+        text = _response_text(messages, malformed)
+        usage = {
+            "prompt_tokens": _prompt_tokens(messages),
+            "completion_tokens": config.completion_tokens or len(text) // 2,
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+        latency = config.latency()
+
+        if not payload.get("stream"):
+            stats["inFlight"] += 1
+            stats["maxInFlight"] = max(stats["maxInFlight"], stats["inFlight"])
+            try:
+                await asyncio.sleep(latency)
+            finally:
+                stats["inFlight"] -= 1
+            stats["ok"] += 1
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            }
+
+        include_usage = (payload.get("stream_options") or {}).get("include_usage", False)
+
+        async def events():
+            stats["inFlight"] += 1
+            stats["maxInFlight"] = max(stats["maxInFlight"], stats["inFlight"])
+            try:
+                # 첫 토큰까지 지연 후 남은 시간 동안 균등하게 흘려보냄
+                await asyncio.sleep(latency * config.first_token_ratio)
+                pieces = [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)]
+                per_piece = latency * (1 - config.first_token_ratio) / max(1, len(pieces))
+                for piece in pieces:
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+                    await asyncio.sleep(per_piece)
+                done = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                yield f"data: {json.dumps(done)}\n\n"
+                if include_usage:
+                    usage_chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [],
+                        "usage": usage,
+                    }
+                    yield f"data: {json.dumps(usage_chunk)}\n\n"
+                yield "data: [DONE]\n\n"
+                stats["ok"] += 1
+            finally:
+                stats["inFlight"] -= 1
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OpenAI 호환 가짜 서버 (부하 테스트용)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-median", type=float, default=8.0, help="응답 지연 중앙값 (초)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="로그정규 sigma (0이면 고정)")
+    parser.add_argument("--first-token-ratio", type=float, default=0.3, help="스트리밍 첫 토큰까지 비율")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--retry-after", type=int, default=1, help="429 retry-after (초)")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="잘린 JSON 응답 비율")
+    parser.add_argument("--completion-tokens", type=int, default=0, help="고정 출력 토큰 수 (0이면 응답 길이로 추정)")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    uvicorn.run(create_app(FakeConfig(args)), host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,117 @@
+"""OpenAI 호출 경로 부하 테스트 (DB 없이 분석/PDF 파싱 요청만 동시 실행).
+
+scripts/fake_openai_server.py를 띄운 뒤 OPENAI_BASE_URL을 그 주소로 지정해 실행합니다.
+실제 AsyncOpenAI 클라이언트의 재시도/타임아웃, 스트리밍 파서, 서킷 브레이커를 그대로 사용합니다.
+
+사용법:
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=fake \\
+        python -m scripts.load_test_analysis --requests 200 --concurrency 20 --images 2
+"""
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.core.metrics import StageTimer
+from app.services import analysis_service, pdf_parser_service
+
+
+def _fake_submission(index: int, images: int):
+    problems = [
+        SimpleNamespace(number=n, bank=SimpleNamespace(title=f"부하 테스트 문제 {n}")) for n in range(1, 6)
+    ]
+    task = SimpleNamespace(title=f"부하 테스트 과제 {index}", subject="KOREAN", problems=problems)
+    submission = SimpleNamespace(
+        images=[f"https://example.invalid/load-test/{index}-{n}.jpg" for n in range(images)],
+        comment="부하 테스트",
+        textContent="풀이 과정 " * 20,
+        problemResponses=[],
+        selfScoreCorrect=3,
+        selfScoreTotal=5,
+    )
+    return task, submission
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 1)
+
+
+async def _run_one(index: int, kind: str, images: int, results: list[dict]):
+    timer = StageTimer()
+    first_score: list[int] = []
+
+    async def on_fields(values: dict):
+        if not first_score and all(k in values for k in analysis_service.PARTIAL_SCORE_FIELDS):
+            first_score.append(timer.total_ms())
+
+    outcome = "ok"
+    try:
+        if kind == "pdf":
+            await pdf_parser_service._call_gpt_text("부하 테스트 지문입니다. " * 200)
+        elif not analysis_service.openai_breaker.allow_request():
+            outcome = "circuitOpen"
+        else:
+            task, submission = _fake_submission(index, images)
+            try:
+                await analysis_service._request_gpt_analysis(task, submission, timer, on_fields)
+                analysis_service.openai_breaker.record_success()
+            except analysis_service._PROVIDER_ERRORS:
+                analysis_service.openai_breaker.record_failure()
+                raise
+    except Exception as e:
+        outcome = type(e).__name__
+
+    results.append({
+        "outcome": outcome,
+        "totalMs": timer.total_ms(),
+        "firstScoreMs": first_score[0] if first_score else None,
+        "promptTokens": timer.prompt_tokens or 0,
+        "completionTokens": timer.completion_tokens or 0,
+    })
+
+
+async def main(total: int, concurrency: int, kind: str, images: int):
+    if not settings.OPENAI_BASE_URL:
+        raise SystemExit("OPENAI_BASE_URL이 비어 있습니다. 가짜 서버 주소를 지정하세요.")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results: list[dict] = []
+
+    async def bounded(i: int):
+        async with semaphore:
+            await _run_one(i, kind, images, results)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(bounded(i) for i in range(total)))
+    elapsed = time.perf_counter() - started
+
+    ok = [r for r in results if r["outcome"] == "ok"]
+    totals = [r["totalMs"] for r in ok]
+    first_scores = [r["firstScoreMs"] for r in ok if r["firstScoreMs"] is not None]
+    print(f"{kind}: {total}건, 동시 {concurrency}, {elapsed:.1f}초 ({total / elapsed:.1f} req/s)")
+    print(f"  결과: {dict(Counter(r['outcome'] for r in results))}")
+    print(f"  전체 ms p50={_percentile(totals, 0.5)} p95={_percentile(totals, 0.95)} p99={_percentile(totals, 0.99)}")
+    if first_scores:
+        print(f"  첫 점수 ms p50={_percentile(first_scores, 0.5)} p95={_percentile(first_scores, 0.95)}")
+    print(
+        f"  토큰 입력 {sum(r['promptTokens'] for r in ok)} / 출력 {sum(r['completionTokens'] for r in ok)}, "
+        f"서킷 {analysis_service.openai_breaker.state}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI 호출 경로 부하 테스트")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=settings.ANALYSIS_WORKER_CONCURRENCY)
+    parser.add_argument("--kind", choices=["analysis", "pdf"], default="analysis")
+    parser.add_argument("--images", type=int, default=0, help="제출물당 이미지 수 (0이면 텍스트 분석)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(args.requests, args.concurrency, args.kind, args.images))
@@ -0,0 +1,37 @@
+"""정답 변경 후 기존 제출 일괄 재채점.
+
+사용법: python -m scripts.regrade_problems --problem ID [ID ...]
+       python -m scripts.regrade_problems --bank ID [ID ...]
+"""
+import argparse
+import asyncio
+import logging
+
+from prisma import Prisma
+
+from app.services.regrade_service import regrade
+
+
+async def main(problem_ids: list[str] | None, bank_ids: list[str] | None):
+    db = Prisma()
+    await db.connect()
+    try:
+        result = await regrade(db, problem_ids=problem_ids, bank_ids=bank_ids)
+    finally:
+        await db.disconnect()
+    print(
+        f"응답 {result['responses']}건 재채점 (제출 {result['submissions']}건), "
+        f"오답 학습지 +{result['sheetsAdded']} -{result['sheetsRemoved']} ~{result['sheetsUpdated']}, "
+        f"분석 {result['analyses']}건 재계산"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="문제 정답 기준 재채점")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--problem", nargs="+", help="TaskProblem ID")
+    target.add_argument("--bank", nargs="+", help="ProblemBank ID (이 내용을 쓰는 모든 할 일)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.problem, args.bank))
@@ -0,0 +1,34 @@
+"""채점 기준 변경 후 저장된 AI 분석 점수 일괄 재계산.
+
+사용법: python -m scripts.rescore_analyses [--version N] [--chunk-size 1000]
+"""
+import argparse
+import asyncio
+import logging
+
+from prisma import Prisma
+
+from app.services.rescoring_service import DEFAULT_CHUNK_SIZE, rescore_analyses
+
+
+async def main(version: int | None, chunk_size: int):
+    db = Prisma()
+    await db.connect()
+    try:
+        result = await rescore_analyses(db, version=version, chunk_size=chunk_size)
+    finally:
+        await db.disconnect()
+    print(
+        f"v{result['version']}: {result['scanned']}건 재계산 "
+        f"({result['changed']}건 변경, {result['chunks']}청크)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AI 분석 밀도 점수 재계산")
+    parser.add_argument("--version", type=int, default=None, help="적용할 채점 기준 버전 (기본: 최신)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.version, args.chunk_size))
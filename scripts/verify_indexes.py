@@ -0,0 +1,262 @@
+"""복합 인덱스 사용 검증 (EXPLAIN).
+
+대량 데이터를 트랜잭션 안에서 시드하고 ANALYZE한 뒤, 서비스의 주요 조회와 같은 모양의 쿼리를
+EXPLAIN해 기대한 인덱스를 쓰는지 확인합니다. 끝나면 트랜잭션을 롤백하므로 데이터가 남지 않습니다.
+하나라도 인덱스를 쓰지 않으면 종료 코드 1.
+
+사용법: python -m scripts.verify_indexes [--mentees 200] [--days 300] [--mentors 10] [--materials 20000]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from datetime import timedelta
+
+from prisma import Prisma
+
+PREFIX = "idxchk"
+START_DATE = "2025-03-01"
+TARGET_DATE = "2025-06-01"
+
+# {mentees}, {days}, {mentors}, {materials}는 정수 인자로 채움
+_SEED_SQL = [
+    # 멘토
+    """
+    INSERT INTO "User" ("id", "loginId", "passwordHash", "role", "name", "phone", "updatedAt")
+    SELECT '{p}-mentor-user-' || i, '{p}-mentor-' || i, '-', 'MENTOR', '인덱스 점검', '000', now()
+    FROM generate_series(1, {mentors}) i
+    """,
+    """
+    INSERT INTO "MentorProfile" ("id", "userId", "university", "department")
+    SELECT '{p}-mentor-' || i, '{p}-mentor-user-' || i, '-', '-'
+    FROM generate_series(1, {mentors}) i
+    """,
+    # 멘티 (멘티 m의 담당 멘토는 m % mentors + 1)
+    """
+    INSERT INTO "User" ("id", "loginId", "passwordHash", "role", "name", "phone", "updatedAt")
+    SELECT '{p}-mentee-user-' || m, '{p}-mentee-' || m, '-', 'MENTEE', '인덱스 점검', '000', now()
+    FROM generate_series(1, {mentees}) m
+    """,
+    """
+    INSERT INTO "MenteeProfile" ("id", "userId", "grade", "currentGrades", "targetGrades", "inviteCode")
+    SELECT '{p}-mentee-' || m, '{p}-mentee-user-' || m, 'HIGH2', '{{}}', '{{}}', '{p}-invite-' || m
+    FROM generate_series(1, {mentees}) m
+    """,
+    """
+    INSERT INTO "MentorMentee" ("id", "mentorId", "menteeId")
+    SELECT '{p}-mm-' || m, '{p}-mentor-' || (m % {mentors} + 1), '{p}-mentee-' || m
+    FROM generate_series(1, {mentees}) m
+    """,
+    # 멘티 x 날짜: 할 일 1건 + 제출 1건 + 문제/응답/오답 1건 + 코멘트 1건 + 피드백 1건
+    """
+    INSERT INTO "Task" ("id", "menteeId", "date", "title", "subject", "createdBy", "updatedAt")
+    SELECT '{p}-task-' || m || '-' || d, '{p}-mentee-' || m, DATE '{start}' + d, '-',
+           (ARRAY['KOREAN', 'ENGLISH', 'MATH'])[d % 3 + 1]::"Subject", 'MENTOR', now()
+    FROM generate_series(1, {mentees}) m, generate_series(0, {days} - 1) d
+    """,
+    """
+    INSERT INTO "TaskSubmission" ("id", "taskId", "menteeId", "submissionType", "submittedAt")
+    SELECT '{p}-sub-' || m || '-' || d, '{p}-task-' || m || '-' || d, '{p}-mentee-' || m, 'TEXT',
+           TIMESTAMP '{start}' + d * INTERVAL '1 day' + m * INTERVAL '1 second'
+    FROM generate_series(1, {mentees}) m, generate_series(0, {days} - 1) d
+    """,
+    """
+    INSERT INTO "ProblemBank" ("id", "title")
+    SELECT '{p}-bank-' || b, '-' FROM generate_series(1, 100) b
+    """,
+    """
+    INSERT INTO "TaskProblem" ("id", "taskId", "bankId", "number", "updatedAt")
+    SELECT '{p}-tp-' || m || '-' || d, '{p}-task-' || m || '-' || d, '{p}-bank-' || ((m + d) % 100 + 1), 1, now()
+    FROM generate_series(1, {mentees}) m, generate_series(0, {days} - 1) d
+    """,
+    """
+    INSERT INTO "ProblemResponse" ("id", "submissionId", "problemId", "answer", "isCorrect")
+    SELECT '{p}-pr-' || m || '-' || d, '{p}-sub-' || m || '-' || d, '{p}-tp-' || m || '-' || d, '1', FALSE
+    FROM generate_series(1, {mentees}) m, generate_series(0, {days} - 1) d
+    """,
+    """
+    INSERT INTO "WrongAnswerSheet" ("id", "submissionId", "menteeId", "problemId", "problemNumber", "problemTitle", "createdAt")
+    SELECT '{p}-wa-' || m || '-' || d, '{p}-sub-' || m || '-' || d, '{p}-mentee-' || m, '{p}-tp-' || m || '-' || d,
+           1, '-', TIMESTAMP '{start}' + d * INTERVAL '1 day'
+    FROM generate_series(1, {mentees}) m, generate_series(0, {days} - 1) d
+    """,
+    """
+    INSERT INTO "DailyComment" ("id", "menteeId", "date", "content", "createdAt")
+    SELECT '{p}-dc-' || m || '-' || d, '{p}-mentee-' || m, DATE '{start}' + d, '-',
+           TIMESTAMP '{start}' + d * INTERVAL '1 day'
+    FROM generate_series(1, {mentees}) m, generate_series(0, {days} - 1) d
+    """,
+    """
+    INSERT INTO "Feedback" ("id", "menteeId", "mentorId", "date", "sentAt")
+    SELECT '{p}-fb-' || m || '-' || d, '{p}-mentee-' || m, '{p}-mentor-' || (m % {mentors} + 1), DATE '{start}' + d,
+           TIMESTAMP '{start}' + d * INTERVAL '1 day'
+    FROM generate_series(1, {mentees}) m, generate_series(0, {days} - 1) d
+    """,
+    """
+    INSERT INTO "Material" ("id", "title", "type", "subject", "contentUrl", "createdAt")
+    SELECT '{p}-material-' || i, '-', 'PDF', (ARRAY['KOREAN', 'ENGLISH', 'MATH'])[i % 3 + 1]::"Subject", '-',
+           TIMESTAMP '{start}' + i * INTERVAL '1 minute'
+    FROM generate_series(1, {materials}) i
+    """,
+]
+
+_ANALYZE_TABLES = [
+    "Task", "TaskSubmission", "TaskProblem", "ProblemResponse", "WrongAnswerSheet",
+    "DailyComment", "Feedback", "Material", "MentorMentee",
+]
+
+
+def _checks(mentors: int) -> list[tuple[str, str, list, tuple[str, ...]]]:
+    """(이름, 서비스 조회와 같은 모양의 SQL, 파라미터, 허용 인덱스)"""
+    mentee = f"{PREFIX}-mentee-{mentors}"  # 멘토 1 담당
+    mentor = f"{PREFIX}-mentor-1"
+    mentor_mentees = ", ".join(f"'{PREFIX}-mentee-{m}'" for m in range(mentors, mentors * 6, mentors))
+    return [
+        (
+            "task_service.get_tasks",
+            'SELECT * FROM "Task" WHERE "menteeId" = $1 AND "date" = $2::date ORDER BY "displayOrder"',
+            [mentee, TARGET_DATE],
+            ("Task_menteeId_date_idx",),
+        ),
+        (
+            "planner_service 주간 조회",
+            'SELECT * FROM "Task" WHERE "menteeId" = $1 AND "date" BETWEEN $2::date AND $2::date + 6',
+            [mentee, TARGET_DATE],
+            ("Task_menteeId_date_idx",),
+        ),
+        (
+            "my_service 과목별 할 일",
+            'SELECT * FROM "Task" WHERE "menteeId" = $1 AND "subject" = $2::"Subject"',
+            [mentee, "MATH"],
+            ("Task_menteeId_subject_idx",),
+        ),
+        (
+            "submission_service.get_submissions",
+            'SELECT * FROM "TaskSubmission" WHERE "taskId" = $1 ORDER BY "submittedAt" DESC, "id" DESC LIMIT 21',
+            [f"{PREFIX}-task-{mentors}-10"],
+            ("TaskSubmission_taskId_submittedAt_idx",),
+        ),
+        (
+            "mentor_service 멘티 최근 제출",
+            'SELECT * FROM "TaskSubmission" WHERE "menteeId" = $1 ORDER BY "submittedAt" DESC LIMIT 1',
+            [mentee],
+            ("TaskSubmission_menteeId_submittedAt_idx",),
+        ),
+        (
+            "regrade_service 응답 재채점",
+            'SELECT * FROM "ProblemResponse" WHERE "problemId" = $1',
+            [f"{PREFIX}-tp-{mentors}-10"],
+            ("ProblemResponse_problemId_idx",),
+        ),
+        (
+            "wrong_answer_service.get_wrong_answer_sheets",
+            'SELECT * FROM "WrongAnswerSheet" WHERE "menteeId" = $1 ORDER BY "createdAt" DESC, "id" DESC LIMIT 21',
+            [mentee],
+            ("WrongAnswerSheet_menteeId_createdAt_idx",),
+        ),
+        (
+            "planner_service 날짜별 코멘트",
+            'SELECT * FROM "DailyComment" WHERE "menteeId" = $1 AND "date" = $2::date ORDER BY "createdAt"',
+            [mentee, TARGET_DATE],
+            ("DailyComment_menteeId_date_idx",),
+        ),
+        (
+            "mentor_service.get_comment_queue",
+            f'SELECT * FROM "DailyComment" WHERE "menteeId" IN ({mentor_mentees}) '
+            'ORDER BY "createdAt" DESC, "id" DESC LIMIT 21',
+            [],
+            ("DailyComment_menteeId_createdAt_idx", "DailyComment_menteeId_date_idx"),
+        ),
+        (
+            "feedback_service.get_feedback_by_date",
+            'SELECT * FROM "Feedback" WHERE "menteeId" = $1 AND "date" = $2::date '
+            'ORDER BY "sentAt" DESC, "id" DESC LIMIT 21',
+            [mentee, TARGET_DATE],
+            ("Feedback_menteeId_date_idx",),
+        ),
+        (
+            "feedback_service.get_feedback_by_subject",
+            'SELECT * FROM "Feedback" WHERE "menteeId" = $1 ORDER BY "sentAt" DESC, "id" DESC LIMIT 21',
+            [mentee],
+            ("Feedback_menteeId_sentAt_idx",),
+        ),
+        (
+            "my_service 멘토 피드백 날짜",
+            'SELECT * FROM "Feedback" WHERE "mentorId" = $1 ORDER BY "date" DESC LIMIT 100',
+            [mentor],
+            ("Feedback_mentorId_date_idx",),
+        ),
+        (
+            "material 과목별 최신순",
+            'SELECT * FROM "Material" WHERE "subject" = $1::"Subject" ORDER BY "createdAt" DESC LIMIT 100',
+            ["MATH"],
+            ("Material_subject_createdAt_idx",),
+        ),
+    ]
+
+
+def _plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _describe(plan: dict) -> tuple[set[str], str]:
+    """(사용한 인덱스 이름, 스캔 노드 요약)"""
+    indexes, scans = set(), []
+    for node in _plan_nodes(plan):
+        if "Index Name" in node:
+            indexes.add(node["Index Name"])
+            scans.append(f"{node['Node Type']} using {node['Index Name']}")
+        elif node["Node Type"] == "Seq Scan":
+            scans.append(f"Seq Scan on {node['Relation Name']}")
+    return indexes, ", ".join(scans)
+
+
+class _Rollback(Exception):
+    pass
+
+
+async def main(mentees: int, days: int, mentors: int, materials: int) -> int:
+    db = Prisma()
+    await db.connect()
+    failures = []
+    try:
+        async with db.tx(max_wait=timedelta(seconds=10), timeout=timedelta(minutes=10)) as tx:
+            for sql in _SEED_SQL:
+                await tx.execute_raw(sql.format(
+                    p=PREFIX, start=START_DATE, mentees=mentees, days=days, mentors=mentors, materials=materials,
+                ))
+            for table in _ANALYZE_TABLES:
+                await tx.execute_raw(f'ANALYZE "{table}"')
+            print(f"시드: 멘티 {mentees}명 x {days}일 ({mentees * days}건/테이블), 학습지 {materials}건\n")
+
+            for name, sql, params, expected in _checks(mentors):
+                row = (await tx.query_raw(f"EXPLAIN (FORMAT JSON) {sql}", *params))[0]
+                plan = row["QUERY PLAN"]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                indexes, summary = _describe(plan[0]["Plan"])
+                ok = bool(indexes & set(expected))
+                if not ok:
+                    failures.append(name)
+                print(f"{'OK  ' if ok else 'FAIL'} {name}: {summary}")
+            raise _Rollback
+    except _Rollback:
+        pass
+    finally:
+        await db.disconnect()
+
+    print(f"\n{len(failures)}건 실패" if failures else "\n모든 조회가 인덱스를 사용합니다")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="복합 인덱스 사용 검증 (EXPLAIN)")
+    parser.add_argument("--mentees", type=int, default=200)
+    parser.add_argument("--days", type=int, default=300)
+    parser.add_argument("--mentors", type=int, default=10)
+    parser.add_argument("--materials", type=int, default=20000)
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main(args.mentees, args.days, args.mentors, args.materials)))
@@ -4,12 +4,16 @@ import sys
 import time
 
 from fastapi.testclient import TestClient
+from app.core.config import settings as app_settings
 from main import app
 
 tokens = {}
 ids = {}
 ts = int(time.time())
 
+app_settings.ADMIN_API_KEY = app_settings.ADMIN_API_KEY or "test-admin-key"
+admin_headers = {"X-Admin-Key": app_settings.ADMIN_API_KEY}
+
 client = TestClient(app)
 client.__enter__()
 
@@ -147,6 +151,49 @@ for chk_date in ["2026-02-02", "2026-02-04", "2026-02-06"]:
     assert len(found) == 1, f"Expected repeat task on {chk_date}"
 print(f"  -> repeat dates (MON/WED/FRI) verified")
 
+# 반복 규칙은 다음 주에도 이어지고, 삭제한 회차는 다시 생성되지 않음
+r = client.get(f"/api/tasks?menteeId={ids['menteeProfileId']}&date=2026-02-09", headers=h(tokens["mentee"]))
+found = [t for t in r.json()["data"] if t["title"] == "영어 독해 3회차"]
+assert len(found) == 1, "Expected repeat task on next week's MON"
+r = client.delete(f"/api/tasks/{found[0]['id']}", headers=h(tokens["mentee"]))
+assert r.status_code == 204
+r = client.get(f"/api/tasks?menteeId={ids['menteeProfileId']}&date=2026-02-09", headers=h(tokens["mentee"]))
+assert not [t for t in r.json()["data"] if t["title"] == "영어 독해 3회차"]
+print(f"  -> repeat rule: next week materialized, deleted occurrence stays deleted")
+
+# 처음 만든 할 일(첫 회차)을 지워도 규칙은 유지
+r = client.delete(f"/api/tasks/{rt['id']}", headers=h(tokens["mentee"]))
+assert r.status_code == 204
+r = client.get(f"/api/tasks?menteeId={ids['menteeProfileId']}&date=2026-02-03", headers=h(tokens["mentee"]))
+assert not [t for t in r.json()["data"] if t["title"] == "영어 독해 3회차"]
+r = client.get(f"/api/tasks?menteeId={ids['menteeProfileId']}&date=2026-02-16", headers=h(tokens["mentee"]))
+assert len([t for t in r.json()["data"] if t["title"] == "영어 독해 3회차"]) == 1
+print(f"  -> repeat rule: deleting the first task keeps later occurrences")
+
+# 반복 요일 수정/중지는 규칙에 반영 (2099-01-05는 월요일, 이미 만든 미래 회차도 정리)
+def repeat_titles(d):
+    r = client.get(f"/api/tasks?menteeId={ids['menteeProfileId']}&date={d}", headers=h(tokens["mentee"]))
+    return [t for t in r.json()["data"] if t["title"] == "반복 수정 확인"]
+
+r = client.post("/api/tasks", headers=h(tokens["mentee"]), json={
+    "date": "2099-01-05", "title": "반복 수정 확인", "subject": "MATH",
+    "repeat": True, "repeatDays": ["MON", "WED"],
+})
+assert r.status_code == 201
+repeat_anchor_id = r.json()["data"]["id"]
+assert len(repeat_titles("2099-01-07")) == 1
+r = client.put(f"/api/tasks/{repeat_anchor_id}", headers=h(tokens["mentee"]), json={"repeatDays": ["MON"]})
+assert r.status_code == 200
+assert not repeat_titles("2099-01-07") and not repeat_titles("2099-01-14")
+assert len(repeat_titles("2099-01-12")) == 1
+r = client.put(f"/api/tasks/{repeat_anchor_id}", headers=h(tokens["mentee"]), json={"repeat": False})
+assert r.status_code == 200
+assert not repeat_titles("2099-01-12") and not repeat_titles("2099-01-19")
+assert len(repeat_titles("2099-01-05")) == 1
+r = client.delete(f"/api/tasks/{repeat_anchor_id}", headers=h(tokens["mentee"]))
+assert r.status_code == 204
+print(f"  -> repeat rule: repeatDays change and repeat=false update the rule and future occurrences")
+
 # Create task (mentor for mentee) — with tags, keyPoints, content, problems
 r = client.post(f"/api/tasks?menteeId={ids['menteeProfileId']}", headers=h(tokens["mentor"]), json={
     "date": "2026-02-03", "title": "수학 미적분 p.32~35",
@@ -237,6 +284,7 @@ r = client.post(f"/api/tasks/{ids['taskId']}/submissions", headers=h(tokens["men
 print(f"[Submit TEXT] {r.status_code}")
 assert r.status_code == 201
 ids["submissionId"] = r.json()["data"]["id"]
+assert r.json()["data"]["analysis"]["status"] == "PENDING"  # 제출과 함께 자동 분석
 
 # Submit (mentor task with problemResponses + selfScore + studyTime + comment)
 r = client.post(f"/api/tasks/{ids['mentorTaskId']}/submissions", headers=h(tokens["mentee"]), json={
@@ -353,6 +401,9 @@ print("=== Phase 3: Mentor Features ===")
 r = client.get("/api/mentor/dashboard", headers=h(tokens["mentor"]))
 print(f"[Dashboard] {r.status_code}")
 assert r.status_code == 200
+cq_page = r.json()["data"]["commentQueuePagination"]
+assert cq_page["total"] >= len(r.json()["data"]["commentQueue"])
+assert cq_page["hasMore"] == (cq_page["nextCursor"] is not None)
 
 # Mentees
 r = client.get("/api/mentor/mentees", headers=h(tokens["mentor"]))
@@ -375,19 +426,54 @@ print(f"[Analysis trigger] {r.status_code} status={r.json()['data']['status']}")
 assert r.status_code == 201
 ids["analysisId"] = r.json()["data"]["analysisId"]
 
+# AI Analysis: prioritize ("지금 분석")
+r = client.post(f"/api/analysis/{ids['submissionId']}/prioritize", headers=h(tokens["mentor"]))
+print(f"[Analysis prioritize] {r.status_code} status={r.json()['data']['status']}")
+assert r.status_code == 200
+
+r = client.post(f"/api/analysis/{ids['submissionId']}/prioritize", headers=h(tokens["mentee"]))
+print(f"[Analysis prioritize by mentee] {r.status_code}")
+assert r.status_code == 403
+
 # Wait for background analysis
 time.sleep(3)
 
 # Analysis status
 r = client.get(f"/api/analysis/{ids['submissionId']}/status", headers=h(tokens["mentor"]))
-print(f"[Analysis status] {r.status_code} status={r.json()['data']['status']}")
+print(f"[Analysis status] {r.status_code} status={r.json()['data']['status']} score={r.json()['data']['densityScore']} partial={r.json()['data']['isPartial']}")
 assert r.status_code == 200
+if r.json()["data"]["status"] == "COMPLETED":
+    assert r.json()["data"]["densityScore"] is not None
+    assert r.json()["data"]["isPartial"] is False
 
 # Analysis result
 r = client.get(f"/api/analysis/{ids['submissionId']}", headers=h(tokens["mentor"]))
 print(f"[Analysis result] {r.status_code} signal={r.json()['data'].get('signalLight')}")
 assert r.status_code == 200
 
+# AI Analysis: bulk trigger (mentee + date range)
+r = client.post("/api/analysis/bulk-trigger", headers=h(tokens["mentor"]), json={
+    "menteeId": ids["menteeProfileId"], "dateFrom": "2026-02-03", "dateTo": "2026-02-03",
+})
+print(f"[Analysis bulk trigger] {r.status_code} total={r.json()['data']['total']} queued={r.json()['data']['queued']}")
+assert r.status_code == 201
+bulk_items = {i["submissionId"]: i for i in r.json()["data"]["items"]}
+assert bulk_items[ids["submissionId"]]["queued"] is False
+
+# AI Analysis: bulk trigger (submission ids, dedupe + not found)
+r = client.post("/api/analysis/bulk-trigger", headers=h(tokens["mentor"]), json={
+    "submissionIds": [ids["submissionId"], ids["submissionId"], "00000000-0000-0000-0000-000000000000"],
+})
+print(f"[Analysis bulk trigger ids] {r.status_code} {[i['status'] for i in r.json()['data']['items']]}")
+assert r.status_code == 201
+assert r.json()["data"]["total"] == 2
+assert r.json()["data"]["queued"] == 0
+assert r.json()["data"]["items"][-1]["status"] == "NOT_FOUND"
+
+r = client.post("/api/analysis/bulk-trigger", headers=h(tokens["mentor"]), json={"menteeId": ids["menteeProfileId"]})
+print(f"[Analysis bulk trigger invalid] {r.status_code}")
+assert r.status_code == 400
+
 # Judgment confirm
 r = client.post(f"/api/mentor/judgments/{ids['analysisId']}/confirm", headers=h(tokens["mentor"]))
 print(f"[Judgment confirm] {r.status_code}")
@@ -424,6 +510,28 @@ ids["materialId"] = r.json()["data"]["id"]
 r = client.get("/api/materials?subject=KOREAN", headers=h(tokens["mentor"]))
 print(f"[Material list] {r.status_code} count={len(r.json()['data'])}")
 assert r.status_code == 200
+assert ids["materialId"] in [m["id"] for m in r.json()["data"]]
+material_etag = r.headers["etag"]
+
+# Materials: list (ETag 일치 시 304)
+r = client.get("/api/materials?subject=KOREAN", headers={**h(tokens["mentor"]), "If-None-Match": material_etag})
+print(f"[Material list 304] {r.status_code}")
+assert r.status_code == 304
+
+# Materials: 잘못된 과목/유형 필터
+r = client.get("/api/materials?subject=HISTORY", headers=h(tokens["mentor"]))
+print(f"[Material list invalid filter] {r.status_code}")
+assert r.status_code == 400 and r.json()["detail"]["code"] == "MATERIAL_003"
+
+# Materials: cursor pagination
+r = client.get("/api/materials?limit=1", headers=h(tokens["mentor"]))
+page = r.json()["pagination"]
+print(f"[Material list cursor] {r.status_code} hasMore={page['hasMore']}")
+assert r.status_code == 200 and len(r.json()["data"]) == 1
+if page["hasMore"]:
+    r2 = client.get(f"/api/materials?limit=1&cursor={page['nextCursor']}", headers=h(tokens["mentor"]))
+    assert r2.status_code == 200
+    assert r2.json()["data"][0]["id"] != r.json()["data"][0]["id"]
 
 # Materials: detail
 r = client.get(f"/api/materials/{ids['materialId']}", headers=h(tokens["mentor"]))
@@ -439,6 +547,15 @@ assert r.status_code == 307
 r = client.get(f"/api/coaching/{ids['submissionId']}/recommendations", headers=h(tokens["mentor"]))
 print(f"[Recommendations] {r.status_code} count={len(r.json()['data']['recommendations'])}")
 assert r.status_code == 200
+# 카탈로그가 바뀌었으므로 저장된 추천이 갱신되어 새 학습지를 포함
+assert ids["materialId"] in [m["materialId"] for m in r.json()["data"]["recommendations"]]
+
+# Recommendations: pagination (점수순 정렬)
+r = client.get(f"/api/coaching/{ids['submissionId']}/recommendations?page=1&limit=2", headers=h(tokens["mentor"]))
+print(f"[Recommendations page] {r.status_code} pagination={r.json()['data']['pagination']}")
+assert r.status_code == 200
+assert len(r.json()["data"]["recommendations"]) <= 2
+assert r.json()["data"]["pagination"]["total"] >= 1
 
 # Assign material
 r = client.post("/api/coaching/assign-material", headers=h(tokens["mentor"]), json={
@@ -449,6 +566,55 @@ r = client.post("/api/coaching/assign-material", headers=h(tokens["mentor"]), js
 print(f"[Assign material] {r.status_code}")
 assert r.status_code == 201
 
+# Bulk weekly plan
+r = client.post("/api/mentor/plans/bulk", headers=h(tokens["mentor"]), json={
+    "templates": [
+        {"key": "kor", "title": "비문학 지문 2개", "subject": "KOREAN",
+         "problems": [{"number": 1, "title": "주제 찾기", "correctAnswer": "2"}]},
+        {"key": "math", "title": "미적분 p.40~42", "subject": "MATH"},
+    ],
+    "assignments": [
+        {"menteeId": ids["menteeProfileId"], "date": "2026-04-06", "templateKey": "kor"},
+        {"menteeId": ids["menteeProfileId"], "date": "2026-04-07", "templateKey": "kor"},
+        {"menteeId": ids["menteeProfileId"], "date": "2026-04-07", "templateKey": "math", "displayOrder": 1},
+    ],
+})
+print(f"[Bulk plan] {r.status_code} {r.json()['data'] if r.status_code == 201 else r.json()}")
+assert r.status_code == 201
+assert r.json()["data"]["taskCount"] == 3
+assert r.json()["data"]["problemCount"] == 2
+bulk_task_ids = r.json()["data"]["taskIds"]
+bulk_task_id = bulk_task_ids[1]
+r = client.get(f"/api/tasks/{bulk_task_id}", headers=h(tokens["mentor"]))
+assert r.status_code == 200
+assert r.json()["data"]["isLocked"] is True and r.json()["data"]["problemCount"] == 1
+
+# Problem bank: 같은 내용의 문제를 공유하는 할 일 중 하나만 수정해도 다른 할 일은 그대로 (copy-on-write)
+bulk_problem_id = r.json()["data"]["problems"][0]["id"]
+r = client.put(f"/api/tasks/{bulk_task_id}/problems/{bulk_problem_id}", headers=h(tokens["mentor"]), json={
+    "title": "주제 찾기 (수정)",
+})
+print(f"[Shared problem update] {r.status_code}")
+assert r.status_code == 200
+assert r.json()["data"]["title"] == "주제 찾기 (수정)"
+assert r.json()["data"]["correctAnswer"] == "2"
+r = client.get(f"/api/tasks/{bulk_task_ids[0]}", headers=h(tokens["mentor"]))
+assert r.json()["data"]["problems"][0]["title"] == "주제 찾기"
+
+r = client.post("/api/mentor/plans/bulk", headers=h(tokens["mentor"]), json={
+    "templates": [{"key": "kor", "title": "x", "subject": "KOREAN"}],
+    "assignments": [{"menteeId": ids["menteeProfileId"], "date": "2026-04-06", "templateKey": "eng"}],
+})
+print(f"[Bulk plan unknown template] {r.status_code}")
+assert r.status_code == 400
+
+r = client.post("/api/mentor/plans/bulk", headers=h(tokens["mentee"]), json={
+    "templates": [{"key": "kor", "title": "x", "subject": "KOREAN"}],
+    "assignments": [{"menteeId": ids["menteeProfileId"], "date": "2026-04-06", "templateKey": "kor"}],
+})
+print(f"[Bulk plan by mentee] {r.status_code}")
+assert r.status_code == 403
+
 # Feedback create
 r = client.post("/api/mentor/feedback", headers=h(tokens["mentor"]), json={
     "menteeId": ids["menteeProfileId"],
@@ -622,6 +788,23 @@ item = fb["items"][0]
 assert item["detail"] is not None
 print(f"  -> items[0] taskTitle={item['taskTitle']} detail={item['detail'][:30]}...")
 
+# By subject: 커서 페이지네이션 (limit=1)
+r = client.get(f"/api/feedback/by-subject?menteeId={ids['menteeProfileId']}&subject=KOREAN&limit=1", headers=h(tokens["mentee"]))
+assert r.status_code == 200
+page1 = r.json()
+assert len(page1["data"]) == 1
+if len(fbs_ko) > 1:
+    assert page1["pagination"]["hasMore"] is True
+    r = client.get(
+        f"/api/feedback/by-subject?menteeId={ids['menteeProfileId']}&subject=KOREAN&limit=1&cursor={page1['pagination']['nextCursor']}",
+        headers=h(tokens["mentee"]),
+    )
+    assert r.status_code == 200
+    assert r.json()["data"][0]["id"] == fbs_ko[1]["id"]
+print(f"[Feedback by subject cursor] page1={page1['data'][0]['id'][:8]} hasMore={page1['pagination']['hasMore']}")
+r = client.get(f"/api/feedback/by-subject?menteeId={ids['menteeProfileId']}&subject=KOREAN&cursor=bad", headers=h(tokens["mentee"]))
+assert r.status_code == 400
+
 # By subject: MATH (should have feedbacks from 02-03, 02-05)
 r = client.get(f"/api/feedback/by-subject?menteeId={ids['menteeProfileId']}&subject=MATH", headers=h(tokens["mentee"]))
 fbs_math = r.json()["data"]
@@ -677,6 +860,72 @@ assert wrong_sheet["originalAnswer"] == "2x^2"
 assert wrong_sheet["correctAnswer"] == "3x^2"
 print(f"  -> auto wrong sheet: problem #{wrong_sheet['problemNumber']} answer={wrong_sheet['originalAnswer']} correct={wrong_sheet['correctAnswer']}")
 
+# 정답 수정 → 기존 제출 재채점 (problem 2: 정답 "3" → "4"이면 오답, 되돌리면 오답 학습지 삭제)
+r = client.put(f"/api/tasks/{ids['mentorTaskId']}/problems/{ids['problemId2']}", headers=h(tokens["mentor"]), json={
+    "correctAnswer": "4"
+})
+print(f"[Answer key update → regrade] {r.status_code}")
+assert r.status_code == 200
+r = client.get("/api/wrong-answers", headers=h(tokens["mentee"]))
+regraded = [s for s in r.json()["data"] if s["submissionId"] == ids["mentorSubmissionId"]]
+assert sorted(s["problemNumber"] for s in regraded) == [2, 3]
+assert next(s for s in regraded if s["problemNumber"] == 2)["correctAnswer"] == "4"
+r = client.get(f"/api/tasks/{ids['mentorTaskId']}/submissions", headers=h(tokens["mentee"]))
+regraded_sub = next(s for s in r.json()["data"] if s["id"] == ids["mentorSubmissionId"])
+assert regraded_sub["selfScoreCorrect"] == 1 and regraded_sub["selfScoreTotal"] == 3
+assert {pr["problemId"]: pr["isCorrect"] for pr in regraded_sub["problemResponses"]}[ids["problemId2"]] is False
+
+r = client.put(f"/api/tasks/{ids['mentorTaskId']}/problems/{ids['problemId2']}", headers=h(tokens["mentor"]), json={
+    "correctAnswer": "3"
+})
+assert r.status_code == 200
+r = client.get("/api/wrong-answers", headers=h(tokens["mentee"]))
+regraded = [s for s in r.json()["data"] if s["submissionId"] == ids["mentorSubmissionId"]]
+assert [s["problemNumber"] for s in regraded] == [3]
+print("  -> regrade: sheet #2 added then removed")
+
+# 정답을 모두 지우면 자동 채점 점수/오답 번호도 비우고, 되돌리면 다시 채점
+original_keys = {"problemId1": "1", "problemId2": "3", "problemId3": "3x^2"}
+for key in original_keys:
+    r = client.put(f"/api/tasks/{ids['mentorTaskId']}/problems/{ids[key]}", headers=h(tokens["mentor"]), json={
+        "correctAnswer": ""
+    })
+    assert r.status_code == 200
+r = client.get(f"/api/tasks/{ids['mentorTaskId']}/submissions", headers=h(tokens["mentee"]))
+cleared_sub = next(s for s in r.json()["data"] if s["id"] == ids["mentorSubmissionId"])
+assert cleared_sub["selfScoreCorrect"] is None and cleared_sub["selfScoreTotal"] is None
+assert cleared_sub["wrongQuestions"] == []
+r = client.get("/api/wrong-answers", headers=h(tokens["mentee"]))
+assert not [s for s in r.json()["data"] if s["submissionId"] == ids["mentorSubmissionId"]]
+for key, answer in original_keys.items():
+    r = client.put(f"/api/tasks/{ids['mentorTaskId']}/problems/{ids[key]}", headers=h(tokens["mentor"]), json={
+        "correctAnswer": answer
+    })
+    assert r.status_code == 200
+r = client.get(f"/api/tasks/{ids['mentorTaskId']}/submissions", headers=h(tokens["mentee"]))
+restored_sub = next(s for s in r.json()["data"] if s["id"] == ids["mentorSubmissionId"])
+assert restored_sub["selfScoreCorrect"] == 2 and restored_sub["selfScoreTotal"] == 3
+assert restored_sub["wrongQuestions"] == [3]
+print("  -> regrade: answer keys cleared → auto scores reset, restored → regraded")
+
+# 키셋 페이지네이션 (공용 커서): limit=1로 두 페이지 조회
+r = client.get("/api/wrong-answers?limit=1&withTotal=true", headers=h(tokens["mentee"]))
+assert r.status_code == 200
+wa_page = r.json()
+assert len(wa_page["data"]) == 1 and wa_page["pagination"]["total"] >= 1
+if wa_page["pagination"]["total"] > 1:
+    assert wa_page["pagination"]["hasMore"] is True
+    r = client.get(f"/api/wrong-answers?limit=1&cursor={wa_page['pagination']['nextCursor']}", headers=h(tokens["mentee"]))
+    assert r.status_code == 200
+    assert r.json()["data"][0]["id"] != wa_page["data"][0]["id"]
+print(f"[Wrong answers page] total={wa_page['pagination']['total']} hasMore={wa_page['pagination']['hasMore']}")
+
+r = client.get("/api/mentor/comments?limit=1", headers=h(tokens["mentor"]))
+print(f"[Comment queue page] {r.status_code} count={len(r.json()['data'])}")
+assert r.status_code == 200 and len(r.json()["data"]) <= 1
+r = client.get("/api/mentor/comments?cursor=not-a-cursor", headers=h(tokens["mentor"]))
+assert r.status_code == 400
+
 print("--- Wrong Answers OK ---\n")
 
 # ===== Phase 4: Parent =====
@@ -998,6 +1247,50 @@ assert r.status_code == 204
 
 print("--- Lessons OK ---\n")
 
+# ===== Admin: Analysis queue =====
+print("=== Admin: Analysis queue ===")
+
+r = client.get("/api/admin/analysis/queue")
+print(f"[Queue stats no key] {r.status_code}")
+assert r.status_code == 403
+
+r = client.get("/api/admin/analysis/queue", headers=admin_headers)
+print(f"[Queue stats] {r.status_code} {r.json()['data']}")
+assert r.status_code == 200
+assert r.json()["data"]["enqueued"] >= 1
+assert r.json()["data"]["workers"] >= 1
+assert r.json()["data"]["openaiCircuit"] == "CLOSED"
+
+r = client.post("/api/admin/analysis/scheduler/run", headers=admin_headers)
+print(f"[Scheduler run] {r.status_code} {r.json()['data']}")
+assert r.status_code == 200
+assert r.json()["data"]["reaped"] >= 0
+
+r = client.get("/api/admin/analysis/metrics", headers=admin_headers)
+print(f"[Analysis metrics] {r.status_code} stages={r.json()['data']['stages']}")
+assert r.status_code == 200
+assert "total" in [s["stage"] for s in r.json()["data"]["stages"]]
+assert "analysis.total_ms" in r.json()["data"]["histograms"]
+
+# Submission without auto analysis (opt-out)
+r = client.post("/api/tasks", headers=h(tokens["mentee"]), json={
+    "date": "2026-03-02", "title": "자동 분석 제외 과제", "subject": "KOREAN"
+})
+assert r.status_code == 201
+r = client.post(f"/api/tasks/{r.json()['data']['id']}/submissions", headers=h(tokens["mentee"]), json={
+    "submissionType": "TEXT", "textContent": "풀이", "autoAnalyze": False
+})
+print(f"[Submit autoAnalyze=false] {r.status_code} analysis={r.json()['data']['analysis']}")
+assert r.status_code == 201
+assert r.json()["data"]["analysis"] is None
+
+r = client.post(f"/api/analysis/{r.json()['data']['id']}/trigger", headers=h(tokens["mentee"]))
+print(f"[Manual trigger after opt-out] {r.status_code} status={r.json()['data']['status']}")
+assert r.status_code == 201
+assert r.json()["data"]["status"] == "PROCESSING"
+
+print("--- Admin OK ---\n")
+
 client.__exit__(None, None, None)
 
 print("\n=============================================")